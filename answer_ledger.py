@@ -0,0 +1,101 @@
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+CORRECT = "correct"
+WRONG = "wrong"
+TOO_HIGH = "too_high"
+TOO_LOW = "too_low"
+
+
+@dataclass
+class LevelRecord:
+    """
+    Everything we learned from past submissions for one day and level."""
+    correct: Optional[str] = None
+    wrong: List[str] = field(default_factory=list)
+
+    # smallest answer known to be too high, and largest answer known to be too low
+    too_high: Optional[int] = None
+    too_low: Optional[int] = None
+
+
+class AnswerLedger:
+    """
+    Local record of submitted answers and their verdicts, persisted as JSON.
+
+    Used to reject answers without a round trip when we already know the verdict: repeats of past submissions, and
+    numeric answers outside the bounds established by earlier "too high"/"too low" responses."""
+
+    def __init__(self, filename: str = "./answers-ledger.json"):
+        self.filename = filename
+        self._records: Dict[str, LevelRecord] = {}
+
+        try:
+            with open(filename, "r") as f:
+                self._records = {key: LevelRecord(**value) for key, value in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+
+    def get(self, year: int, day: int, level: int) -> LevelRecord:
+        return self._records.get(_key(year, day, level), LevelRecord())
+
+    def check(self, year: int, day: int, level: int, answer: Any) -> Optional[str]:
+        """
+        Returns the known verdict for the answer, or None if only the server can tell."""
+        record = self.get(year, day, level)
+        answer_str = str(answer)
+
+        if record.correct is not None:
+            return CORRECT if answer_str == record.correct else WRONG
+
+        if answer_str in record.wrong:
+            return WRONG
+
+        numeric = _as_int(answer_str)
+        if numeric is not None:
+            if record.too_high is not None and numeric >= record.too_high:
+                return TOO_HIGH
+            if record.too_low is not None and numeric <= record.too_low:
+                return TOO_LOW
+
+        return None
+
+    def record(self, year: int, day: int, level: int, answer: Any, verdict: str):
+        """
+        Records the server's verdict for an answer and saves the ledger."""
+        key = _key(year, day, level)
+        record = self._records.setdefault(key, LevelRecord())
+        answer_str = str(answer)
+
+        if verdict == CORRECT:
+            record.correct = answer_str
+        else:
+            if answer_str not in record.wrong:
+                record.wrong.append(answer_str)
+
+            numeric = _as_int(answer_str)
+            if verdict == TOO_HIGH and numeric is not None:
+                record.too_high = numeric if record.too_high is None else min(record.too_high, numeric)
+            elif verdict == TOO_LOW and numeric is not None:
+                record.too_low = numeric if record.too_low is None else max(record.too_low, numeric)
+
+        self._save()
+
+    def _save(self):
+        temp_filename = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temp_filename, "w") as f:
+            json.dump({key: asdict(record) for key, record in self._records.items()}, f, indent=2, sort_keys=True)
+        os.replace(temp_filename, self.filename)
+
+
+def _key(year: int, day: int, level: int) -> str:
+    return f"{year}-{day}-{level}"
+
+
+def _as_int(answer: str) -> Optional[int]:
+    try:
+        return int(answer)
+    except ValueError:
+        return None
@@ -0,0 +1,274 @@
+"""
+Command line entry point for running solutions.
+
+    python -m aoc run --days 1-25 --parts 1,2 -j 8 --timeout 300
+    python -m aoc run --days 12 --no-cache
+    python -m aoc run --days 17 --parts 2 --profile
+    python -m aoc run --days 20 --parts 2 --sample
+    python -m aoc run --days 10,21 --memory --memory-budget 1G
+    python -m aoc run --days 10,17 --metrics metrics.json
+    python -m aoc bench --days 12,17 --repeat 10
+    python -m aoc compare abc1234 def5678 --threshold 0.1
+    python -m aoc watch --days 1-25 -j 8
+    python -m aoc daemon &
+    python -m aoc solve --days 17 --parts 2
+    python -m aoc daemon --stop
+    python -m aoc prune-memo --days 30"""
+import argparse
+import importlib
+import os
+import sys
+import time
+from typing import List
+
+import daemon
+import disk_cache
+from aoc_api import get_raw_input
+from benchmark import BenchmarkHistory, benchmark_jobs, compare, current_commit, format_regressions, format_result
+from instrumentation import format_metrics, write_metrics
+from memory_profiling import format_report, parse_size
+from profiling import format_top_functions, profile_solve, top_functions, write_profile
+from result_cache import ResultCache
+from runner import Job, available_jobs, format_results, run_jobs
+from sampling_profiler import SamplingProfiler
+from watch import watch
+
+
+def parse_numbers(value: str) -> List[int]:
+    """
+    Parses comma separated numbers and inclusive ranges, e.g. "1-5,7,9-10"."""
+    result = []
+    for item in value.split(","):
+        if "-" in item:
+            first, last = item.split("-")
+            result += range(int(first), int(last) + 1)
+        else:
+            result.append(int(item))
+
+    return result
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not at least 1")
+
+    return number
+
+
+def run(args: argparse.Namespace):
+    jobs = available_jobs(args.days, args.parts)
+    if args.profile:
+        profile(args, jobs)
+        return
+    if args.sample:
+        sample(args, jobs)
+        return
+
+    start = time.perf_counter()
+    results = run_jobs(
+        jobs,
+        workers=args.jobs,
+        timeout=args.timeout,
+        year=args.year,
+        memory=args.memory,
+        memory_budget=args.memory_budget,
+        top=args.top,
+        metrics=args.metrics is not None,
+        cache=ResultCache() if args.cache else None)
+    elapsed = time.perf_counter() - start
+
+    print(format_results(results))
+    for result in results:
+        if result.memory is not None:
+            print(f"\nday {result.job.day} part {result.job.part}: {format_report(result.memory)}")
+        if result.metrics is not None:
+            print(f"\nday {result.job.day} part {result.job.part}:\n{format_metrics(result.metrics)}")
+
+    if args.metrics is not None:
+        write_metrics(args.metrics, {
+            "commit": current_commit(),
+            "timestamp": time.time(),
+            "jobs": {
+                f"{args.year}-{r.job.day}-{r.job.part}": dict(r.metrics, wall_seconds=r.wall_seconds)
+                for r in results if r.metrics is not None},
+        })
+        print(f"\nWrote {args.metrics}")
+    print(f"\n{len(jobs)} jobs in {elapsed:.3f}s on {args.jobs} workers")
+
+    if any(result.error is not None and result.error.startswith("over memory budget") for result in results):
+        sys.exit(1)
+
+
+def single_job(jobs: List[Job], flag: str) -> Job:
+    if len(jobs) != 1:
+        raise ValueError(f"{flag} needs exactly one day and part, got {len(jobs)} jobs")
+
+    return jobs[0]
+
+
+def profile(args: argparse.Namespace, jobs: List[Job]):
+    job = single_job(jobs, "--profile")
+    answer, stats = profile_solve(job, get_raw_input(job.day, args.year))
+
+    print(f"day {job.day} part {job.part}: {answer}\n")
+    print(format_top_functions(top_functions(stats, args.top)))
+    filenames = write_profile(stats, f"profile-{args.year}-{job.day}-{job.part}")
+    print(f"\nWrote {', '.join(filenames)}")
+
+
+def sample(args: argparse.Namespace, jobs: List[Job]):
+    job = single_job(jobs, "--sample")
+    input = get_raw_input(job.day, args.year)
+
+    print(f"Sampling day {job.day} part {job.part} in pid {os.getpid()}, send SIGUSR1 for an intermediate report")
+    profiler = SamplingProfiler(
+        interval=args.sample_interval, prefix=f"sample-profile-{args.year}-{job.day}-{job.part}", top=args.top)
+    profiler.attach()
+
+    day = importlib.import_module(f"day{job.day}")
+    print(f"day {job.day} part {job.part}: {day.solve(job.part, input)}")
+
+
+def bench(args: argparse.Namespace):
+    results = benchmark_jobs(
+        available_jobs(args.days, args.parts),
+        warmup=args.warmup,
+        repeat=args.repeat,
+        year=args.year,
+        on_result=lambda result: print(format_result(result), flush=True))
+
+    if args.record:
+        commit = current_commit()
+        BenchmarkHistory().record(commit, results, year=args.year)
+        print(f"\nRecorded as {commit}")
+
+
+def compare_runs(args: argparse.Namespace):
+    history = BenchmarkHistory()
+    head = args.head or current_commit()
+    regressions = compare(history, args.base, head, threshold=args.threshold)
+
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} from {args.base} to {head}")
+        return
+
+    print(format_regressions(regressions))
+    sys.exit(1)
+
+
+def watch_jobs(args: argparse.Namespace):
+    try:
+        watch(
+            available_jobs(args.days, args.parts),
+            ResultCache(),
+            year=args.year,
+            interval=args.interval,
+            workers=args.jobs,
+            timeout=args.timeout)
+    except KeyboardInterrupt:
+        pass
+
+
+def serve(args: argparse.Namespace):
+    if args.stop:
+        daemon.stop(args.socket)
+        return
+
+    server = daemon.SolverDaemon(args.socket, job_timeout=args.timeout)
+    print(f"Listening on {args.socket}", flush=True)
+    server.serve()
+
+
+def solve(args: argparse.Namespace):
+    results, reloaded = daemon.request(available_jobs(args.days, args.parts), args.year, args.socket)
+    if reloaded:
+        print(f"Reloaded {', '.join(reloaded)}")
+    print(format_results(results))
+
+
+def prune_memo(args: argparse.Namespace):
+    deleted = disk_cache.prune(args.days)
+    print(f"Deleted {deleted} memoized results of function versions unused for {args.days:g} days")
+
+
+def add_job_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--days", type=parse_numbers, default=list(range(1, 26)))
+    parser.add_argument("--parts", type=parse_numbers, default=[1, 2])
+    parser.add_argument("--year", type=int, default=2023)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="aoc")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run solutions in parallel and print their answers and timings")
+    add_job_arguments(run_parser)
+    run_parser.add_argument(
+        "-j", "--jobs", type=positive_int, default=os.cpu_count() or 1, help="number of worker processes")
+    run_parser.add_argument("--timeout", type=float, default=None, help="seconds before a job is killed")
+    run_parser.add_argument(
+        "--no-cache", dest="cache", action="store_false",
+        help="solve every job, even those whose input and code didn't change since their cached answer")
+    run_parser.add_argument(
+        "--profile", action="store_true", help="profile a single day/part in-process, writing .prof and .collapsed files")
+    run_parser.add_argument(
+        "--memory", action="store_true", help="trace allocations and report peak memory and the top allocation sites")
+    run_parser.add_argument(
+        "--memory-budget", type=parse_size, default=None, help="fail jobs whose peak memory exceeds this, e.g. 512M")
+    run_parser.add_argument(
+        "--metrics", nargs="?", const="metrics.json", default=None, metavar="FILENAME",
+        help="count calls, time and cache hits of the instrumented helpers, and write them as JSON")
+    run_parser.add_argument(
+        "--sample", action="store_true", help="profile a single day/part with the low-overhead sampling profiler")
+    run_parser.add_argument("--sample-interval", type=float, default=0.005, help="seconds of CPU time between samples")
+    run_parser.add_argument(
+        "--top", type=int, default=25, help="functions to list with --profile, allocation sites with --memory")
+    run_parser.set_defaults(handler=run)
+
+    bench_parser = commands.add_parser("bench", help="time parse and solve of each day/part over repeated runs")
+    add_job_arguments(bench_parser)
+    bench_parser.add_argument("--warmup", type=int, default=1, help="untimed runs before measuring")
+    bench_parser.add_argument("--repeat", type=positive_int, default=5, help="timed runs")
+    bench_parser.add_argument(
+        "--no-record", dest="record", action="store_false", help="don't add the results to the history")
+    bench_parser.set_defaults(handler=bench)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two recorded benchmark runs")
+    compare_parser.add_argument("base", help="commit of the baseline run")
+    compare_parser.add_argument("head", nargs="?", help="commit to check, the current one by default")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown, as a fraction")
+    compare_parser.set_defaults(handler=compare_runs)
+
+    watch_parser = commands.add_parser(
+        "watch", help="solve again the day/parts affected by every change to the solutions and their imports")
+    add_job_arguments(watch_parser)
+    watch_parser.add_argument(
+        "-j", "--jobs", type=positive_int, default=os.cpu_count() or 1, help="number of worker processes")
+    watch_parser.add_argument("--timeout", type=float, default=None, help="seconds before a job is killed")
+    watch_parser.add_argument("--interval", type=float, default=0.5, help="seconds between polls for changes")
+    watch_parser.set_defaults(handler=watch_jobs)
+
+    daemon_parser = commands.add_parser(
+        "daemon", help="keep the solutions imported and their inputs parsed, serving `solve` requests")
+    daemon_parser.add_argument("--socket", default=daemon.DEFAULT_SOCKET, help="unix socket to listen on")
+    daemon_parser.add_argument("--timeout", type=float, default=None, help="seconds before a job is interrupted")
+    daemon_parser.add_argument("--stop", action="store_true", help="stop the daemon listening on the socket")
+    daemon_parser.set_defaults(handler=serve)
+
+    solve_parser = commands.add_parser("solve", help="solve day/parts in the running daemon")
+    add_job_arguments(solve_parser)
+    solve_parser.add_argument("--socket", default=daemon.DEFAULT_SOCKET, help="unix socket of the daemon")
+    solve_parser.set_defaults(handler=solve)
+
+    prune_parser = commands.add_parser(
+        "prune-memo", help="delete the disk-memoized results of function versions that haven't been used in a while")
+    prune_parser.add_argument("--days", type=float, default=30, help="how long a version may go unused")
+    prune_parser.set_defaults(handler=prune_memo)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,42 @@
-from typing import Any, Callable, List, TypeVar, Optional, overload, Union
-
-import subprocess
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Literal, Tuple, TypeVar, Optional, overload, Union
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+import types
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlencode
+
+from answer_ledger import CORRECT, TOO_HIGH, TOO_LOW, WRONG, AnswerLedger
+from aoc_http import DEFAULT_BASE_URL, ConnectionPool
+from input_cache import InputCache
+from input_store import Chunk, InputStore
 
 T = TypeVar('T')
 
+# What the solvers' solve(part, input) accepts: the raw input text, or its lines
+PuzzleInput = Union[str, Iterable[str]]
+
+# One store (and thus one mapping of the cache file) per puzzle input, shared by every caller in the process
+_STORES: Dict[Tuple[int, int], InputStore] = {}
+
+_CACHE_ROOT: Optional[str] = os.environ.get("AOC_CACHE_ROOT")
+_INPUT_CACHES: Dict[str, InputCache] = {}
+
+# Below this many records, get_input(workers=...) maps serially
+PARALLEL_MIN_ITEMS = 10_000
+
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
 
 @overload
 def get_input(day: int, year: int = 2023) -> List[str]:
@@ -11,70 +44,393 @@ def get_input(day: int, year: int = 2023) -> List[str]:
 
 
 @overload
-def get_input(day: int, mapper: Callable[[str], T], year: int = 2023) -> List[T]:
+def get_input(
+        day: int,
+        mapper: Callable[[str], T],
+        year: int = 2023,
+        persist: bool = False,
+        workers: int = 1) -> List[T]:
     ...
 
 
-def get_input(day: int, mapper: Optional[Callable[[str], T]] = None, year: int = 2023) -> Union[List[str], List[T]]:
+def get_input(
+        day: int,
+        mapper: Optional[Callable[[str], T]] = None,
+        year: int = 2023,
+        persist: bool = False,
+        workers: int = 1) -> Union[List[str], List[T]]:
     """
     Returns the mapped input for the given day, either as a list of strings or as a list of objects from
-    the optional mapper."""
-    lines = get_raw_input(day, year).split("\n")
-    if lines[-1] == "":
-        lines = lines[:-1]
+    the optional mapper.
+
+    If persist is set, the mapped output is also saved to disk, and later runs load it from there instead of calling
+    the mapper again (see _load_persisted). With workers > 1, the mapper runs in that many processes (see _map), so it
+    has to be picklable, i.e. a module-level function or static method."""
+    store = get_input_store(day, year)
 
     if mapper is not None:
-        return list(mapper(line) for line in lines)
+        if persist:
+            return _load_persisted("lines", day, year, mapper, lambda: _map(mapper, store, workers))
+        return _map(mapper, store, workers)
 
-    return lines
+    return store.lines()
 
 
-def get_input_chunks(day: int, mapper: Optional[Callable[[List[str]], T]] = None, year: int = 2023) -> Union[List[List[str]], List[T]]:
+def get_input_chunks(
+        day: int,
+        mapper: Optional[Callable[[List[str]], T]] = None,
+        year: int = 2023,
+        persist: bool = False,
+        workers: int = 1) -> Union[List[List[str]], List[T]]:
     """
     Returns the mapped input for the given day, either as a list of string chunks or as a list of objects
-    from the optional mapper."""
+    from the optional mapper. persist and workers work like they do for get_input."""
     chunks = get_raw_input_chunks(day, year)
 
     if mapper is not None:
-        return list(mapper(chunk) for chunk in chunks)
+        if persist:
+            return _load_persisted("chunks", day, year, mapper, lambda: _map(mapper, chunks, workers))
+        return _map(mapper, chunks, workers)
 
     return chunks
 
 
+def _map(mapper: Callable[[Any], T], items: Union[InputStore, List[Any]], workers: int) -> List[T]:
+    """
+    Maps the items (lines of a store, or a list of chunks) in order, in a process pool when workers > 1.
+
+    Small inputs are always mapped serially, since starting the pool would cost more than it saves. So is everything
+    on a single core machine."""
+    workers = min(workers, os.cpu_count() or 1)
+    if workers <= 1 or len(items) < PARALLEL_MIN_ITEMS:
+        iterator = items.iter_lines() if isinstance(items, InputStore) else items
+        return list(mapper(item) for item in iterator)
+
+    if isinstance(items, InputStore):
+        items = items.lines()
+
+    # a few batches per worker keeps the pool busy without paying per-item IPC
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(mapper, items, chunksize=chunksize))
+
+
+@overload
+def iter_input(day: int, year: int = 2023) -> Iterator[str]:
+    ...
+
+
+@overload
+def iter_input(day: int, mapper: Callable[[str], T], year: int = 2023) -> Iterator[T]:
+    ...
+
+
+def iter_input(day: int, mapper: Optional[Callable[[str], T]] = None, year: int = 2023) -> Union[Iterator[str], Iterator[T]]:
+    """
+    Streaming version of get_input. Reads the cached input one line at a time and yields each (optionally mapped)
+    line as soon as it's read, so only one record is alive at a time."""
+    _ensure_cached(day, year)
+
+    cache = get_input_cache()
+    if cache is not None:
+        for line in cache.iter_lines(year, day):
+            yield mapper(line) if mapper is not None else line
+        return
+
+    with open(_cache_filename(day, year), "r") as f:
+        for line in f:
+            line = line[:-1] if line.endswith("\n") else line
+            yield mapper(line) if mapper is not None else line
+
+
+def iter_chunks(day: int, mapper: Optional[Callable[[List[str]], T]] = None, year: int = 2023) -> Union[Iterator[List[str]], Iterator[T]]:
+    """
+    Streaming version of get_input_chunks. Yields each (optionally mapped) chunk as soon as its closing empty line
+    is read."""
+    chunk: List[str] = []
+    for line in iter_input(day, year=year):
+        if line == "":
+            yield mapper(chunk) if mapper is not None else chunk
+            chunk = []
+            continue
+        chunk.append(line)
+
+    if chunk != []:
+        yield mapper(chunk) if mapper is not None else chunk
+
+
+def get_input_store(day: int, year: int = 2023) -> InputStore:
+    """
+    Returns the memory-mapped input store for the given day, downloading the input first if it isn't cached yet."""
+    key = (year, day)
+    if key not in _STORES:
+        _ensure_cached(day, year)
+
+        cache = get_input_cache()
+        if cache is not None:
+            # compressed objects can't be mapped, decompress once and share the buffer instead
+            _STORES[key] = InputStore.from_bytes(cache.read(year, day))
+        else:
+            _STORES[key] = InputStore(_cache_filename(day, year))
+
+    return _STORES[key]
+
+
 def get_raw_input(day: int, year: int = 2023) -> str:
     """
     Returns the raw string input for the given day."""
-    cache_filename = f"./cache-{year}-{day}.txt"
+    return get_input_store(day, year).text()
+
+
+def drop_input(day: int, year: int = 2023):
+    """
+    Forgets the input store of the given day, so the next read sees the input as it is in the cache now. The store
+    isn't closed, lazy chunks of it may still be around."""
+    _STORES.pop((year, day), None)
+
+
+def input_digest(day: int, year: int = 2023) -> str:
+    """
+    Returns the sha256 hex digest of the input for the given day, downloading it first if it isn't cached yet. Unlike
+    get_input_store(...).digest(), this doesn't keep the input around in the process."""
+    _ensure_cached(day, year)
+
+    cache = get_input_cache()
+    if cache is not None:
+        return cache.entry(year, day).digest
+
+    digest = hashlib.sha256()
+    with open(_cache_filename(day, year), "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def set_cache_root(root: Optional[str]):
+    """
+    Sets the directory of the shared, compressed input cache (see input_cache.py). None goes back to plain
+    cache-{year}-{day}.txt files in the working directory. Defaults to the AOC_CACHE_ROOT environment variable."""
+    global _CACHE_ROOT
+    _CACHE_ROOT = root
+    _STORES.clear()
+
+
+def get_input_cache() -> Optional[InputCache]:
+    """
+    Returns the shared input cache, or None when inputs are cached as plain files in the working directory."""
+    if _CACHE_ROOT is None:
+        return None
+
+    if _CACHE_ROOT not in _INPUT_CACHES:
+        _INPUT_CACHES[_CACHE_ROOT] = InputCache(_CACHE_ROOT)
+
+    return _INPUT_CACHES[_CACHE_ROOT]
+
+
+def _cache_filename(day: int, year: int) -> str:
+    return f"./cache-{year}-{day}.txt"
+
+
+def _is_cached(day: int, year: int) -> bool:
+    cache = get_input_cache()
+    if cache is not None:
+        return cache.has(year, day)
+
+    return os.path.exists(_cache_filename(day, year))
+
+
+def _ensure_cached(day: int, year: int):
+    """
+    Downloads the input for the given day into the cache if needed."""
+    if _is_cached(day, year):
+        return
+
+    cache_filename = _cache_filename(day, year)
+    cache = get_input_cache()
+    if cache is not None:
+        if os.path.exists(cache_filename):
+            # migrate inputs cached by older checkouts instead of downloading them again
+            with open(cache_filename, "r") as f:
+                cache.put(year, day, f.read())
+        else:
+            cache.put(year, day, _request("GET", f"/{year}/day/{day}/input"))
+        return
+
+    data = _request("GET", f"/{year}/day/{day}/input")
+
+    # write under a temporary name first so concurrent readers never see a partial file
+    temp_filename = f"{cache_filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_filename, "w") as f:
+        f.write(data)
+    os.replace(temp_filename, cache_filename)
+
+
+def prefetch(days: Iterable[int], year: int = 2023, concurrency: int = 4) -> List[int]:
+    """
+    Downloads the inputs for the given days that aren't cached yet, at most `concurrency` at a time. Returns the days
+    that were actually downloaded."""
+    return asyncio.run(_prefetch(list(days), year, concurrency))
+
+
+async def _prefetch(days: List[int], year: int, concurrency: int) -> List[int]:
+    missing = [day for day in days if not _is_cached(day, year)]
+    semaphore = asyncio.Semaphore(concurrency)
+    _get_pool(concurrency)
+
+    async def fetch(day: int):
+        async with semaphore:
+            await asyncio.to_thread(_ensure_cached, day, year)
+
+    await asyncio.gather(*(fetch(day) for day in missing))
+    return missing
+
+
+def _load_persisted(kind: str, day: int, year: int, mapper: Callable, parse: Callable[[], List[T]]) -> List[T]:
+    """
+    Returns the parsed input from the on-disk cache if there is one, otherwise calls parse and stores its result.
+
+    Cache entries are keyed by the input's content hash and by the mapper's qualified name plus a hash of the loaded
+    code of the module that defines it, so changing the parser (or any helper next to it) invalidates the cached copy.
+    It's the code this process runs rather than the file, which may have been edited since it was imported."""
+    key = hashlib.sha256()
+    key.update(kind.encode())
+    key.update(get_input_store(day, year).digest().encode())
+    key.update(_mapper_fingerprint(mapper).encode())
+
+    if _CACHE_ROOT is not None:
+        os.makedirs(os.path.join(_CACHE_ROOT, "parsed"), exist_ok=True)
+        cache_filename = os.path.join(_CACHE_ROOT, "parsed", f"{year}-{day}-{key.hexdigest()[:16]}.pickle")
+    else:
+        cache_filename = f"./cache-{year}-{day}-{key.hexdigest()[:16]}.pickle"
     try:
-        with open(cache_filename, "r") as f:
-            return f.read()
-    except FileNotFoundError:
+        with open(cache_filename, "rb") as f:
+            return pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        # missing, or written by code that no longer exists
         pass
 
-    url = f"https://adventofcode.com/{year}/day/{day}/input"
-    command = ["curl", url, "--cookie", _get_session_cookie()]
+    result = parse()
 
-    result = subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    data = result.stdout.decode('utf-8')
+    temp_filename = f"{cache_filename}.{os.getpid()}.tmp"
+    with open(temp_filename, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_filename, cache_filename)
+
+    return result
 
-    with open(cache_filename, "w") as f:
-        f.write(data)
 
-    return data
+def _mapper_fingerprint(mapper: Callable) -> str:
+    name = f"{getattr(mapper, '__module__', '')}.{getattr(mapper, '__qualname__', repr(mapper))}"
+    if not hasattr(mapper, "__code__") and not inspect.isclass(mapper):
+        # builtins and friends have no code to hash, the name has to do
+        return name
 
+    digest = hashlib.sha256()
+    _hash_code(mapper, digest)
+    module = sys.modules.get(mapper.__module__)
+    if module is not None:
+        for attribute, value in sorted(vars(module).items()):
+            if getattr(value, "__module__", None) == module.__name__ and value is not mapper:
+                digest.update(attribute.encode())
+                _hash_code(value, digest)
 
-def get_raw_input_chunks(day: int, year: int = 2023) -> List[List[str]]:
+    return f"{name}:{digest.hexdigest()}"
+
+
+def _hash_code(value: Any, digest: Any):
     """
-    Returns the puzzle input chunked by empty lines."""
-    lines = get_raw_input(day, year).split("\n")
+    Adds the bytecode, constants and names of a function, or of a class's methods, to the digest."""
+    if inspect.isclass(value):
+        for _, attribute in sorted(vars(value).items()):
+            if isinstance(attribute, (staticmethod, classmethod)):
+                attribute = attribute.__func__
+            if inspect.isfunction(attribute):
+                _hash_code(attribute, digest)
+        return
+
+    code = getattr(value, "__code__", None)
+    if code is not None:
+        _hash_code_object(code, digest)
+
+
+def _hash_code_object(code: types.CodeType, digest: Any):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            _hash_code_object(constant, digest)
+        else:
+            digest.update(_constant_repr(constant).encode())
+
+
+def _constant_repr(constant: Any) -> str:
+    # sets of strings repr in an order that changes with every process's hash seed
+    if isinstance(constant, frozenset):
+        return f"frozenset({sorted(map(_constant_repr, constant))})"
+    if isinstance(constant, tuple):
+        return f"({', '.join(map(_constant_repr, constant))})"
+    return repr(constant)
+
+
+@overload
+def get_raw_input_chunks(day: int, year: int = 2023, lazy: Literal[False] = False) -> List[List[str]]:
+    ...
+
+
+@overload
+def get_raw_input_chunks(day: int, year: int = 2023, *, lazy: Literal[True]) -> List[Chunk]:
+    ...
+
+
+def get_raw_input_chunks(day: int, year: int = 2023, lazy: bool = False) -> Union[List[List[str]], List[Chunk]]:
+    """
+    Returns the puzzle input chunked by empty lines. With lazy set, returns Chunk objects that are only split into
+    lines when their lines() are requested."""
+    return get_input_store(day, year).chunks(lazy=lazy)
+
+
+def get_raw_input_chunk(day: int, idx: int, year: int = 2023) -> List[str]:
+    """
+    Returns a single chunk of the puzzle input. With a shared input cache, only the compressed blocks holding that
+    chunk are read."""
+    _ensure_cached(day, year)
+
+    cache = get_input_cache()
+    if cache is not None and (year, day) not in _STORES:
+        return cache.read_chunk(year, day, idx)
+
+    return get_input_store(day, year).chunks(lazy=True)[idx].lines()
+
+
+def as_lines(input: PuzzleInput) -> List[str]:
+    """
+    Returns the puzzle input as a list of lines, whether it was given as raw text or as lines already."""
+    if isinstance(input, str):
+        lines = input.split("\n")
+        if lines[-1] == "":
+            lines = lines[:-1]
+        return lines
+
+    return input if isinstance(input, list) else list(input)
+
+
+def iter_lines(input: PuzzleInput) -> Iterator[str]:
+    """
+    Like as_lines, but keeps streamed inputs (e.g. from iter_input) streaming."""
+    if isinstance(input, str):
+        return iter(as_lines(input))
+
+    return iter(input)
 
-    if lines[-1] == "":
-        lines = lines[:-1]
 
+def as_chunks(input: PuzzleInput) -> List[List[str]]:
+    """
+    Returns the puzzle input chunked by empty lines, whether it was given as raw text or as lines."""
     result = []
 
     chunk = []
-    for line in lines:
+    for line in iter_lines(input):
         if line == "":
             result.append(chunk)
             chunk = []
@@ -87,34 +443,147 @@ def get_raw_input_chunks(day: int, year: int = 2023) -> List[List[str]]:
     return result
 
 
+class SubmittedTooRecently(Exception):
+    """
+    Raised when the server refuses a submission because the previous one was too recent."""
+
+    def __init__(self, wait_seconds: int):
+        super().__init__(f"🕒🕒🕒 Submitted too recently, {wait_seconds}s left to wait")
+        self.wait_seconds = wait_seconds
+
+
 def submit(day: int, level: int, answer: Any, really: bool = False, year: int = 2023) -> bool:
     """
-    Submits the given answer, on the given day and level (level should be 1 or 2)"""
+    Submits the given answer, on the given day and level (level should be 1 or 2)
+
+    Answers whose verdict is already known from the local ledger (repeats, or numbers outside known too high/too low
+    bounds) are settled locally without contacting the server."""
 
     if not really:
         print(f"{answer} - not actually submitting ({year}-{day} (part {level})")
         return False
 
-    url = f"https://adventofcode.com/{year}/day/{day}/answer"
-    command = ["curl", "-X", "POST", url, "--cookie", _get_session_cookie(), "-d", f"level={level}", "-d", f"answer={answer}"]
+    ledger = _get_ledger()
+    known_verdict = ledger.check(year, day, level, answer)
+    if known_verdict == CORRECT:
+        print(f"{answer} was already accepted for {year}-{day} (part {level}), not resubmitting")
+        return True
+    if known_verdict is not None:
+        print(f"{answer} is known to be wrong ({known_verdict}) for {year}-{day} (part {level}), not resubmitting")
+        return False
 
-    result = subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    data = result.stdout.decode('utf-8')
+    data = _request("POST", f"/{year}/day/{day}/answer", form={"level": level, "answer": answer})
 
     if data.find("That's not the right answer") != -1:
+        if data.find("your answer is too high") != -1:
+            verdict = TOO_HIGH
+        elif data.find("your answer is too low") != -1:
+            verdict = TOO_LOW
+        else:
+            verdict = WRONG
+        ledger.record(year, day, level, answer, verdict)
         print(f"{answer} is wrong for {year}-{day} (part {level})... :(")
         return False
 
     if data.find("That's the right answer") != -1:
+        ledger.record(year, day, level, answer, CORRECT)
         print(f"⭐⭐⭐ You got it! For {year}-{day} (part {level}) ⭐⭐⭐")
         return True
 
     if data.find("You gave an answer too recently") != -1:
-        raise Exception("🕒🕒🕒 Submitted too recently")
+        raise SubmittedTooRecently(_parse_wait_seconds(data))
 
     raise Exception("Got neither right nor wrong answer, whoops")
 
 
+class SubmissionQueue:
+    """
+    Submits answers one after the other, honoring the server's rate limit.
+
+    When a submission is refused for being too recent, the wait time is parsed from the response and the same answer
+    is retried once it has passed, instead of failing or hammering the endpoint."""
+
+    def __init__(self, year: int = 2023, max_attempts: int = 5):
+        self.year = year
+        self.max_attempts = max_attempts
+        self._pending: Deque[Tuple[int, int, Any]] = deque()
+        self._not_before = 0.0
+
+    def put(self, day: int, level: int, answer: Any):
+        self._pending.append((day, level, answer))
+
+    def run(self) -> Dict[Tuple[int, int], bool]:
+        """
+        Submits every queued answer, sleeping through rate limits. Returns whether each (day, level) was accepted."""
+        result: Dict[Tuple[int, int], bool] = {}
+
+        while len(self._pending) > 0:
+            day, level, answer = self._pending.popleft()
+
+            for attempt in range(self.max_attempts):
+                delay = self._not_before - time.monotonic()
+                if delay > 0:
+                    print(f"🕒 Waiting {delay:.0f}s before submitting {self.year}-{day} (part {level})")
+                    time.sleep(delay)
+
+                try:
+                    result[(day, level)] = submit(day, level, answer, really=True, year=self.year)
+                    break
+                except SubmittedTooRecently as e:
+                    # one extra second of slack, the server rounds down
+                    self._not_before = time.monotonic() + e.wait_seconds + 1
+            else:
+                raise Exception(
+                    f"Gave up submitting {self.year}-{day} (part {level}) after {self.max_attempts} attempts")
+
+        return result
+
+
+WAIT_PATTERN = re.compile(r"You have (?:(\d+)m )?(\d+)s left to wait")
+
+
+def _parse_wait_seconds(data: str) -> int:
+    match = WAIT_PATTERN.search(data)
+    if match is None:
+        # no explicit wait time, the server's minimum is one minute
+        return 60
+
+    return int(match.group(1) or 0) * 60 + int(match.group(2))
+
+
+@functools.cache
+def _get_ledger() -> AnswerLedger:
+    return AnswerLedger()
+
+
+def _request(method: str, path: str, form: Optional[Dict[str, Any]] = None) -> str:
+    headers = {"Cookie": _get_session_cookie()}
+    body = None
+    if form is not None:
+        body = urlencode(form).encode()
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+    status, data = _get_pool().request(method, path, body=body, headers=headers)
+    if status != 200:
+        raise Exception(f"{method} {path} failed with status {status}")
+
+    return data.decode('utf-8')
+
+
+def _get_pool(size: int = 4) -> ConnectionPool:
+    """
+    Returns the shared connection pool, creating it on first use. The server can be overridden with AOC_BASE_URL
+    (see aoc_server.py for a local stand-in)."""
+    global _POOL
+
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ConnectionPool(os.environ.get("AOC_BASE_URL", DEFAULT_BASE_URL), size=size)
+
+    return _POOL
+
+
+@functools.cache
 def _get_session_cookie() -> str:
     with open("./session", "r") as f:
-        return f"session={f.read()}"
+        return f"session={f.read().strip()}"
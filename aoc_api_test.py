@@ -0,0 +1,203 @@
+import glob
+import http.client
+import importlib
+import math
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import aoc_api
+from aoc_http import ConnectionPool
+from aoc_server import FakeAocServer
+
+
+def _tag(line: str):
+    # picklable, so it can be mapped in a pool
+    return os.getpid(), line.upper()
+
+
+class TestAocApi(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeAocServer(
+            inputs={(2023, day): f"input for day {day}\n" for day in range(1, 26)},
+            answers={(2023, 1, 1): "42"}).start()
+        aoc_api._POOL = ConnectionPool(self.server.base_url, size=4)
+
+        self.old_cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        with open("session", "w") as f:
+            f.write("fake")
+
+        aoc_api._get_ledger.cache_clear()
+
+    def tearDown(self):
+        aoc_api._get_ledger.cache_clear()
+        aoc_api._POOL.close()
+        aoc_api._POOL = None
+        aoc_api._STORES.clear()
+        self.server.stop()
+        os.chdir(self.old_cwd)
+        self.directory.cleanup()
+
+    def test_get_input_downloads_once(self):
+        self.assertEqual(aoc_api.get_input(3), ["input for day 3"])
+        self.assertEqual(aoc_api.get_input(3), ["input for day 3"])
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_prefetch(self):
+        aoc_api.get_input(1)
+        self.assertEqual(sorted(aoc_api.prefetch(range(1, 26))), list(range(2, 26)))
+        self.assertEqual(aoc_api.prefetch(range(1, 26)), [])
+        self.assertEqual(self.server.request_count, 25)
+        # keep-alive: far fewer connections than requests
+        self.assertLessEqual(self.server.connection_count, 4)
+
+    def test_submit(self):
+        self.assertTrue(aoc_api.submit(day=1, level=1, answer=42, really=True))
+        self.assertFalse(aoc_api.submit(day=1, level=1, answer=43, really=True))
+
+    def test_ledger_rejects_known_answers(self):
+        self.assertFalse(aoc_api.submit(day=1, level=1, answer=50, really=True))
+        self.assertFalse(aoc_api.submit(day=1, level=1, answer=50, really=True))
+        self.assertFalse(aoc_api.submit(day=1, level=1, answer=60, really=True))
+        self.assertEqual(self.server.request_count, 1)
+
+        self.assertTrue(aoc_api.submit(day=1, level=1, answer=42, really=True))
+        self.assertTrue(aoc_api.submit(day=1, level=1, answer=42, really=True))
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_too_recently(self):
+        self.server.cooldown_seconds = 60
+        self.assertFalse(aoc_api.submit(day=1, level=1, answer=10, really=True))
+        with self.assertRaises(aoc_api.SubmittedTooRecently) as raised:
+            aoc_api.submit(day=1, level=1, answer=42, really=True)
+        self.assertEqual(raised.exception.wait_seconds, 60)
+
+    def test_queue_waits_out_the_rate_limit(self):
+        self.server.answers[(2023, 2, 1)] = "7"
+        self.server.cooldown_seconds = 60
+        sleeps = []
+
+        def sleep(seconds: float):
+            sleeps.append(seconds)
+            self.server.last_submission = -math.inf
+
+        queue = aoc_api.SubmissionQueue()
+        queue.put(2, 1, 5)
+        queue.put(1, 1, 42)
+        with mock.patch("time.sleep", sleep):
+            self.assertEqual(queue.run(), {(2, 1): False, (1, 1): True})
+
+        # the refused answer is sent again after the wait the server asked for, plus a second
+        self.assertEqual(len(sleeps), 1)
+        self.assertAlmostEqual(sleeps[0], 61, delta=1)
+        self.assertEqual(self.server.request_count, 3)
+
+    def test_queue_skips_known_answers(self):
+        self.server.cooldown_seconds = 60
+        queue = aoc_api.SubmissionQueue()
+        queue.put(1, 1, 50)
+        queue.put(1, 1, 50)
+        with mock.patch("time.sleep") as sleep:
+            self.assertEqual(queue.run(), {(1, 1): False})
+
+        sleep.assert_not_called()
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_parse_wait_seconds(self):
+        self.assertEqual(aoc_api._parse_wait_seconds("You have 1m 5s left to wait."), 65)
+        self.assertEqual(aoc_api._parse_wait_seconds("You have 42s left to wait."), 42)
+        self.assertEqual(aoc_api._parse_wait_seconds("Please wait."), 60)
+
+    def test_submit_after_the_server_closed_an_idle_connection(self):
+        self.server.idle_seconds = 0.1
+        aoc_api.get_input(2)
+        time.sleep(0.3)
+
+        self.assertTrue(aoc_api.submit(day=1, level=1, answer=42, really=True))
+        self.assertEqual(self.server.request_count, 2)
+
+    def test_dropped_submission_is_not_resent(self):
+        for idle_connection in [False, True]:
+            if idle_connection:
+                aoc_api.get_input(2)
+            self.server.request_count = 0
+            self.server.drop_requests = 1
+
+            with self.assertRaises(http.client.RemoteDisconnected):
+                aoc_api._POOL.request("POST", "/2023/day/1/answer", body=b"level=1&answer=42")
+            self.assertEqual(self.server.request_count, 1)
+
+    def test_dropped_download_is_retried_on_a_reused_connection(self):
+        aoc_api._POOL.close()
+        aoc_api._POOL = ConnectionPool(self.server.base_url, size=1)
+        aoc_api.get_input(2)
+        self.server.drop_requests = 1
+
+        self.assertEqual(aoc_api.get_input(3), ["input for day 3"])
+        self.assertEqual(self.server.request_count, 3)
+
+    def test_persisted_input(self):
+        source = "CALLS = []\n\n\ndef mapper(line):\n    CALLS.append(line)\n    return line.split()\n"
+        with open("persisted_mapper.py", "w") as f:
+            f.write(source)
+        sys.path.insert(0, self.directory.name)
+        self.addCleanup(sys.path.remove, self.directory.name)
+        self.addCleanup(sys.modules.pop, "persisted_mapper", None)
+        module = importlib.import_module("persisted_mapper")
+
+        expected = [["input", "for", "day", "3"]]
+        self.assertEqual(aoc_api.get_input(3, module.mapper, persist=True), expected)
+        self.assertEqual(aoc_api.get_input(3, module.mapper, persist=True), expected)
+        self.assertEqual(module.CALLS, ["input for day 3"])
+        self.assertEqual(len(glob.glob("cache-2023-3-*.pickle")), 1)
+
+        # an edit to the file doesn't change the code that's running
+        with open("persisted_mapper.py", "w") as f:
+            f.write(source + "\n\ndef helper(line):\n    return line.upper()\n")
+        self.assertEqual(aoc_api.get_input(3, module.mapper, persist=True), expected)
+        self.assertEqual(module.CALLS, ["input for day 3"])
+
+        # loading it does, even when the change is in a helper next to the mapper
+        module = importlib.reload(module)
+        self.assertEqual(aoc_api.get_input(3, module.mapper, persist=True), expected)
+        self.assertEqual(module.CALLS, ["input for day 3"])
+        self.assertEqual(len(glob.glob("cache-2023-3-*.pickle")), 2)
+
+    def test_parallel_map_keeps_the_order(self):
+        lines = [f"line {idx}" for idx in range(40)]
+        with mock.patch.object(aoc_api, "PARALLEL_MIN_ITEMS", 10), mock.patch("os.cpu_count", return_value=4):
+            mapped = aoc_api._map(_tag, lines, workers=4)
+
+        self.assertEqual([line for _, line in mapped], [line.upper() for line in lines])
+        self.assertNotIn(os.getpid(), {pid for pid, _ in mapped})
+
+    def test_few_items_are_mapped_serially(self):
+        lines = [f"line {idx}" for idx in range(9)]
+        with mock.patch.object(aoc_api, "PARALLEL_MIN_ITEMS", 10), mock.patch("os.cpu_count", return_value=4):
+            mapped = aoc_api._map(_tag, lines, workers=4)
+            self.assertEqual(aoc_api.get_input(3, _tag, workers=4), [(os.getpid(), "INPUT FOR DAY 3")])
+
+        self.assertEqual(mapped, [(os.getpid(), line.upper()) for line in lines])
+
+    def test_shared_cache_root(self):
+        aoc_api.set_cache_root(os.path.join(self.directory.name, "shared"))
+        try:
+            self.assertEqual(aoc_api.get_input(3), ["input for day 3"])
+            self.assertEqual(list(aoc_api.iter_input(3)), ["input for day 3"])
+            self.assertEqual(aoc_api.get_raw_input_chunk(3, 0), ["input for day 3"])
+            self.assertFalse(os.path.exists("cache-2023-3.txt"))
+            self.assertEqual(self.server.request_count, 1)
+        finally:
+            aoc_api.set_cache_root(None)
+
+    def test_missing_input(self):
+        self.assertRaises(Exception, lambda: aoc_api.get_input(26))
+
+
+if __name__ == '__main__':
+    unittest.main()
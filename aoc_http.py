@@ -0,0 +1,93 @@
+import http.client
+import queue
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_BASE_URL = "https://adventofcode.com"
+
+# methods that may be sent again when we can't tell whether the server got them
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+
+class ConnectionPool:
+    """
+    A small pool of keep-alive HTTP connections to a single host.
+
+    Connections are created lazily up to the pool size and handed back after every request, so consecutive requests
+    (and concurrent ones, up to the pool size) reuse open sockets instead of reconnecting each time."""
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, size: int = 4, timeout: float = 30):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ["http", "https"]:
+            raise ValueError(f"Unsupported base url {base_url}")
+
+        self.base_url = base_url
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path_prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+
+        self._idle: "queue.LifoQueue[Optional[http.client.HTTPConnection]]" = queue.LifoQueue()
+        for _ in range(size):
+            # placeholders, turned into real connections on first use
+            self._idle.put(None)
+
+    def request(
+            self,
+            method: str,
+            path: str,
+            body: Optional[bytes] = None,
+            headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """
+        Performs the request on a pooled connection and returns the status code and the response body. Blocks while
+        every connection is busy.
+
+        An idempotent request that fails on a reused connection is sent once more on a fresh one, since the server may
+        have closed the idle connection in the meantime. Other requests (submitting an answer) can't be sent twice, the
+        server may have received them before the connection broke, so they always go out on a fresh connection."""
+        connection = self._idle.get()
+        if connection is not None and method not in IDEMPOTENT_METHODS:
+            connection.close()
+            connection = None
+
+        try:
+            for attempt in range(2):
+                reused = connection is not None
+                if connection is None:
+                    connection = self._connect()
+                try:
+                    connection.request(method, self._path_prefix + path, body=body, headers=headers or {})
+                    response = connection.getresponse()
+                    return response.status, response.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    connection.close()
+                    connection = None
+                    if attempt == 1 or not reused:
+                        raise
+        except BaseException:
+            if connection is not None:
+                connection.close()
+                connection = None
+            raise
+        finally:
+            self._idle.put(connection)
+
+        raise AssertionError("unreachable")
+
+    def close(self):
+        """
+        Closes every idle connection."""
+        connections = []
+        while not self._idle.empty():
+            connections.append(self._idle.get())
+
+        for connection in connections:
+            if connection is not None:
+                connection.close()
+            self._idle.put(None)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self._timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
@@ -0,0 +1,156 @@
+"""
+Local stand-in for the adventofcode.com endpoints that aoc_api talks to, so the client can be exercised offline.
+
+Run it with `python aoc_server.py --port 8023 --inputs .` and point the client at it with
+AOC_BASE_URL=http://localhost:8023."""
+import argparse
+import glob
+import math
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+INPUT_PATH = re.compile(r"^/(\d+)/day/(\d+)/input$")
+ANSWER_PATH = re.compile(r"^/(\d+)/day/(\d+)/answer$")
+
+
+class FakeAocServer(ThreadingHTTPServer):
+    """
+    Serves puzzle inputs and checks answers from in-memory tables keyed by (year, day) and (year, day, level)."""
+    daemon_threads = True
+
+    def __init__(
+            self,
+            port: int = 0,
+            inputs: Optional[Dict[Tuple[int, int], str]] = None,
+            answers: Optional[Dict[Tuple[int, int, int], str]] = None,
+            cooldown_seconds: int = 0,
+            idle_seconds: Optional[float] = None):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.inputs = inputs or {}
+        self.answers = answers or {}
+        self.cooldown_seconds = cooldown_seconds
+        # how long a keep-alive connection may sit idle before the server closes it, forever if None
+        self.idle_seconds = idle_seconds
+        self.last_submission = -math.inf
+        self.request_count = 0
+        self.connection_count = 0
+        # the next requests to close the connection without a response, after reading them
+        self.drop_requests = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> 'FakeAocServer':
+        """
+        Starts serving on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # read by StreamRequestHandler.setup, a timed out wait for the next request closes the connection
+        self.timeout = self.server.idle_seconds
+        super().setup()
+        self.server.connection_count += 1
+
+    def do_GET(self):
+        self.server.request_count += 1
+        if self._drop():
+            return
+
+        match = INPUT_PATH.match(self.path)
+        key = (int(match.group(1)), int(match.group(2))) if match else None
+        if key not in self.server.inputs:
+            self._reply(404, "404 Not Found")
+            return
+
+        self._reply(200, self.server.inputs[key])
+
+    def do_POST(self):
+        self.server.request_count += 1
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        if self._drop():
+            return
+
+        match = ANSWER_PATH.match(self.path)
+        if not match:
+            self._reply(404, "404 Not Found")
+            return
+
+        form = parse_qs(body)
+        key = (int(match.group(1)), int(match.group(2)), int(form["level"][0]))
+        if key not in self.server.answers:
+            self._reply(404, "404 Not Found")
+            return
+
+        wait = self.server.last_submission + self.server.cooldown_seconds - time.monotonic()
+        if wait > 0:
+            self._reply(200, f"<article><p>You gave an answer too recently; you have to wait after submitting an "
+                             f"answer before trying again.  You have {math.ceil(wait)}s left to wait.</p></article>")
+            return
+        self.server.last_submission = time.monotonic()
+
+        expected, answer = self.server.answers[key], form["answer"][0]
+        if expected == answer:
+            self._reply(200, "<article><p>That's the right answer!</p></article>")
+        elif expected.isdigit() and answer.isdigit():
+            direction = "high" if int(answer) > int(expected) else "low"
+            self._reply(200, f"<article><p>That's not the right answer; your answer is too {direction}.</p></article>")
+        else:
+            self._reply(200, "<article><p>That's not the right answer.</p></article>")
+
+    def _drop(self) -> bool:
+        if self.server.drop_requests == 0:
+            return False
+
+        self.server.drop_requests -= 1
+        self.close_connection = True
+        return True
+
+    def _reply(self, status: int, text: str):
+        data = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def load_inputs(directory: str) -> Dict[Tuple[int, int], str]:
+    """
+    Loads every cache-{year}-{day}.txt file in the directory."""
+    result = {}
+    for filename in glob.glob(os.path.join(directory, "cache-*-*.txt")):
+        match = re.match(r"cache-(\d+)-(\d+)\.txt$", os.path.basename(filename))
+        if match:
+            with open(filename, "r") as f:
+                result[(int(match.group(1)), int(match.group(2)))] = f.read()
+
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8023)
+    parser.add_argument("--inputs", default=".", help="directory with cache-{year}-{day}.txt files to serve")
+    args = parser.parse_args()
+
+    server = FakeAocServer(port=args.port, inputs=load_inputs(args.inputs))
+    print(f"Serving {len(server.inputs)} inputs on {server.base_url}")
+    server.serve_forever()
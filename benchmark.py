@@ -0,0 +1,212 @@
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import caches
+import disk_cache
+from aoc_api import PuzzleInput, get_raw_input
+from runner import Job
+
+
+@dataclass(frozen=True)
+class Timing:
+    """
+    Summary of repeated measurements, in seconds."""
+    median: float
+    iqr: float
+    runs: List[float]
+
+    @staticmethod
+    def of(runs: List[float]) -> 'Timing':
+        if len(runs) < 2:
+            return Timing(median=runs[0], iqr=0.0, runs=runs)
+
+        q1, _, q3 = statistics.quantiles(runs, n=4)
+        return Timing(median=statistics.median(runs), iqr=q3 - q1, runs=runs)
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    job: Job
+    answer: Any
+    parse: Timing
+    solve: Timing
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    phase: str
+    base_median: float
+    head_median: float
+
+    @property
+    def ratio(self) -> float:
+        return self.head_median / self.base_median
+
+
+def benchmark(
+        job: Job,
+        input: PuzzleInput,
+        warmup: int = 1,
+        repeat: int = 5) -> BenchmarkResult:
+    """
+    Times parse and the part function of a day separately, `repeat` times after `warmup` untimed runs.
+
+    Memoized functions in the day's module are cleared before every run, otherwise every run after the first would
+    only measure cache hits. For the same reason, the results memoized on disk by earlier runs aren't used (see
+    disk_cache.disable). Days that parse lazily (e.g. streaming the lines) have their parsing counted in solve."""
+    if repeat < 1:
+        raise ValueError(f"Need at least one timed run, not {repeat}")
+
+    disk_cache.disable()
+    module = importlib.import_module(f"day{job.day}")
+    part_function = getattr(module, f"part{job.part}")
+
+    parse_runs, solve_runs = [], []
+    answer = None
+    for run in range(warmup + repeat):
+        _clear_caches(module)
+        with caches.scope():
+            parse_start = time.perf_counter()
+            parsed = module.parse(input)
+            solve_start = time.perf_counter()
+            answer = part_function(parsed)
+            solve_end = time.perf_counter()
+
+        if run >= warmup:
+            parse_runs.append(solve_start - parse_start)
+            solve_runs.append(solve_end - solve_start)
+
+    return BenchmarkResult(job, answer, Timing.of(parse_runs), Timing.of(solve_runs))
+
+
+def benchmark_jobs(
+        jobs: Iterable[Job],
+        warmup: int = 1,
+        repeat: int = 5,
+        year: int = 2023,
+        on_result: Optional[Callable[[BenchmarkResult], None]] = None) -> List[BenchmarkResult]:
+    """
+    Benchmarks the jobs one after the other in this process, skipping parts that don't exist."""
+    disk_cache.disable()
+    results = []
+    for job in jobs:
+        if not hasattr(importlib.import_module(f"day{job.day}"), f"part{job.part}"):
+            continue
+
+        result = benchmark(job, get_raw_input(job.day, year), warmup, repeat)
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    return results
+
+
+class BenchmarkHistory:
+    """
+    Benchmark results persisted as JSON, keyed by the git commit they were measured at and then by year-day-part.
+
+    A dirty working tree is recorded as "<commit>-dirty", so measurements of uncommitted changes don't overwrite the
+    ones of the commit they're based on."""
+
+    def __init__(self, filename: str = "./benchmark-history.json"):
+        self.filename = filename
+        self._runs: Dict[str, Dict] = {}
+
+        try:
+            with open(filename, "r") as f:
+                self._runs = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    def commits(self) -> List[str]:
+        return list(self._runs)
+
+    def get(self, commit: str) -> Dict[str, Dict]:
+        if commit not in self._runs:
+            raise ValueError(f"No benchmarks recorded for {commit}, have {', '.join(self._runs) or 'none'}")
+
+        return self._runs[commit]["results"]
+
+    def record(self, commit: str, results: Iterable[BenchmarkResult], year: int = 2023):
+        """
+        Records the results under the commit, merging with (and replacing) earlier results for the same jobs."""
+        run = self._runs.setdefault(commit, {"results": {}})
+        run["timestamp"] = time.time()
+        for result in results:
+            run["results"][f"{year}-{result.job.day}-{result.job.part}"] = {
+                "answer": str(result.answer),
+                "parse": asdict(result.parse),
+                "solve": asdict(result.solve),
+            }
+
+        temp_filename = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temp_filename, "w") as f:
+            json.dump(self._runs, f, indent=2, sort_keys=True)
+        os.replace(temp_filename, self.filename)
+
+
+def compare(history: BenchmarkHistory, base: str, head: str, threshold: float = 0.1) -> List[Regression]:
+    """
+    Returns the jobs and phases whose median got slower by more than `threshold` (a fraction) from base to head.
+
+    Medians below a millisecond are ignored, they're mostly timer noise."""
+    base_results, head_results = history.get(base), history.get(head)
+
+    result = []
+    for key in sorted(set(base_results) & set(head_results)):
+        for phase in ["parse", "solve"]:
+            base_median = base_results[key][phase]["median"]
+            head_median = head_results[key][phase]["median"]
+            if max(base_median, head_median) < 1e-3:
+                continue
+            if head_median > base_median * (1 + threshold):
+                result.append(Regression(key, phase, base_median, head_median))
+
+    return result
+
+
+def current_commit() -> str:
+    """
+    Returns the short hash of HEAD, suffixed with -dirty if the working tree has changes."""
+    commit = _git("rev-parse", "--short", "HEAD")
+    if _git("status", "--porcelain", "--untracked-files=no") != "":
+        commit += "-dirty"
+
+    return commit
+
+
+def format_result(result: BenchmarkResult) -> str:
+    return (
+        f"day {result.job.day:>2} part {result.job.part}  "
+        f"parse {_format_timing(result.parse)}  solve {_format_timing(result.solve)}  answer {result.answer}")
+
+
+def format_regressions(regressions: List[Regression]) -> str:
+    return "\n".join(
+        f"{r.key} {r.phase}: {r.base_median * 1000:.3f}ms -> {r.head_median * 1000:.3f}ms ({r.ratio:.2f}x)"
+        for r in regressions)
+
+
+def _format_timing(timing: Timing) -> str:
+    return f"{timing.median * 1000:10.3f}ms ± {timing.iqr * 1000:8.3f}ms"
+
+
+def _clear_caches(module: ModuleType):
+    # caches.scope() clears the named caches, these are functools caches that caches.py doesn't know about
+    for value in vars(module).values():
+        if callable(getattr(value, "cache_clear", None)):
+            value.cache_clear()
+
+
+def _git(*args: str) -> str:
+    # the solutions' repository, not wherever the inputs happen to be
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return subprocess.run(["git", *args], cwd=directory, check=True, capture_output=True, text=True).stdout.strip()
@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+import day13
+import disk_cache
+from benchmark import BenchmarkHistory, BenchmarkResult, Timing, benchmark, compare
+from disk_cache import disk_memoize
+from generators import generate
+from runner import Job
+
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.history = BenchmarkHistory(os.path.join(self.directory.name, "history.json"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_timing(self):
+        timing = Timing.of([5.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(timing.median, 3.0)
+        self.assertEqual(timing.iqr, 3.0)
+        self.assertEqual(Timing.of([2.0]), Timing(2.0, 0.0, [2.0]))
+
+    def test_benchmark(self):
+        input = generate(13, 20, seed=1)
+        result = benchmark(Job(13, 2), input, warmup=1, repeat=3)
+
+        self.assertEqual(result.answer, day13.solve(2, input))
+        self.assertEqual(len(result.parse.runs), 3)
+        self.assertEqual(len(result.solve.runs), 3)
+
+        with self.assertRaises(ValueError):
+            benchmark(Job(13, 2), input, warmup=1, repeat=0)
+
+    def test_disk_memoized_results_are_recomputed(self):
+        was_enabled = disk_cache.ENABLED
+        disk_cache.ENABLED = True
+        self.addCleanup(setattr, disk_cache, "ENABLED", was_enabled)
+
+        calls = []
+
+        filename = os.path.join(self.directory.name, "memo.sqlite3")
+
+        @disk_memoize(name="test.benchmark_square", filename=filename, min_seconds=0)
+        def square(n: int) -> int:
+            calls.append(n)
+            return n * n
+
+        # stored on disk by an earlier run, and the module imported before benchmarking, as benchmark_jobs does
+        square(7)
+        square.store.flush()
+        calls.clear()
+
+        module = types.ModuleType("day99")
+        module.parse = int
+        module.part1 = square
+        sys.modules["day99"] = module
+        self.addCleanup(sys.modules.pop, "day99")
+
+        result = benchmark(Job(99, 1), "7", warmup=1, repeat=3)
+        self.assertEqual(result.answer, 49)
+        self.assertEqual(calls, [7] * 4)
+
+    def test_compare(self):
+        def result(day: int, solve_seconds: float) -> BenchmarkResult:
+            return BenchmarkResult(Job(day, 1), 0, Timing.of([0.0]), Timing.of([solve_seconds]))
+
+        self.history.record("base", [result(1, 1.0), result(2, 1.0), result(3, 0.0001)])
+        self.history.record("head", [result(1, 1.05), result(2, 1.5), result(3, 0.0005)])
+
+        regressions = compare(BenchmarkHistory(self.history.filename), "base", "head", threshold=0.1)
+        self.assertEqual([(r.key, r.phase) for r in regressions], [("2023-2-1", "solve")])
+        self.assertAlmostEqual(regressions[0].ratio, 1.5)
+
+        with self.assertRaises(ValueError):
+            compare(self.history, "base", "missing")
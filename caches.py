@@ -0,0 +1,358 @@
+"""
+Named, memory-bounded caches for memoization.
+
+    @memoize
+    def flood_fill(grid: Grid, point: Tuple[int, int]) -> Set[Tuple[int, int]]: ...
+
+    @unbounded_memoize
+    def fuel(mass: int) -> int: ...
+
+    FLOOD_FILLS = get_cache("day10.flood_fills")
+    fill = FLOOD_FILLS.get(point)
+    FLOOD_FILLS.put(point, fill)
+
+Every cache is an LRU that estimates the bytes of what it holds, and can be capped on its own. On top of that, all
+caches together are capped at AOC_CACHE_MAX_BYTES (1G by default, see set_max_total_bytes); when the total goes over,
+the cache holding the most bytes gives up its least recently used entries first.
+
+Sizes are estimates, since measuring every entry would cost more than most of the memoized calls save. One entry in
+SAMPLE_EVERY is measured (sys.getsizeof of each key element and of the value, plus that of their direct elements) and
+a cache counts as its number of entries times the mean of those samples. Containers that turn up in several samples
+are taken out of the mean and counted once, so the grid every memo key starts with, or the one fill set stored under
+each of its points, don't count as if every entry had a copy.
+
+Hot recursive memos with small entries and a small number of distinct arguments, called millions of times, are better
+off with unbounded_memoize: it is functools.cache, whose hits never leave C, registered here under a name so it's
+cleared and reported with the others. Its entries can't be reached to measure them, so it is neither bounded nor
+counted in the total; a memo whose arguments grow with the input belongs in a bounded cache.
+
+Caches live as long as the process, which for the runner is a single solve, but not for anything that solves many
+times over. scope() clears them on the way in and out of a solve. Hit and miss counts survive clearing, so they add up
+over the whole life of the process like instrumentation expects."""
+import contextlib
+import functools
+import os
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, NamedTuple, Optional, Set, Tuple, TypeVar, Union
+
+from memory_profiling import format_size, parse_size
+
+T = TypeVar('T')
+
+_MISSING = object()
+_KWARGS_MARK = object()
+
+# one entry in this many is measured, putting is too hot to measure them all
+SAMPLE_EVERY = 16
+
+# never counted as shared, even when they are
+_SCALARS = {int, float, bool, str, bytes, type(None)}
+
+
+class CacheInfo(NamedTuple):
+    """
+    Same fields as functools' cache_info(), so instrumentation can report both kinds alike."""
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class Cache:
+    def __init__(self, name: str, max_bytes: Optional[int] = None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._puts = 0
+        self._sampled_entries = 0
+        self._sampled_bytes = 0
+        # containers that turned up in more than one sample, counted once rather than as part of every entry
+        self._shared_bytes = 0
+        # id of every container a sample counted -> the container, kept alive so that its id isn't reused, and its
+        # size, or None once it has moved to the shared bytes
+        self._seen: Dict[int, Tuple[Any, Optional[int]]] = {}
+        # keys of the sampled entries, the only ones whose eviction can let go of something in _seen
+        self._sampled_keys: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def bytes(self) -> float:
+        if self._sampled_entries == 0:
+            return 0.0
+
+        return len(self._entries) * self._sampled_bytes / self._sampled_entries + self._shared_bytes
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+        entries[key] = value
+
+        self._puts += 1
+        if self._puts % SAMPLE_EVERY == 1:
+            self._sample(key, value)
+
+    def clear(self):
+        """
+        Drops every entry. Hit and miss counts are kept."""
+        self._entries.clear()
+        self._puts, self._sampled_entries, self._sampled_bytes, self._shared_bytes = 0, 0, 0, 0
+        self._seen.clear()
+        self._sampled_keys.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), int(self.bytes))
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, None, len(self._entries))
+
+    def _evict(self):
+        key, value = self._entries.popitem(last=False)
+        self.evictions += 1
+        if key not in self._sampled_keys:
+            return
+
+        # let go of the sampled containers that went with the entry, unless other entries share them
+        self._sampled_keys.discard(key)
+        for obj in (key + (value,) if type(key) is tuple else (key, value)):
+            seen = self._seen.get(id(obj))
+            if seen is not None and seen[0] is obj and seen[1] is not None:
+                del self._seen[id(obj)]
+
+    def _sample(self, key: Hashable, value: Any):
+        size = sys.getsizeof(key) if type(key) is tuple else 0
+        for obj in (key + (value,) if type(key) is tuple else (key, value)):
+            if type(obj) in _SCALARS:
+                size += sys.getsizeof(obj)
+                continue
+
+            seen = self._seen.get(id(obj))
+            if seen is None:
+                obj_size = estimate_size(obj)
+                self._seen[id(obj)] = (obj, obj_size)
+                size += obj_size
+            elif seen[1] is not None:
+                self._sampled_bytes -= seen[1]
+                self._shared_bytes += seen[1]
+                self._seen[id(obj)] = (obj, None)
+
+        self._sampled_entries += 1
+        self._sampled_bytes += size
+        self._sampled_keys.add(key)
+
+        # the limits are only checked along with sampling, going over by a few entries is fine
+        if self.max_bytes is not None:
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                self._evict()
+        _enforce_total()
+
+
+class FunctoolsCache:
+    """
+    A functools.cache in the registry, with the Cache methods the registry's users need. Hit and miss counts survive
+    clearing, like a Cache's do."""
+    max_bytes = None
+    evictions = 0
+    bytes = 0.0
+
+    def __init__(self, name: str, cached: Callable):
+        self.name = name
+        self._info = cached.cache_info
+        self._clear = cached.cache_clear
+        self._cleared_hits = 0
+        self._cleared_misses = 0
+
+    def __len__(self) -> int:
+        return self._info().currsize
+
+    @property
+    def hits(self) -> int:
+        return self._cleared_hits + self._info().hits
+
+    @property
+    def misses(self) -> int:
+        return self._cleared_misses + self._info().misses
+
+    def clear(self):
+        info = self._info()
+        self._cleared_hits += info.hits
+        self._cleared_misses += info.misses
+        self._clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, 0, len(self), 0)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, None, len(self))
+
+    def _evict(self):
+        self.clear()
+
+
+_CACHES: Dict[str, Union[Cache, FunctoolsCache]] = {}
+_max_total_bytes: int = parse_size(os.environ.get("AOC_CACHE_MAX_BYTES", "1G"))
+
+
+def get_cache(name: str, max_bytes: Optional[int] = None) -> Cache:
+    """
+    Returns the cache of the given name, creating it on first use, or in place of an unbounded_memoize of that name."""
+    if not isinstance(_CACHES.get(name), Cache):
+        _CACHES[name] = Cache(name, max_bytes)
+
+    return _CACHES[name]
+
+
+def memoize(function: Optional[Callable[..., T]] = None, *, name: Optional[str] = None,
+            max_bytes: Optional[int] = None) -> Callable[..., T]:
+    """
+    Caches the results of a function by its arguments in a named cache, like functools.cache but bounded. Usable with
+    or without arguments: @memoize or @memoize(max_bytes=...). The wrapper has cache_info() and cache_clear()."""
+    if function is None:
+        return functools.partial(memoize, name=name, max_bytes=max_bytes)
+
+    cache = get_cache(name or f"{function.__module__}.{function.__qualname__}", max_bytes)
+    entries = cache._entries
+
+    get, move_to_end = entries.get, entries.move_to_end
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        key = args if not kwargs else args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+        # Cache.get and Cache.put, inlined for the recursive memos that call this millions of times
+        value = get(key, _MISSING)
+        if value is not _MISSING:
+            cache.hits += 1
+            move_to_end(key)
+            return value
+
+        value = function(*args, **kwargs)
+        # a call can't have put its own key while it ran, short of recursing forever, and every miss is a put
+        entries[key] = value
+        cache.misses += 1
+        if cache.misses % SAMPLE_EVERY == 1:
+            cache._sample(key, value)
+        return value
+
+    wrapper.cache = cache
+    wrapper.cache_info = cache.cache_info
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+def unbounded_memoize(function: Optional[Callable[..., T]] = None, *, name: Optional[str] = None) -> Callable[..., T]:
+    """
+    functools.cache, registered under a name. Usable with or without arguments. The wrapper's cache_info() and
+    cache_clear() are those of the registered cache."""
+    if function is None:
+        return functools.partial(unbounded_memoize, name=name)
+
+    name = name or f"{function.__module__}.{function.__qualname__}"
+    cached = functools.cache(function)
+    cache = FunctoolsCache(name, cached)
+    _CACHES[name] = cache
+
+    cached.cache = cache
+    cached.cache_info = cache.cache_info
+    cached.cache_clear = cache.clear
+    return cached
+
+
+def set_max_total_bytes(max_bytes: int):
+    """
+    Caps the bytes held by all caches together, evicting right away if they're over."""
+    global _max_total_bytes
+    _max_total_bytes = max_bytes
+    _enforce_total()
+
+
+def clear_all():
+    for cache in _CACHES.values():
+        cache.clear()
+
+
+@contextlib.contextmanager
+def scope() -> Iterator[None]:
+    """
+    Clears every cache before and after the body, so nothing memoized for one input leaks into the next."""
+    clear_all()
+    try:
+        yield
+    finally:
+        clear_all()
+
+
+def registry() -> Dict[str, Union[Cache, FunctoolsCache]]:
+    return dict(_CACHES)
+
+
+def stats() -> Dict[str, CacheStats]:
+    return {name: cache.stats() for name, cache in _CACHES.items()}
+
+
+def format_stats(cache_stats: Dict[str, CacheStats]) -> str:
+    lines = []
+    for name, stat in sorted(cache_stats.items(), key=lambda item: item[1].bytes, reverse=True):
+        lines.append(
+            f"  {format_size(stat.bytes):>8}  {stat.entries:>10} entries  {stat.hits:>12} hits  {stat.misses:>10} "
+            f"misses  {stat.evictions:>8} evictions  {name}")
+
+    return "\n".join(lines)
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Returns the size of the object and of its direct elements, but not theirs."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in obj.items())
+
+    return size
+
+
+def total_bytes() -> float:
+    return sum(cache.bytes for cache in _CACHES.values())
+
+
+def _enforce_total():
+    total = total_bytes()
+    while total > _max_total_bytes:
+        largest = max(_CACHES.values(), key=lambda cache: cache.bytes)
+        if len(largest) == 0:
+            break
+        # evicting by the slice rather than one at a time, since every round has to find the largest cache again
+        size = largest.bytes
+        for _ in range(max(len(largest) // 16, 1)):
+            largest._evict()
+        total -= size - largest.bytes
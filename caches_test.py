@@ -0,0 +1,95 @@
+import unittest
+
+import caches
+from caches import SAMPLE_EVERY, Cache, memoize, scope, unbounded_memoize
+
+
+class TestCaches(unittest.TestCase):
+    def tearDown(self):
+        caches.set_max_total_bytes(2 ** 30)
+        caches.clear_all()
+
+    def test_memoize(self):
+        calls = []
+
+        @memoize(name="test.square")
+        def square(x: int, offset: int = 0) -> int:
+            calls.append(x)
+            return x * x + offset
+
+        self.assertEqual([square(2), square(2), square(3), square(2, offset=1)], [4, 4, 9, 5])
+        self.assertEqual(calls, [2, 3, 2])
+        self.assertEqual(square.cache_info().hits, 1)
+
+        # clearing drops the entries but keeps counting
+        square.cache_clear()
+        square(2)
+        self.assertEqual(calls, [2, 3, 2, 2])
+        self.assertEqual(square.cache_info().misses, 4)
+
+    def test_unbounded_memoize(self):
+        calls = []
+
+        @unbounded_memoize(name="test.unbounded_fibonacci")
+        def fibonacci(n: int) -> int:
+            calls.append(n)
+            return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+        self.assertEqual(fibonacci(30), 832040)
+        self.assertEqual(len(calls), 31)
+        self.assertEqual(caches.stats()["test.unbounded_fibonacci"].entries, 31)
+
+        # cleared with the named caches, and counting across clears
+        with scope():
+            pass
+        self.assertEqual(len(caches.registry()["test.unbounded_fibonacci"]), 0)
+        fibonacci(1)
+        self.assertEqual(fibonacci.cache_info().misses, 32)
+        self.assertEqual(fibonacci.cache_info().hits, 28)
+
+    def test_evicted_samples_are_not_taken_for_shared(self):
+        # fresh lists, whose ids would be reused once they're gone
+        cache = Cache("test.reused_ids", max_bytes=1)
+        for idx in range(SAMPLE_EVERY * 50):
+            cache.put(idx, [idx] * 10)
+
+        self.assertEqual(cache._shared_bytes, 0)
+        self.assertLessEqual(len(cache._seen), 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = Cache("test.lru", max_bytes=10_000)
+        for idx in range(SAMPLE_EVERY * 20):
+            cache.put(idx, "x" * 100)
+            cache.get(0)
+
+        self.assertLessEqual(cache.bytes, 10_000 + SAMPLE_EVERY * 200)
+        self.assertGreater(cache.evictions, 0)
+        self.assertIn(0, cache)
+        self.assertNotIn(1, cache)
+
+    def test_shared_values_count_once(self):
+        fill = frozenset((x, y) for x in range(100) for y in range(100))
+        cache = Cache("test.shared")
+        for point in fill:
+            cache.put(point, fill)
+
+        self.assertLess(cache.bytes, 2 * caches.estimate_size(fill) + len(fill) * 200)
+
+    def test_global_cap(self):
+        big, small = caches.get_cache("test.big"), caches.get_cache("test.small")
+        for idx in range(SAMPLE_EVERY * 20):
+            small.put(idx, idx)
+        for idx in range(SAMPLE_EVERY * 20):
+            big.put(idx, "x" * 1000)
+
+        caches.set_max_total_bytes(int(small.bytes + big.bytes / 2))
+        self.assertEqual(small.evictions, 0)
+        self.assertGreater(big.evictions, 0)
+
+    def test_scope(self):
+        cache = caches.get_cache("test.scoped")
+        with scope():
+            cache.put("key", "value")
+            self.assertEqual(cache.get("key"), "value")
+
+        self.assertEqual(len(cache), 0)
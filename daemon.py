@@ -0,0 +1,249 @@
+"""
+Long-lived solver process that keeps the day modules imported and their inputs parsed, for quick re-runs.
+
+    python -m aoc daemon &
+    python -m aoc solve --days 17 --parts 1,2
+
+The daemon listens on a Unix socket (./aoc-daemon.sock by default) for one JSON request per line, and answers each
+with one JSON line:
+
+    {"command": "solve", "year": 2023, "jobs": [[17, 1], [17, 2]]}
+    {"results": [{"day": 17, "part": 1, "answer": ..., "wall_seconds": ..., ...}], "reloaded": ["day17", "graphs"]}
+
+    {"command": "stop"}
+
+Before every solve request it reloads the modules whose source changed since it imported them, along with every
+loaded module that imports them, dependencies first. Parsed inputs are kept per day until the input or the day's code
+changes. Part functions get a deep copy of them, since some change what they're given (day 20's modules keep their
+flip-flop state), and parsers that stream their input are just called again. Every solve runs in a caches.scope(),
+so nothing memoized for one run is reused by the next.
+
+Requests are handled one at a time: the solutions keep state in module globals. So that one slow job doesn't hold up
+the daemon for good, `job_timeout` interrupts the jobs that run longer, when the daemon serves from the main thread."""
+import contextlib
+import copy
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from collections.abc import Iterator
+from typing import Any, Dict, List, Optional, Tuple
+
+import aoc_api
+import caches
+import progress
+from dependencies import dependency_graph, dependents, file_hash, reload_modules
+from runner import Job, JobResult
+
+DEFAULT_SOCKET = "./aoc-daemon.sock"
+
+
+class SolverDaemon(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, job_timeout: Optional[float] = None):
+        if os.path.exists(socket_path):
+            if _is_listening(socket_path):
+                raise Exception(f"A daemon is already listening on {socket_path}")
+            # left behind by a daemon that didn't exit cleanly
+            os.unlink(socket_path)
+
+        super().__init__(socket_path, _Handler)
+        self.socket_path = socket_path
+        self.job_timeout = job_timeout
+        self.stopping = False
+
+        # every local module the loaded days depend on -> hash of its source when it was (re)loaded, None if that failed
+        self._hashes: Dict[str, Optional[str]] = {}
+        # modules that failed to reload -> their error
+        self._broken: Dict[str, str] = {}
+        # (year, day) -> (input digest, parsed input, whether it can be reused)
+        self._parsed: Dict[Tuple[int, int], Tuple[str, Any, bool]] = {}
+
+    def serve(self):
+        """
+        Serves until a stop request, then removes the socket."""
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            self.server_close()
+            os.unlink(self.socket_path)
+
+    def solve(self, jobs: List[Job], year: int = 2023) -> Tuple[List[JobResult], List[str]]:
+        """
+        Solves the jobs in order. Returns their results, and the modules reloaded first."""
+        try:
+            reloaded = self.reload_changed()
+        except Exception as e:
+            error = traceback.format_exception_only(e)[-1].strip()
+            return [JobResult(job, error=error) for job in jobs], []
+
+        return [self._solve(job, year) for job in jobs], reloaded
+
+    def reload_changed(self) -> List[str]:
+        changed = [name for name, digest in self._hashes.items() if file_hash(name) != digest]
+        if not changed:
+            return []
+
+        graph = {name: imports & self._hashes.keys() for name, imports in dependency_graph(self._hashes).items()}
+        affected = dependents(graph, changed)
+        for name in affected:
+            self._hashes[name] = file_hash(name)
+            self._broken.pop(name, None)
+        # the old version of a module that failed to reload stays, and its next edit is picked up
+        for name, error in reload_modules(graph, affected).items():
+            self._hashes[name] = None
+            self._broken[name] = error
+
+        for key in [key for key in self._parsed if f"day{key[1]}" in affected]:
+            del self._parsed[key]
+
+        return sorted(affected)
+
+    def _solve(self, job: Job, year: int) -> JobResult:
+        try:
+            progress.set_label(f"day {job.day} part {job.part}")
+            module = self._module(job.day)
+            part_function = getattr(module, f"part{job.part}", None)
+            if part_function is None:
+                return JobResult(job, error=f"no part {job.part}")
+
+            parsed = self._parsed_input(module, job.day, year)
+            with caches.scope(), self._deadline():
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                answer = part_function(parsed)
+                wall_seconds, cpu_seconds = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+            return JobResult(job, answer, wall_seconds, cpu_seconds)
+        except _JobTimeout:
+            return JobResult(job, wall_seconds=self.job_timeout, error="timed out")
+        except Exception as e:
+            return JobResult(job, error=traceback.format_exception_only(e)[-1].strip())
+
+    @contextlib.contextmanager
+    def _deadline(self):
+        # signals only reach the main thread
+        if self.job_timeout is None or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+
+        def interrupt(signum, frame):
+            raise _JobTimeout()
+
+        previous = signal.signal(signal.SIGALRM, interrupt)
+        signal.setitimer(signal.ITIMER_REAL, self.job_timeout)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    def _module(self, day: int):
+        name = f"day{day}"
+        module = importlib.import_module(name)
+        for dependency in dependency_graph([name]):
+            if dependency not in self._hashes:
+                self._hashes[dependency] = file_hash(dependency)
+            # rather than answering with the old code
+            if dependency in self._broken:
+                raise Exception(f"{dependency} failed to reload: {self._broken[dependency]}")
+
+        return module
+
+    def _parsed_input(self, module, day: int, year: int) -> Any:
+        digest = aoc_api.input_digest(day, year)
+        known = self._parsed.get((year, day))
+        if known is not None and known[0] == digest:
+            _, parsed, reusable = known
+            return copy.deepcopy(parsed) if reusable else module.parse(aoc_api.get_raw_input(day, year))
+
+        # a changed input replaces the file, which the mapped store wouldn't see
+        aoc_api.drop_input(day, year)
+        parsed = module.parse(aoc_api.get_raw_input(day, year))
+        reusable = not isinstance(parsed, Iterator)
+        self._parsed[(year, day)] = (digest, parsed, reusable)
+        return copy.deepcopy(parsed) if reusable else parsed
+
+
+class _JobTimeout(BaseException):
+    # not an Exception, so that the solutions' own handlers don't catch it
+    pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        if request["command"] == "stop":
+            self.server.stopping = True
+            self._reply({"stopped": True})
+            return
+
+        try:
+            jobs = [Job(day, part) for day, part in request["jobs"]]
+            results, reloaded = self.server.solve(jobs, request.get("year", 2023))
+        except Exception as e:
+            # a reply either way, so the client doesn't wait for one that never comes
+            self._reply({"error": traceback.format_exception_only(e)[-1].strip()})
+            return
+
+        self._reply({"results": [_result_to_json(result) for result in results], "reloaded": reloaded})
+
+    def _reply(self, response: Dict[str, Any]):
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def request(jobs: List[Job], year: int = 2023, socket_path: str = DEFAULT_SOCKET) -> Tuple[List[JobResult], List[str]]:
+    """
+    Asks the daemon to solve the jobs. Returns their results, and the modules it reloaded first."""
+    response = _send({"command": "solve", "year": year, "jobs": [[job.day, job.part] for job in jobs]}, socket_path)
+    if "error" in response:
+        raise Exception(f"The daemon failed: {response['error']}")
+
+    return [_result_from_json(result) for result in response["results"]], response["reloaded"]
+
+
+def stop(socket_path: str = DEFAULT_SOCKET):
+    _send({"command": "stop"}, socket_path)
+
+
+def _send(message: Dict[str, Any], socket_path: str) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(message).encode() + b"\n")
+        with client.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+            return True
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+
+
+def _result_to_json(result: JobResult) -> Dict[str, Any]:
+    # answers are mostly ints, anything else goes as its string
+    answer = result.answer if result.answer is None or isinstance(result.answer, (int, str)) else str(result.answer)
+    return {
+        "day": result.job.day,
+        "part": result.job.part,
+        "answer": answer,
+        "wall_seconds": result.wall_seconds,
+        "cpu_seconds": result.cpu_seconds,
+        "error": result.error,
+    }
+
+
+def _result_from_json(value: Dict[str, Any]) -> JobResult:
+    return JobResult(
+        Job(value["day"], value["part"]),
+        value["answer"],
+        wall_seconds=value["wall_seconds"],
+        cpu_seconds=value["cpu_seconds"],
+        error=value["error"])
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import day1
+from daemon import SolverDaemon, request, stop
+from generators import generate
+from runner import Job
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+        self.input = generate(1, 20, seed=1)
+        with open("cache-2023-1.txt", "w") as f:
+            f.write(self.input)
+
+        self.socket = os.path.join(self.directory.name, "daemon.sock")
+        self.daemon = SolverDaemon(self.socket)
+        self.thread = threading.Thread(target=self.daemon.serve)
+        self.thread.start()
+
+    def tearDown(self):
+        stop(self.socket)
+        self.thread.join()
+        os.chdir(self.old_cwd)
+        self.directory.cleanup()
+
+    def test_solve(self):
+        results, reloaded = request([Job(1, 1), Job(1, 2), Job(1, 3)], socket_path=self.socket)
+
+        self.assertEqual(reloaded, [])
+        self.assertEqual(results[0].answer, day1.solve(1, self.input))
+        self.assertEqual(results[1].answer, day1.solve(2, self.input))
+        self.assertEqual(results[2].error, "no part 3")
+
+    def test_changed_input(self):
+        request([Job(1, 1)], socket_path=self.socket)
+        changed = generate(1, 20, seed=2)
+        with open("cache-2023-1.txt", "w") as f:
+            f.write(changed)
+
+        results, _ = request([Job(1, 1)], socket_path=self.socket)
+        self.assertEqual(results[0].answer, day1.solve(1, changed))
+
+    def test_reloads_changed_modules(self):
+        request([Job(1, 1)], socket_path=self.socket)
+        # as if day1.py had been edited since
+        self.daemon._hashes["day1"] = "stale"
+
+        results, reloaded = request([Job(1, 1)], socket_path=self.socket)
+        self.assertEqual(reloaded, ["day1"])
+        self.assertEqual(results[0].answer, day1.solve(1, self.input))
+        self.assertEqual(request([Job(1, 1)], socket_path=self.socket)[1], [])
+
+    def test_failed_reload_gives_error_results(self):
+        def fail():
+            raise OSError("disk gone")
+        self.daemon.reload_changed = fail
+
+        results, reloaded = request([Job(1, 1), Job(1, 2)], socket_path=self.socket)
+        self.assertEqual([result.error for result in results], ["OSError: disk gone"] * 2)
+        self.assertEqual(reloaded, [])
+
+    def test_refuses_a_second_daemon(self):
+        with self.assertRaises(Exception):
+            SolverDaemon(self.socket)
+
+
+if __name__ == '__main__':
+    unittest.main()
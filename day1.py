@@ -1,9 +1,14 @@
-from aoc_api import get_input
+from typing import List
+
+from aoc_api import PuzzleInput, as_lines, get_input
+
+
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
 
-lines = get_input(1)
 
 # part 1
-def part1():
+def part1(lines: List[str]) -> int:
     sum = 0
     for line in lines:
         for char in line:
@@ -16,14 +21,13 @@ def part1():
                 right = char
                 break
 
-        print(left, right)
         val = int(f"{left}{right}")
         sum += val
 
-    print(sum)
+    return sum
 
 #part 2
-def part2():
+def part2(lines: List[str]) -> int:
     sum = 0
     values = {
         "0": 0,
@@ -56,7 +60,12 @@ def part2():
         value = int(f'{values[left[0]]}{values[right[0]]}')
         sum += value
 
-        print(line, left[0], right[0], value)
-    print(sum)
+    return sum
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
+
 
-part2()
\ No newline at end of file
+if __name__ == '__main__':
+    print(solve(2, get_input(1)))
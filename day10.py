@@ -1,13 +1,15 @@
-from typing import List, Set, Tuple, Dict
+from typing import List, Set, Tuple
 
-from aoc_api import get_input, submit
-from functools import lru_cache
+from aoc_api import PuzzleInput, as_lines, get_input
+from caches import get_cache
+from grids import Grid, grid_memoize
+from instrumentation import instrumented
 from intervals import Interval
 from kernels import four_kernel
 
 
-@lru_cache(maxsize=150*150)
-def find_starting_point(input: Tuple[str]) -> Tuple[int, int]:
+@grid_memoize
+def find_starting_point(input: Grid) -> Tuple[int, int]:
     for y, line in enumerate(input):
         for x, char in enumerate(line):
             if char == 'S':
@@ -27,8 +29,8 @@ CONNECTIONS_MAP = {
 }
 
 
-@lru_cache(maxsize=150*150)
-def find_start_mapping(input: Tuple[str]) -> str:
+@grid_memoize
+def find_start_mapping(input: Grid) -> str:
     """
     Returns the corrected pipe value for the starting point of the maze."""
     starting_point = find_starting_point(input)
@@ -66,7 +68,7 @@ def find_start_mapping(input: Tuple[str]) -> str:
     return candidates[0]
 
 
-def expand_input(input: Tuple[str]) -> Tuple[str]:
+def expand_input(input: Grid) -> Grid:
     """
     Expands the maze adding dots and lengthening pipes horizontally and vertically."""
 
@@ -111,22 +113,25 @@ def expand_input(input: Tuple[str]) -> Tuple[str]:
         expanded += expanded_vertically[row][-1]
         result.append(expanded)
 
-    return tuple(result)
+    return Grid(result)
 
 
-REVERSE_FLOOD_FILL_MAP: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+# every point of a fill or pipe path -> the whole of it, so each is only searched once
+REVERSE_FLOOD_FILL_MAP = get_cache("day10.reverse_flood_fill")
 
 
-@lru_cache(maxsize=150*150)
-def flood_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> Set[Tuple[int, int]]:
+@instrumented
+@grid_memoize
+def flood_fill(input: Grid, starting_point: Tuple[int, int]) -> Set[Tuple[int, int]]:
     """
     Returns the set of flood-filled points given a starting empty point."""
     assert input[starting_point[1]][starting_point[0]] == '.'
 
     result: Set[Tuple[int, int]] = {starting_point}
 
-    if starting_point in REVERSE_FLOOD_FILL_MAP:
-        return REVERSE_FLOOD_FILL_MAP[starting_point]
+    known = REVERSE_FLOOD_FILL_MAP.get(starting_point)
+    if known is not None:
+        return known
 
     queue = [starting_point]
     while len(queue) > 0:
@@ -141,11 +146,11 @@ def flood_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> Set[Tuple[
             queue.append(neighbor)
 
     for point in result:
-        REVERSE_FLOOD_FILL_MAP[point] = result
+        REVERSE_FLOOD_FILL_MAP.put(point, result)
     return result
 
 
-def pipe_kernel(input: Tuple[str], pipe_coords: Tuple[int, int]) -> List[Tuple[int, int]]:
+def pipe_kernel(input: Grid, pipe_coords: Tuple[int, int]) -> List[Tuple[int, int]]:
     """
     Returns the neighboring kernel of a given pipe type."""
     pipe = input[pipe_coords[1]][pipe_coords[0]]
@@ -166,18 +171,20 @@ def pipe_kernel(input: Tuple[str], pipe_coords: Tuple[int, int]) -> List[Tuple[i
     return [(offset[0] + pipe_coords[0], offset[1] + pipe_coords[1]) for offset in offsets[pipe]]
 
 
-REVERSE_PIPE_FILL_MAP: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+REVERSE_PIPE_FILL_MAP = get_cache("day10.reverse_pipe_fill")
 
-@lru_cache(maxsize=150*150)
-def pipe_path(input: Tuple[str], starting_point: Tuple[int, int]) -> Set[Tuple[int, int]]:
+@instrumented
+@grid_memoize
+def pipe_path(input: Grid, starting_point: Tuple[int, int]) -> Set[Tuple[int, int]]:
     """
     Returns the set of points forming a pipeline or loop given a starting pipe point."""
     assert input[starting_point[1]][starting_point[0]] != '.'
 
     result: Set[Tuple[int, int]] = {starting_point}
 
-    if starting_point in REVERSE_PIPE_FILL_MAP:
-        return REVERSE_PIPE_FILL_MAP[starting_point]
+    known = REVERSE_PIPE_FILL_MAP.get(starting_point)
+    if known is not None:
+        return known
 
     queue = [starting_point]
     while len(queue) > 0:
@@ -200,23 +207,25 @@ def pipe_path(input: Tuple[str], starting_point: Tuple[int, int]) -> Set[Tuple[i
                 queue.append(neighbor)
 
     for point in result:
-        REVERSE_PIPE_FILL_MAP[point] = result
+        REVERSE_PIPE_FILL_MAP.put(point, result)
     return result
 
 
-REVERSE_VALID_FILL_MAP: Dict[Tuple[int, int], bool] = {}
+REVERSE_VALID_FILL_MAP = get_cache("day10.reverse_valid_fill")
 
 
-@lru_cache(maxsize=150*150)
-def is_valid_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> bool:
+@instrumented
+@grid_memoize
+def is_valid_fill(input: Grid, starting_point: Tuple[int, int]) -> bool:
     """
     Returns true iff the flood fill starting in the given starting point is valid.
 
     A valid flood fill is adjacent to the pipe path that contains the starting point, and does not touch the outside."""
     assert input[starting_point[1]][starting_point[0]] == '.'
 
-    if starting_point in REVERSE_VALID_FILL_MAP:
-        return REVERSE_VALID_FILL_MAP[starting_point]
+    known = REVERSE_VALID_FILL_MAP.get(starting_point)
+    if known is not None:
+        return known
 
     fill = flood_fill(input, starting_point)
 
@@ -224,7 +233,7 @@ def is_valid_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> bool:
         # touches the outside
         if point[0] == 0 or point[0] == len(input[0]) - 1 or point[1] == 0 or point[1] == len(input) - 1:
             for f in fill:
-                REVERSE_VALID_FILL_MAP[f] = False
+                REVERSE_VALID_FILL_MAP.put(f, False)
             return False
 
     for point in fill:
@@ -238,16 +247,24 @@ def is_valid_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> bool:
             path = pipe_path(input, neighbor)
             if 'S' in [input[p[1]][p[0]] for p in path]:
                 for f in fill:
-                    REVERSE_VALID_FILL_MAP[f] = True
+                    REVERSE_VALID_FILL_MAP.put(f, True)
                 return True
 
     for f in fill:
-        REVERSE_VALID_FILL_MAP[f] = False
+        REVERSE_VALID_FILL_MAP.put(f, False)
     return False
 
 
-def part2():
-    input = tuple(get_input(10))
+def parse(input: PuzzleInput) -> Grid:
+    return Grid(as_lines(input))
+
+
+def part2(input: Grid) -> int:
+    # the reverse maps are keyed by point only, so they must not outlive a single input
+    REVERSE_FLOOD_FILL_MAP.clear()
+    REVERSE_PIPE_FILL_MAP.clear()
+    REVERSE_VALID_FILL_MAP.clear()
+
     starting_point = find_starting_point(input)
 
     path = pipe_path(input, starting_point)
@@ -262,7 +279,7 @@ def part2():
                 result += '.'
         cleaned.append(result)
 
-    cleaned = tuple(cleaned)
+    cleaned = Grid(cleaned)
     input = expand_input(cleaned)
 
     result = None
@@ -282,6 +299,12 @@ def part2():
                 fill = flood_fill(input, (x, y))
                 result = len(list(f for f in fill if f[0] % 2 == 0 and f[1] % 2 == 0))
 
-    print(result)
+    return result
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {2: part2}[part](parse(input))
+
 
-part2()
\ No newline at end of file
+if __name__ == '__main__':
+    print(solve(2, get_input(10)))
\ No newline at end of file
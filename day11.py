@@ -1,6 +1,6 @@
 from typing import List, Tuple
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 
 
 def expand_input(input: List[str]) -> List[str]:
@@ -55,8 +55,7 @@ def find_all_galaxies(input: List[str]) -> List[Tuple[int, int]]:
     return result
 
 
-def part1():
-    input = get_input(11)
+def part1(input: List[str]) -> int:
     input = expand_input(input)
 
     galaxies = find_all_galaxies(input)
@@ -69,14 +68,13 @@ def part1():
             answer += abs(left[0] - right[0]) + abs(left[1] - right[1])
 
     answer //= 2
-    submit(day=11, level=1, answer=answer)
+    return answer
 
 
 EXPANSION = 1_000_000
 
 
-def part2():
-    input = get_input(11)
+def part2(input: List[str]) -> int:
     input = expand_input_2(input)
 
     galaxies = find_all_galaxies(input)
@@ -108,7 +106,16 @@ def part2():
             answer += distance
 
     answer //= 2
-    submit(day=11, level=2, answer=answer, really=True)
+    return answer
 
 
-part2()
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
+
+
+if __name__ == '__main__':
+    submit(day=11, level=2, answer=solve(2, get_input(11)), really=True)
@@ -1,7 +1,8 @@
-from functools import cache
-from typing import Tuple
+from typing import Iterable, Tuple
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, iter_input, iter_lines, submit
+from disk_cache import disk_memoize
+from progress import track
 
 
 def get_combinations(row: str) -> int:
@@ -11,7 +12,7 @@ def get_combinations(row: str) -> int:
     return count_arrangements(left + '.', damaged_counts, 0)
 
 
-@cache
+@disk_memoize
 def count_arrangements(springs: str, groups: Tuple[int], current_group_size: int) -> int:
     if springs == '':
         return int(len(groups) == 0 and current_group_size == 0)
@@ -45,25 +46,29 @@ def expand_line(line: str, amount: int) -> str:
     return f'{left} {right}'
 
 
-def part1():
-    input = get_input(12)
+def parse(input: PuzzleInput) -> Iterable[str]:
+    return iter_lines(input)
 
+
+def part1(input: Iterable[str]) -> int:
     answer = 0
     for line in input:
         answer += get_combinations(line)
 
-    submit(day=12, level=1, answer=answer)
-
+    return answer
 
-def part2():
-    input = get_input(12)
 
+def part2(input: Iterable[str]) -> int:
     answer = 0
-    for line in input:
+    for line in track(input, "unfolded lines"):
         answer += get_combinations(expand_line(line, 5))
 
-    submit(day=12, level=2, answer=answer)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
 if __name__ == '__main__':
-    part2()
+    submit(day=12, level=2, answer=solve(2, iter_input(12)))
@@ -1,7 +1,7 @@
 from typing import List, Tuple
 
 from arrays import transpose_strings
-from aoc_api import get_input_chunks, submit
+from aoc_api import PuzzleInput, as_chunks, get_input, submit
 
 
 def fold_left(input_chunk: List[str], slice: int) -> List[str]:
@@ -77,19 +77,19 @@ def get_top_mirrors(input_chunk: List[str]) -> int:
     return get_left_mirrors(transposed)
 
 
-def part1():
-    input = get_input_chunks(13)
+def parse(input: PuzzleInput) -> List[List[str]]:
+    return as_chunks(input)
 
+
+def part1(input: List[List[str]]) -> int:
     answer = 0
     for chunk in input:
         answer += get_left_mirrors(chunk) + 100 * get_top_mirrors(chunk)
 
-    submit(day=13, level=1, answer=answer)
-
+    return answer
 
-def part2():
-    input = get_input_chunks(13)
 
+def part2(input: List[List[str]]) -> int:
     answer = 0
     for chunk in input:
         old_top_slices = get_top_mirrors(chunk)
@@ -111,7 +111,12 @@ def part2():
 
         answer += new_score
 
-    submit(day=13, level=2, answer=answer)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=13, level=2, answer=solve(2, get_input(13)))
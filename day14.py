@@ -2,7 +2,7 @@ import re
 from typing import Tuple
 
 from arrays import transpose_strings, reverse_strings
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 from state_machines import find_cycle_data
 
 
@@ -79,15 +79,16 @@ def count_simple_load(input: Tuple[str]) -> int:
     return answer
 
 
-def part1():
-    input = tuple(get_input(14))
-    answer = count_load(input)
-    submit(day=14, level=1, answer=answer)
+def parse(input: PuzzleInput) -> Tuple[str]:
+    return tuple(as_lines(input))
+
 
+def part1(input: Tuple[str]) -> int:
+    answer = count_load(input)
+    return answer
 
-def part2():
-    input = tuple(get_input(14))
 
+def part2(input: Tuple[str]) -> int:
     cycle_data = find_cycle_data(input, simulate_full_cycle)
 
     target_count = 1_000_000_000
@@ -99,7 +100,12 @@ def part2():
 
     answer = count_simple_load(input)
 
-    submit(day=14, level=2, answer=answer, really=True)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=14, level=2, answer=solve(2, get_input(14)), really=True)
@@ -1,6 +1,6 @@
 from typing import Dict, List
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 
 
 def my_hash(string: str) -> int:
@@ -12,9 +12,7 @@ def my_hash(string: str) -> int:
     return hash
 
 
-def part1():
-    input = get_input(15)
-
+def part1(input: List[str]) -> int:
     input = ''.join(input).replace('\n', '')
     individuals = input.split(',')
 
@@ -22,12 +20,10 @@ def part1():
     for string in individuals:
         answer += my_hash(string)
 
-    submit(day=15, level=1, answer=answer)
-
+    return answer
 
-def part2():
-    input = get_input(15)
 
+def part2(input: List[str]) -> int:
     input = ''.join(input).replace('\n', '')
     individuals = input.split(',')
     boxes: Dict[int, List[str]] = {}
@@ -62,7 +58,16 @@ def part2():
         for i, lens in enumerate(lenses):
             answer += (box + 1) * (i + 1) * int(lens.split(' ')[1])
 
-    submit(day=15, level=2, answer=answer)
+    return answer
+
+
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
\ No newline at end of file
+if __name__ == '__main__':
+    submit(day=15, level=2, answer=solve(2, get_input(15)))
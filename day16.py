@@ -1,7 +1,8 @@
 from typing import List, Tuple, Set
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 from intervals import Interval
+from progress import Meter
 
 
 DIRECTION_MAP = {
@@ -92,22 +93,19 @@ def count_illuminated(output: List[List[str]]) -> int:
     return answer
 
 
-def part1():
-    input = get_input(16)
-
+def part1(input: List[str]) -> int:
     output = [['.'] * len(input[0]) for _ in range(len(input))]
 
     process_beam((0, 0), 'right', input, output)
 
     answer = count_illuminated(output)
 
-    submit(day=16, level=1, answer=answer)
-
+    return answer
 
-def part2():
-    input = get_input(16)
 
+def part2(input: List[str]) -> int:
     answer = 0
+    meter = Meter("edge launches", total=2 * (len(input) + len(input[0])))
     for y in range(len(input)):
         output = [['.'] * len(input[0]) for _ in range(len(input))]
         process_beam((0, y), 'right', input, output)
@@ -116,6 +114,7 @@ def part2():
         output = [['.'] * len(input[0]) for _ in range(len(input))]
         process_beam((len(input[0]) - 1, y), 'left', input, output)
         answer = max(answer, count_illuminated(output))
+        meter.update(2)
 
     for x in range(len(input[0])):
         output = [['.'] * len(input[0]) for _ in range(len(input))]
@@ -125,8 +124,19 @@ def part2():
         output = [['.'] * len(input[0]) for _ in range(len(input))]
         process_beam((x, len(input) - 1), 'up', input, output)
         answer = max(answer, count_illuminated(output))
+        meter.update(2)
+
+    meter.close()
+    return answer
+
+
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
+
 
-    submit(day=16, level=2, answer=answer)
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
\ No newline at end of file
+if __name__ == '__main__':
+    submit(day=16, level=2, answer=solve(2, get_input(16)))
@@ -1,7 +1,7 @@
-from typing import Generator, List, Tuple
+from typing import Callable, Dict, Generator, List, Set, Tuple
 
-from aoc_api import get_input, submit
-from graphs import Edge, Graph, dijkstra
+from aoc_api import PuzzleInput, as_lines, get_input, submit
+from graphs import Edge, Graph, LazyGraph, a_star, dijkstra_costs
 from intervals import get_string_bounds
 
 
@@ -31,181 +31,166 @@ def get_coords_between(left: Tuple[int, int], right: Tuple[int, int]) -> Generat
         raise ValueError()
 
 
-def build_graph(input: List[str]) -> Graph:
+def neighbors(input: List[str], graph_node: str) -> Set[Edge]:
     x_bounds, y_bounds = get_string_bounds(input)
 
-    graph: Graph = {}
-
-    # Initial state: 0,0 / no direction / 3 moves remaining
-    queue: List[str] = ['0,0/-/3']
-    while len(queue) != 0:
-        graph_node = queue.pop()
-
-        if graph_node in graph:
-            continue
-
-        graph[graph_node] = set()
-
-        coords_str, direction, moves_remaining_str = graph_node.split('/')
-        coords = tuple(int(x) for x in coords_str.split(','))
-        moves_remaining = int(moves_remaining_str)
-
-        # same direction
-        if moves_remaining > 0:
-            offsets = OFFSET_MAP[direction]
-            for coord_offset, next_direction in offsets:
-                next_coords = coords[0] + coord_offset[0], coords[1] + coord_offset[1]
-                if not x_bounds.contains(next_coords[0]) or not y_bounds.contains(next_coords[1]):
-                    continue
-
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/{moves_remaining - 1}'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
-
-        # switch direction
-        if direction in ['>', '<']:
-            next_direction = 'v'
-            next_coords = coords[0], coords[1] + 1
-            if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/2'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
-
-            next_direction = '^'
-            next_coords = coords[0], coords[1] - 1
-            if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/2'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
-
-        elif direction in ['v', '^']:
-            next_direction = '>'
-            next_coords = coords[0] + 1, coords[1]
-            if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/2'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
-
-            next_direction = '<'
-            next_coords = coords[0] - 1, coords[1]
-            if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/2'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
-
-    return graph
-
-
-def build_graph2(input: List[str]) -> Graph:
+    edges: Set[Edge] = set()
+
+    coords_str, direction, moves_remaining_str = graph_node.split('/')
+    coords = tuple(int(x) for x in coords_str.split(','))
+    moves_remaining = int(moves_remaining_str)
+
+    # same direction
+    if moves_remaining > 0:
+        offsets = OFFSET_MAP[direction]
+        for coord_offset, next_direction in offsets:
+            next_coords = coords[0] + coord_offset[0], coords[1] + coord_offset[1]
+            if not x_bounds.contains(next_coords[0]) or not y_bounds.contains(next_coords[1]):
+                continue
+
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/{moves_remaining - 1}'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+    # switch direction
+    if direction in ['>', '<']:
+        next_direction = 'v'
+        next_coords = coords[0], coords[1] + 1
+        if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/2'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+        next_direction = '^'
+        next_coords = coords[0], coords[1] - 1
+        if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/2'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+    elif direction in ['v', '^']:
+        next_direction = '>'
+        next_coords = coords[0] + 1, coords[1]
+        if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/2'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+        next_direction = '<'
+        next_coords = coords[0] - 1, coords[1]
+        if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/2'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+    return edges
+
+
+def neighbors2(input: List[str], graph_node: str) -> Set[Edge]:
     x_bounds, y_bounds = get_string_bounds(input)
 
-    graph: Graph = {}
-
-    # Initial state: 0,0 / no direction / 0 moves made / 10 moves remaining
-    queue: List[str] = ['0,0/-/0/10']
-    while len(queue) != 0:
-        graph_node = queue.pop()
-
-        if graph_node in graph:
-            continue
-
-        graph[graph_node] = set()
-
-        coords_str, direction, moves_made_str, moves_remaining_str = graph_node.split('/')
-        coords = tuple(int(x) for x in coords_str.split(','))
-        moves_made = int(moves_made_str)
-        moves_remaining = int(moves_remaining_str)
-
-        # same direction
-        if moves_remaining > 0:
-            offsets = OFFSET_MAP[direction]
-            for coord_offset, next_direction in offsets:
-                next_coords = coords[0] + coord_offset[0], coords[1] + coord_offset[1]
-                if not x_bounds.contains(next_coords[0]) or not y_bounds.contains(next_coords[1]):
-                    continue
-
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/{moves_made + 1}/{moves_remaining - 1}'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
+    edges: Set[Edge] = set()
+
+    coords_str, direction, moves_made_str, moves_remaining_str = graph_node.split('/')
+    coords = tuple(int(x) for x in coords_str.split(','))
+    moves_made = int(moves_made_str)
+    moves_remaining = int(moves_remaining_str)
+
+    # same direction
+    if moves_remaining > 0:
+        offsets = OFFSET_MAP[direction]
+        for coord_offset, next_direction in offsets:
+            next_coords = coords[0] + coord_offset[0], coords[1] + coord_offset[1]
+            if not x_bounds.contains(next_coords[0]) or not y_bounds.contains(next_coords[1]):
+                continue
+
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/{moves_made + 1}/{moves_remaining - 1}'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+    # switch direction
+    if moves_made >= 4 and direction in ['>', '<']:
+        next_direction = 'v'
+        next_coords = coords[0], coords[1] + 1
+        if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/1/9'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+        next_direction = '^'
+        next_coords = coords[0], coords[1] - 1
+        if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/1/9'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+    elif moves_made >= 4 and direction in ['v', '^']:
+        next_direction = '>'
+        next_coords = coords[0] + 1, coords[1]
+        if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/1/9'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+        next_direction = '<'
+        next_coords = coords[0] - 1, coords[1]
+        if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
+            cost = int(input[next_coords[1]][next_coords[0]])
+            next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/1/9'
+            edges.add(Edge(next_node_id=next_node_id, cost=cost))
+
+    return edges
+
+
+def costs_to_corner(input: List[str]) -> Dict[str, int]:
+    """
+    Returns the cost from every cell to the bottom-right corner, ignoring the turning rules. No state at a cell gets
+    there any cheaper, which makes it a consistent heuristic for the searches."""
+    x_bounds, y_bounds = get_string_bounds(input)
 
-        # switch direction
-        if moves_made >= 4 and direction in ['>', '<']:
-            next_direction = 'v'
-            next_coords = coords[0], coords[1] + 1
-            if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/1/9'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
+    # edges go backwards, from each cell to the cells it can be entered from, at the cost of entering it
+    reversed_graph: Graph = {}
+    for y, line in enumerate(input):
+        for x, cost in enumerate(line):
+            reversed_graph[f'{x},{y}'] = {
+                Edge(next_node_id=f'{x + dx},{y + dy}', cost=int(cost))
+                for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)]
+                if x_bounds.contains(x + dx) and y_bounds.contains(y + dy)}
 
-            next_direction = '^'
-            next_coords = coords[0], coords[1] - 1
-            if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/1/9'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
+    return dijkstra_costs(f'{len(input[0]) - 1},{len(input) - 1}', reversed_graph)
 
-        elif moves_made >= 4 and direction in ['v', '^']:
-            next_direction = '>'
-            next_coords = coords[0] + 1, coords[1]
-            if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/1/9'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
 
-            next_direction = '<'
-            next_coords = coords[0] - 1, coords[1]
-            if x_bounds.contains(next_coords[0]) and y_bounds.contains(next_coords[1]):
-                cost = int(input[next_coords[1]][next_coords[0]])
-                next_node_id = f'{next_coords[0]},{next_coords[1]}/{next_direction}/1/9'
-                graph[graph_node].add(Edge(next_node_id=next_node_id, cost=cost))
-                queue.append(next_node_id)
+def cheapest_path_to_corner(
+        input: List[str], starting_point: str, neighbors: Callable[[List[str], str], Set[Edge]]) -> int:
+    goal = f'{len(input[0]) - 1},{len(input) - 1}'
+    estimates = costs_to_corner(input)
 
-    return graph
+    paths = a_star(
+        starting_point,
+        LazyGraph(lambda node_id: neighbors(input, node_id)),
+        is_goal=lambda node_id: node_id.split('/')[0] == goal,
+        heuristic=lambda node_id: estimates[node_id.split('/')[0]])
+    if paths is None:
+        raise Exception(f"No path from {starting_point} reaches the corner at {goal}")
 
+    return paths.costs[paths.goal]
 
-def part1():
-    input = get_input(17)
 
-    graph = build_graph(input)
+def part1(input: List[str]) -> int:
+    return cheapest_path_to_corner(input, '0,0/-/3', neighbors)
 
-    costs = dijkstra('0,0/-/3', graph)
 
-    answer = 10 * len(input) * len(input[0])
-    for node_id in costs:
-        cost, path = costs[node_id]
-        node_id_without_state = node_id.split("/")[0]
-        if node_id_without_state == f'{len(input[0]) - 1},{len(input)-1}':
-            if cost < answer:
-                answer = cost
+def part2(input: List[str]) -> int:
+    return cheapest_path_to_corner(input, '0,0/-/0/10', neighbors2)
 
-    submit(day=17, level=1, answer=answer)
 
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
 
-def part2():
-    input = get_input(17)
 
-    graph = build_graph2(input)
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
-    costs = dijkstra('0,0/-/0/10', graph)
 
-    answer = 10 * len(input) * len(input[0])
-    for node_id in costs:
-        cost, path = costs[node_id]
-        node_id_without_state = node_id.split("/")[0]
-        if node_id_without_state == f'{len(input[0]) - 1},{len(input)-1}':
-            if cost < answer:
-                answer = cost
-
-    submit(day=17, level=2, answer=answer)
-
-
-part2()
+if __name__ == '__main__':
+    submit(day=17, level=2, answer=solve(2, get_input(17)))
@@ -1,9 +1,10 @@
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import List, Tuple, Dict, Set, Collection
+from typing import List, Tuple, Set, Collection
 
 from arrays import print_strings
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
+from caches import get_cache
+from grids import Grid, grid_memoize
 from intervals import Interval
 from kernels import four_kernel
 
@@ -56,7 +57,7 @@ def get_dug_cubes(instructions: List[Instruction]) -> List[Tuple[int, int]]:
     return dug_cubes
 
 
-def get_trench_map(dug_cubes: Collection[Tuple[int, int]]) -> Tuple[str]:
+def get_trench_map(dug_cubes: Collection[Tuple[int, int]]) -> Grid:
     min_x = min(dug_cubes, key=lambda cube: cube[0])[0]
     max_x = max(dug_cubes, key=lambda cube: cube[0])[0]
 
@@ -73,22 +74,23 @@ def get_trench_map(dug_cubes: Collection[Tuple[int, int]]) -> Tuple[str]:
         y = dug_cube[1] - min_y
         result[y][x] = '#'
 
-    return tuple(''.join(line) for line in result)
+    return Grid(''.join(line) for line in result)
 
 
-REVERSE_FLOOD_FILL_MAP: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+REVERSE_FLOOD_FILL_MAP = get_cache("day18.reverse_flood_fill")
 
 
-@lru_cache(maxsize=150*150)
-def flood_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> Set[Tuple[int, int]]:
+@grid_memoize
+def flood_fill(input: Grid, starting_point: Tuple[int, int]) -> Set[Tuple[int, int]]:
     """
     Returns the set of flood-filled points given a starting empty point."""
     assert input[starting_point[1]][starting_point[0]] == '.'
 
     result: Set[Tuple[int, int]] = {starting_point}
 
-    if starting_point in REVERSE_FLOOD_FILL_MAP:
-        return REVERSE_FLOOD_FILL_MAP[starting_point]
+    known = REVERSE_FLOOD_FILL_MAP.get(starting_point)
+    if known is not None:
+        return known
 
     queue = [starting_point]
     while len(queue) > 0:
@@ -103,23 +105,24 @@ def flood_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> Set[Tuple[
             queue.append(neighbor)
 
     for point in result:
-        REVERSE_FLOOD_FILL_MAP[point] = result
+        REVERSE_FLOOD_FILL_MAP.put(point, result)
     return result
 
 
-REVERSE_VALID_FILL_MAP: Dict[Tuple[int, int], bool] = {}
+REVERSE_VALID_FILL_MAP = get_cache("day18.reverse_valid_fill")
 
 
-@lru_cache(maxsize=150*150)
-def is_valid_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> bool:
+@grid_memoize
+def is_valid_fill(input: Grid, starting_point: Tuple[int, int]) -> bool:
     """
     Returns true iff the flood fill starting in the given starting point is valid.
 
     A valid flood fill is adjacent to the pipe path that contains the starting point, and does not touch the outside."""
     assert input[starting_point[1]][starting_point[0]] == '.'
 
-    if starting_point in REVERSE_VALID_FILL_MAP:
-        return REVERSE_VALID_FILL_MAP[starting_point]
+    known = REVERSE_VALID_FILL_MAP.get(starting_point)
+    if known is not None:
+        return known
 
     fill = flood_fill(input, starting_point)
 
@@ -127,16 +130,22 @@ def is_valid_fill(input: Tuple[str], starting_point: Tuple[int, int]) -> bool:
         # touches the outside
         if point[0] == 0 or point[0] == len(input[0]) - 1 or point[1] == 0 or point[1] == len(input) - 1:
             for f in fill:
-                REVERSE_VALID_FILL_MAP[f] = False
+                REVERSE_VALID_FILL_MAP.put(f, False)
             return False
 
     for point in fill:
-        REVERSE_VALID_FILL_MAP[point] = True
+        REVERSE_VALID_FILL_MAP.put(point, True)
     return True
 
 
-def part1():
-    instructions: List[Instruction] = get_input(18, mapper=Instruction.parse)
+def parse(input: PuzzleInput) -> List[Instruction]:
+    return [Instruction.parse(line) for line in as_lines(input)]
+
+
+def part1(instructions: List[Instruction]) -> int:
+    # the reverse maps are keyed by point only, so they must not outlive a single trench map
+    REVERSE_FLOOD_FILL_MAP.clear()
+    REVERSE_VALID_FILL_MAP.clear()
 
     dug_cubes = get_dug_cubes(instructions)
     trench_map = get_trench_map(dug_cubes)
@@ -155,7 +164,7 @@ def part1():
             answer = len(set(dug_cubes)) + len(flood_fill(trench_map, (x, y)))
             break
 
-    submit(day=18, level=1, answer=answer, really=True)
+    return answer
 
 
 def get_break_points(instructions: List[Instruction]) -> Breakpoints:
@@ -231,8 +240,10 @@ def get_dug_cubes2(instructions: List[Instruction], breakpoints: Breakpoints) ->
     return dug_cubes
 
 
-def part2():
-    instructions: List[Instruction] = get_input(18, mapper=Instruction.parse)
+def part2(instructions: List[Instruction]) -> int:
+    REVERSE_FLOOD_FILL_MAP.clear()
+    REVERSE_VALID_FILL_MAP.clear()
+
     breakpoints = get_break_points(instructions)
 
     dug_cubes = get_dug_cubes2(instructions, breakpoints)
@@ -263,7 +274,12 @@ def part2():
 
         answer += width * height
 
-    submit(day=18, level=2, answer=answer)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=18, level=2, answer=solve(2, get_input(18)))
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Dict, Optional
 
-from aoc_api import get_input_chunks, submit
+from aoc_api import PuzzleInput, as_chunks, get_input, submit
 from intervals import Interval, intersection
 
 
@@ -166,19 +166,23 @@ def interval_count(intervals: Dict[str, Interval]) -> int:
         (intervals['s'].right - intervals['s'].left)
 
 
-def part1():
-    workflow_strs, part_strs = get_input_chunks(19)
+def parse(input: PuzzleInput) -> List[List[str]]:
+    return as_chunks(input)
+
+
+def part1(input: List[List[str]]) -> int:
+    workflow_strs, part_strs = input
     workflows = {workflow.name: workflow for workflow in [Workflow.parse(workflow_str) for workflow_str in workflow_strs]}
     parts = [Part.parse(part_str) for part_str in part_strs]
 
     accepted_parts = [part for part in parts if part.process(workflows) == 'A']
     answer = sum([part.get_part_value() for part in accepted_parts])
 
-    submit(day=19, level=1, answer=answer, really=True)
+    return answer
 
 
-def part2():
-    workflow_strs, part_strs = get_input_chunks(19)
+def part2(input: List[List[str]]) -> int:
+    workflow_strs, part_strs = input
     workflows = {workflow.name: workflow for workflow in [Workflow.parse(workflow_str) for workflow_str in workflow_strs]}
 
     answer = count_possibilities({
@@ -188,7 +192,12 @@ def part2():
         's': Interval(1, 4001),
     }, 'in', 0, workflows)
 
-    submit(day=19, level=2, answer=answer)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=19, level=2, answer=solve(2, get_input(19)))
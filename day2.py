@@ -1,4 +1,4 @@
-from aoc_api import get_input
+from aoc_api import PuzzleInput, as_lines, get_input
 
 from dataclasses import dataclass
 import re
@@ -56,13 +56,21 @@ def parse_games(games_line: str) -> List[Game]:
     return result
 
 
-def part1():
-    game_lines = get_input(2, parse_game_line)
-    print(sum([game_line.id for game_line in game_lines if game_line.is_acceptable()]))
+def parse(input: PuzzleInput) -> List[GameLine]:
+    return [parse_game_line(line) for line in as_lines(input)]
 
 
-def part2():
-    game_lines = get_input(2, parse_game_line)
-    print(sum([game_line.power() for game_line in game_lines]))
+def part1(game_lines: List[GameLine]) -> int:
+    return sum([game_line.id for game_line in game_lines if game_line.is_acceptable()])
 
-part2()
\ No newline at end of file
+
+def part2(game_lines: List[GameLine]) -> int:
+    return sum([game_line.power() for game_line in game_lines])
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
+
+
+if __name__ == '__main__':
+    print(solve(2, get_input(2)))
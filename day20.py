@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Union, Dict, Tuple
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
+from progress import Meter
 
 
 @dataclass(frozen=True)
@@ -113,10 +114,14 @@ def press_button(cache_key: CacheKey) -> Tuple[int, int, bool]:
     return low_pulses, high_pulses, hit_rx_module
 
 
-def part1():
+def parse(input: PuzzleInput) -> List[Module]:
+    return [Module.parse(line) for line in as_lines(input)]
+
+
+def part1(modules: List[Module]) -> int:
     global input
 
-    input = {m.module_id: m for m in get_input(day=20, mapper=Module.parse)}
+    input = {m.module_id: m for m in modules}
 
     # bake in the initial state for conjunctions
     for module_id in input:
@@ -131,16 +136,15 @@ def part1():
         low_pulses += round_lp
         high_pulses += round_hp
 
-    print(low_pulses, high_pulses)
     answer = low_pulses * high_pulses
 
-    submit(day=20, level=1, answer=answer)
+    return answer
 
 
-def part2():
+def part2(modules: List[Module]) -> int:
     global input
 
-    input = {m.module_id: m for m in get_input(day=20, mapper=Module.parse)}
+    input = {m.module_id: m for m in modules}
 
     # bake in the initial state for conjunctions
     for module_id in input:
@@ -150,14 +154,21 @@ def part2():
                 destination_module.module_state[module_id] = 'low'
 
     button_presses = 0
-    while True:
-        button_presses += 1
-        _, _, hit_rx_button = press_button(CacheKey.build(input))
+    with Meter("button presses") as meter:
+        while True:
+            button_presses += 1
+            _, _, hit_rx_button = press_button(CacheKey.build(input))
+            meter.update()
+
+            if hit_rx_button:
+                break
+
+    return button_presses
 
-        if hit_rx_button:
-            break
 
-    submit(day=20, level=2, answer=button_presses)
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=20, level=2, answer=solve(2, get_input(20)))
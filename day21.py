@@ -1,9 +1,9 @@
 from collections import defaultdict
 from dataclasses import dataclass
-from functools import cache
 from typing import Tuple, Set, Dict, Collection, List
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
+from caches import memoize
 from intervals import Interval
 from kernels import four_kernel
 from vectors import Vec2, minus2, plus2
@@ -43,7 +43,7 @@ def advance_farms(this_farm: Vec2, current_plots: Set[Vec2]) -> Dict[Vec2, Set[V
     return {key: frozenset(result[key]) for key in result}
 
 
-@cache
+@memoize
 def relative_advance_farms(current_plots: Set[Vec2]) -> Dict[Vec2, Set[Vec2]]:
     left_farm: Vec2 = (-1, 0)
     right_farm: Vec2 = (1, 0)
@@ -168,10 +168,22 @@ def find_steady_states() -> Tuple[Set[Vec2], Set[Vec2]]:
         p0 = p1
 
 
-def part1():
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
+
+
+def use_input(lines: List[str]):
+    """
+    Makes the lines the farm every helper works on. relative_advance_farms only keys on the plots, so its cache has
+    to go along with the old farm."""
     global input
 
-    input = get_input(day=21)
+    input = lines
+    relative_advance_farms.cache_clear()
+
+
+def part1(lines: List[str]) -> int:
+    use_input(lines)
 
     current_plots: Set[Vec2] = {get_starting_position()}
     steps = 0
@@ -179,7 +191,7 @@ def part1():
         current_plots = steps_from_steps(current_plots)
         steps += 1
 
-    submit(day=21, level=1, answer=len(current_plots))
+    return len(current_plots)
 
 
 @dataclass(frozen=True)
@@ -383,11 +395,11 @@ def count_from_stencil(stencil: CompressedFarms, desired_steps: int) -> int:
     return answer
 
 
-def part2():
-    global input, red, green, next_after_red, next_after_green
+def part2(lines: List[str]) -> int:
+    global red, green, next_after_red, next_after_green
     debug = False
 
-    input = get_input(day=21)
+    use_input(lines)
 
     steps = 0
     farm_chart: Dict[Vec2, Set[Vec2]] = {(0, 0): frozenset([get_starting_position()])}
@@ -415,7 +427,12 @@ def part2():
 
     stencil = get_stencil(compressed_farms)
     answer = count_from_stencil(stencil, desired)
-    submit(day=21, level=2, answer=answer)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=21, level=2, answer=solve(2, get_input(21)))
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
+from typing import List
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 from intervals import Interval
 
 
@@ -23,13 +24,19 @@ class Brick:
             z_bounds=Interval(z_min, z_max + 1))
 
 
-def part1():
-    input = get_input(day=22, mapper=Brick.parse)
+def parse(input: PuzzleInput) -> List[Brick]:
+    return [Brick.parse(line) for line in as_lines(input)]
 
-    
+
+def part1(input: List[Brick]) -> int:
     answer = 0
 
-    submit(day=22, level=1, answer=answer)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1}[part](parse(input))
 
 
-part1()
+if __name__ == '__main__':
+    submit(day=22, level=1, answer=solve(1, get_input(22)))
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional, Tuple, List
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 from vectors import Vec2, intersect2
 
 
@@ -30,8 +30,11 @@ class RaySegment:
         return self.v_x, self.v_y
 
 
-def part1():
-    input: List[RaySegment] = get_input(day=24, mapper=RaySegment.parse)
+def parse(input: PuzzleInput) -> List[RaySegment]:
+    return [RaySegment.parse(line) for line in as_lines(input)]
+
+
+def part1(input: List[RaySegment]) -> int:
 
     answer = 0
     left = 200000000000000
@@ -46,7 +49,12 @@ def part1():
             if (left <= intersection[0] <= right) and (left <= intersection[1] <= right):
                 answer += 1
 
-    submit(day=24, level=1, answer=answer)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1}[part](parse(input))
 
 
-part1()
+if __name__ == '__main__':
+    submit(day=24, level=1, answer=solve(1, get_input(24)))
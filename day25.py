@@ -1,15 +1,15 @@
-from functools import cache
 from typing import List, Tuple, Dict
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
+from caches import memoize
 
 
 Graph = Tuple[Tuple[str, Tuple[str]]]
 
 
-def parse(lines: List[str]) -> Graph:
+def parse(input: PuzzleInput) -> Graph:
     result: Dict[str, List[str]] = {}
-    for line in lines:
+    for line in as_lines(input):
         left, right = line.split(":")
         src = left.strip()
         dsts = [x.strip() for x in right.split()]
@@ -27,7 +27,7 @@ def parse(lines: List[str]) -> Graph:
     return tuple((x, tuple(result[x])) for x in result)
 
 
-@cache
+@memoize
 def count_components(graph: Graph, excluded: Tuple[Tuple[str, str]] = tuple()) -> int:
     graph = {x[0]: x[1] for x in graph}
 
@@ -50,11 +50,15 @@ def count_components(graph: Graph, excluded: Tuple[Tuple[str, str]] = tuple()) -
     return connected_components
 
 
-def part1():
-    input = get_input(day=25)
-    answer = count_components(parse(input))
+def part1(input: Graph) -> int:
+    answer = count_components(input)
 
-    submit(day=25, level=1, answer=answer)
+    return answer
 
 
-part1()
\ No newline at end of file
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1}[part](parse(input))
+
+
+if __name__ == '__main__':
+    submit(day=25, level=1, answer=solve(1, get_input(25)))
\ No newline at end of file
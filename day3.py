@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Set, Dict, Optional, Union, Any, Tuple
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 from intervals import Interval
 from kernels import eight_kernel
 
@@ -22,9 +22,7 @@ def extract_full_number(r: int, c: int, input: List[str]) -> Tuple[int, int, int
     return int(input[r][start:end+1]), r, start, end
 
 
-def part1():
-    input = get_input(3)
-
+def part1(input: List[str]) -> int:
     numbers = set()
     for r in range(len(input)):
         for c in range(len(input[0])):
@@ -39,12 +37,10 @@ def part1():
                         numbers.add(number)
 
     answer = sum([number[0] for number in numbers])
-    submit(day=3, level=1, answer=answer)
-
+    return answer
 
-def part2():
-    input = get_input(3)
 
+def part2(input: List[str]) -> int:
     answer = 0
     for r in range(len(input)):
         for c in range(len(input[0])):
@@ -62,7 +58,16 @@ def part2():
                     lnumbers = list(numbers)
                     answer += lnumbers[0] * lnumbers[1]
 
-    submit(day=3, level=2, answer=answer)
+    return answer
+
+
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=3, level=2, answer=solve(2, get_input(3)))
@@ -1,12 +1,10 @@
 from dataclasses import dataclass
 from typing import List, Set, Dict, Optional, Union, Any, Tuple
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 
 
-def part1():
-    input = get_input(4)
-
+def part1(input: List[str]) -> int:
     answer = 0
 
     for idx, line in enumerate(input):
@@ -21,12 +19,10 @@ def part1():
 
         answer += 2**(intersect - 1)
 
-    submit(day=4, level=2, answer=answer, really=True)
-
+    return answer
 
-def part2():
-    input = get_input(4)
 
+def part2(input: List[str]) -> int:
     counts = [1 for _ in range(len(input))]
 
     for idx, line in enumerate(input):
@@ -42,7 +38,16 @@ def part2():
         for offset in range(intersect):
             counts[idx + offset + 1] += counts[idx]
 
-    submit(day=4, level=2, answer=sum(counts), really=True)
+    return sum(counts)
+
+
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=4, level=2, answer=solve(2, get_input(4)), really=True)
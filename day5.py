@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Set, Tuple
 
-from aoc_api import get_raw_input_chunks, submit
+from aoc_api import PuzzleInput, as_chunks, get_input, submit
 from intervals import Interval, intersection, difference
 
 
@@ -86,9 +86,11 @@ def parse_seed_intervals(line: str) -> List[Interval]:
     return result
 
 
-def part1():
-    input = get_raw_input_chunks(5)
+def parse(input: PuzzleInput) -> List[List[str]]:
+    return as_chunks(input)
 
+
+def part1(input: List[List[str]]) -> int:
     seeds = parse_seeds(input[0][0])
     mappings = [Mapping.parse(chunk) for chunk in input[1:]]
 
@@ -99,12 +101,10 @@ def part1():
             seed = mapping.advance_seed(seed)
         answer = min(answer, seed)
 
-    submit(day=5, level=1, answer=answer)
-
+    return answer
 
-def part2():
-    input = get_raw_input_chunks(5)
 
+def part2(input: List[List[str]]) -> int:
     seed_intervals = parse_seed_intervals(input[0][0])
     mappings = [Mapping.parse(chunk) for chunk in input[1:]]
 
@@ -118,7 +118,12 @@ def part2():
         min_in_batch = min(intervals, key=lambda i: i.left).left
         answer = min(answer, min_in_batch)
 
-    submit(day=5, level=2, answer=answer, really=True)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
\ No newline at end of file
+if __name__ == '__main__':
+    submit(day=5, level=2, answer=solve(2, get_input(5)), really=True)
\ No newline at end of file
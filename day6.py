@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Set, Dict, Optional, Union, Any, Tuple
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 
 @dataclass
 class Race:
@@ -55,32 +55,31 @@ class Race:
 
         return largest_beating - smallest_beating + 1
 
-RACES: List[Race] = [
-    Race(time_ms=59, distance_millis=430),
-    Race(time_ms=70, distance_millis=1218),
-    Race(time_ms=78, distance_millis=1213),
-    Race(time_ms=78, distance_millis=1276),
-]
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
 
-RACES: List[Race] = [
-    Race(time_ms=7, distance_millis=9),
-    Race(time_ms=15, distance_millis=40),
-    Race(time_ms=30, distance_millis=200),
-]
 
-def part1():
+def parse_races(input: List[str]) -> List[Race]:
+    times = input[0].split(":")[1].split()
+    distances = input[1].split(":")[1].split()
+
+    return [Race(time_ms=int(t), distance_millis=int(d)) for t, d in zip(times, distances)]
+
+
+def part1(input: List[str]) -> int:
     answer = 1
 
-    for count_beats in [race.count_beats() for race in RACES]:
+    for count_beats in [race.count_beats() for race in parse_races(input)]:
         answer *= count_beats
 
-    submit(day=6, level=1, answer=answer, really=True)
+    return answer
 
 
-def part2():
+def part2(input: List[str]) -> int:
+    # the spaces between the numbers were just bad kerning
     races: List[Race] = [
-        Race(time_ms=59707878, distance_millis=430121812131276),
-        #Race(time_ms=71530, distance_millis=940200)
+        Race(time_ms=int(input[0].split(":")[1].replace(" ", "")),
+             distance_millis=int(input[1].split(":")[1].replace(" ", "")))
     ]
 
     answer = 1
@@ -88,6 +87,12 @@ def part2():
     for count_beats in [race.count_beats_smart() for race in races]:
         answer *= count_beats
 
-    submit(day=6, level=2, answer=answer, really=True)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
+
 
-part2()
\ No newline at end of file
+if __name__ == '__main__':
+    submit(day=6, level=2, answer=solve(2, get_input(6)), really=True)
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from functools import cmp_to_key
+from typing import List
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 
 FIVE_OF_A_KIND = 7
 FOUR_OF_A_KIND = 6
@@ -144,8 +145,12 @@ class Hand2(Hand):
         return 0
 
 
-def part1():
-    hands = get_input(7, mapper=Hand.parse)
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
+
+
+def part1(input: List[str]) -> int:
+    hands = [Hand.parse(line) for line in input]
 
     answer = 0
     hands = sorted(hands, key=cmp_to_key(Hand.compare), reverse=True)
@@ -153,11 +158,11 @@ def part1():
     for idx, hand in enumerate(hands):
         answer += hand.bid * (idx + 1)
 
-    submit(day=7, level=1, answer=answer, really=True)
+    return answer
 
 
-def part2():
-    hands = get_input(7, mapper=Hand2.parse)
+def part2(input: List[str]) -> int:
+    hands = [Hand2.parse(line) for line in input]
 
     answer = 0
     hands = sorted(hands, key=cmp_to_key(Hand2.compare), reverse=True)
@@ -165,7 +170,12 @@ def part2():
     for idx, hand in enumerate(hands):
         answer += hand.bid * (idx + 1)
 
-    submit(day=7, level=2, answer=answer, really=True)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
\ No newline at end of file
+if __name__ == '__main__':
+    submit(day=7, level=2, answer=solve(2, get_input(7)), really=True)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Dict, Tuple, List
 
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, as_lines, get_input, submit
 from maths import lcm
 
 
@@ -33,8 +33,7 @@ def get_node_map(nodes: List[Node]) -> Dict[Tuple[str, str], str]:
     return result
 
 
-def part1():
-    input = get_input(8)
+def part1(input: List[str]) -> int:
     instructions = input[0].strip()
 
     input = input[2:]
@@ -54,11 +53,10 @@ def part1():
 
     answer = count
 
-    submit(day=8, level=1, answer=answer, really=True)
+    return answer
 
 
-def part2():
-    input = get_input(8)
+def part2(input: List[str]) -> int:
     instructions = input[0].strip()
 
     input = input[2:]
@@ -83,7 +81,16 @@ def part2():
         counts.append(count)
 
     answer = lcm(counts)
-    submit(day=8, level=2, answer=answer, really=True)
+    return answer
 
 
-part2()
+def parse(input: PuzzleInput) -> List[str]:
+    return as_lines(input)
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
+
+
+if __name__ == '__main__':
+    submit(day=8, level=2, answer=solve(2, get_input(8)), really=True)
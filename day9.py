@@ -1,6 +1,6 @@
-from aoc_api import get_input, submit
+from aoc_api import PuzzleInput, iter_input, iter_lines, submit
 
-from typing import List
+from typing import Iterable, List
 
 
 def extrapolate_line(line: List[int]) -> int:
@@ -20,26 +20,31 @@ def extrapolate_back(line: List[int]) -> int:
 
     return line[0] - extrapolate_back(differences)
 
-def part1():
-    input = get_input(9)
+def parse(input: PuzzleInput) -> Iterable[str]:
+    return iter_lines(input)
 
+
+def part1(input: Iterable[str]) -> int:
     answer = 0
     for line in input:
         line = [int(x) for x in line.split()]
         answer += extrapolate_line(line)
 
-    submit(day=9, level=1, answer=answer, really=True)
-
+    return answer
 
-def part2():
-    input = get_input(9)
 
+def part2(input: Iterable[str]) -> int:
     answer = 0
     for line in input:
         line = [int(x) for x in line.split()]
         answer += extrapolate_back(line)
 
-    submit(day=9, level=2, answer=answer, really=True)
+    return answer
+
+
+def solve(part: int, input: PuzzleInput) -> int:
+    return {1: part1, 2: part2}[part](parse(input))
 
 
-part2()
+if __name__ == '__main__':
+    submit(day=9, level=2, answer=solve(2, iter_input(9)), really=True)
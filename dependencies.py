@@ -0,0 +1,171 @@
+import ast
+import functools
+import hashlib
+import importlib
+import os
+import sys
+import traceback
+from typing import Dict, Iterable, List, Optional, Set
+
+# where the solutions and their utility modules live
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def module_filename(name: str, root: str = ROOT) -> Optional[str]:
+    """
+    Returns the file of a top-level module in the root directory, or None if it isn't one of ours (stdlib,
+    site-packages, ...)."""
+    for candidate in [os.path.join(root, f"{name}.py"), os.path.join(root, name, "__init__.py")]:
+        if os.path.isfile(candidate):
+            return candidate
+
+    return None
+
+
+def direct_imports(name: str, root: str = ROOT) -> Set[str]:
+    """
+    Returns the local modules that the module imports directly, wherever in the file the import is."""
+    filename = module_filename(name, root)
+    if filename is None:
+        return set()
+
+    with open(filename, "rb") as f:
+        tree = ast.parse(f.read(), filename)
+
+    result = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+            names = [node.module]
+        else:
+            continue
+
+        for imported in names:
+            top_level = imported.split(".")[0]
+            if top_level != name and module_filename(top_level, root) is not None:
+                result.add(top_level)
+
+    return result
+
+
+def dependency_graph(
+        names: Iterable[str], root: str = ROOT, previous: Optional[Dict[str, Set[str]]] = None) -> Dict[str, Set[str]]:
+    """
+    Returns the direct local imports of the given modules and, transitively, of everything they import. A module that
+    doesn't parse (saved mid-edit) keeps its imports from the `previous` graph, or has none."""
+    graph: Dict[str, Set[str]] = {}
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in graph:
+            continue
+        try:
+            graph[name] = direct_imports(name, root)
+        except SyntaxError:
+            graph[name] = set((previous or {}).get(name, set()))
+        pending += graph[name]
+
+    return graph
+
+
+def transitive_dependencies(name: str, root: str = ROOT) -> List[str]:
+    """
+    Returns the module itself and every local module it imports, directly or not, sorted by name."""
+    return sorted(dependency_graph([name], root))
+
+
+def dependents(graph: Dict[str, Set[str]], names: Iterable[str]) -> Set[str]:
+    """
+    Returns the modules of the graph that import any of the given ones, directly or not, and those themselves."""
+    importers: Dict[str, Set[str]] = {}
+    for name, imports in graph.items():
+        for imported in imports:
+            importers.setdefault(imported, set()).add(name)
+
+    result = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in result:
+            continue
+        result.add(name)
+        pending += importers.get(name, set())
+
+    return result
+
+
+def topological_order(graph: Dict[str, Set[str]]) -> List[str]:
+    """
+    Returns the modules of the graph with every module after the ones it imports. Import cycles are broken
+    arbitrarily, the way Python's import does."""
+    result: List[str] = []
+    visited: Set[str] = set()
+
+    def visit(name: str):
+        if name in visited:
+            return
+        visited.add(name)
+        for imported in sorted(graph.get(name, set())):
+            visit(imported)
+        result.append(name)
+
+    for name in sorted(graph):
+        visit(name)
+
+    return result
+
+
+def reload_modules(graph: Dict[str, Set[str]], names: Iterable[str], root: str = ROOT) -> Dict[str, str]:
+    """
+    Reloads the given modules that are imported, each after the ones it imports. Returns the error of each that
+    failed, e.g. on a syntax error mid-edit; they stay as they were, as do modules whose file is gone."""
+    names = set(names)
+    failed = {}
+    for name in topological_order(graph):
+        if name not in names or name not in sys.modules or module_filename(name, root) is None:
+            continue
+        try:
+            importlib.reload(sys.modules[name])
+        except Exception as e:
+            failed[name] = traceback.format_exception_only(e)[-1].strip()
+
+    return failed
+
+
+def file_hash(name: str, root: str = ROOT) -> Optional[str]:
+    """
+    Returns the hash of the module's own source, or None if it isn't a local module (anymore)."""
+    filename = module_filename(name, root)
+    if filename is None:
+        return None
+
+    try:
+        return _file_hash(filename)
+    except FileNotFoundError:
+        return None
+
+
+def source_hash(name: str, root: str = ROOT) -> str:
+    """
+    Returns a hash of the source of the module and of every local module it depends on, so that changing any of them
+    changes the hash."""
+    digest = hashlib.sha256()
+    for dependency in transitive_dependencies(name, root):
+        digest.update(dependency.encode())
+        digest.update(b"\0")
+        digest.update(_file_hash(module_filename(dependency, root)).encode())
+
+    return digest.hexdigest()
+
+
+def _file_hash(filename: str) -> str:
+    stat = os.stat(filename)
+    return _cached_file_hash(filename, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_file_hash(filename: str, mtime_ns: int, size: int) -> str:
+    # keyed by mtime and size too, so an edited file gets hashed again
+    with open(filename, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
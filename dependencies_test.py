@@ -0,0 +1,66 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+
+from dependencies import dependency_graph, reload_modules, source_hash, transitive_dependencies
+
+
+class TestDependencies(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.write("day1", "import os\nfrom helpers import parse\n")
+        self.write("helpers", "import re\n\ndef parse():\n    import maths\n")
+        self.write("maths", "")
+        self.write("unused", "")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, source: str):
+        filename = os.path.join(self.root, f"{name}.py")
+        with open(filename, "w") as f:
+            f.write(source)
+        # make sure an edit within the same clock tick still looks modified
+        os.utime(filename, ns=(0, os.stat(filename).st_mtime_ns + 1000))
+
+    def test_local_imports_only(self):
+        self.assertEqual(
+            dependency_graph(["day1"], self.root), {"day1": {"helpers"}, "helpers": {"maths"}, "maths": set()})
+        self.assertEqual(transitive_dependencies("day1", self.root), ["day1", "helpers", "maths"])
+
+    def test_source_hash_follows_dependencies(self):
+        before = source_hash("day1", self.root)
+        self.write("unused", "x = 1\n")
+        self.assertEqual(source_hash("day1", self.root), before)
+
+        self.write("maths", "x = 1\n")
+        self.assertNotEqual(source_hash("day1", self.root), before)
+
+    def test_syntax_error_keeps_previous_imports(self):
+        graph = dependency_graph(["day1"], self.root)
+        self.write("day1", "from helpers import parse\n\ndef f(:\n")
+
+        self.assertEqual(dependency_graph(["day1"], self.root, previous=graph), graph)
+        self.assertEqual(dependency_graph(["day1"], self.root), {"day1": set()})
+
+    def test_reload_modules(self):
+        self.write("reload_base", "X = 1\n")
+        self.write("reload_user", "from reload_base import X\n\nY = X\n")
+        sys.path.insert(0, self.root)
+        self.addCleanup(sys.path.remove, self.root)
+        for name in ["reload_base", "reload_user"]:
+            self.addCleanup(sys.modules.pop, name, None)
+        user = importlib.import_module("reload_user")
+        graph = dependency_graph(["reload_user"], self.root)
+
+        # the importer is reloaded after what it imports, and sees its new value
+        self.write("reload_base", "X = 22\n")
+        self.assertEqual(reload_modules(graph, ["reload_user", "reload_base"], self.root), {})
+        self.assertEqual(user.Y, 22)
+
+        self.write("reload_user", "Y = (\n")
+        self.assertEqual(list(reload_modules(graph, ["reload_user"], self.root)), ["reload_user"])
+        self.assertEqual(user.Y, 22)
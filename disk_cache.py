@@ -0,0 +1,234 @@
+"""
+Memoization that outlives the process, for pure functions whose subproblems recur between runs.
+
+    @disk_memoize
+    def count_arrangements(springs: str, groups: Tuple[int], current_group_size: int) -> int: ...
+
+Results go to a sqlite database shared by every function and process: memo-cache.sqlite3 under AOC_CACHE_ROOT, or in
+the working directory without one. In front of it sits a bounded in-memory cache from caches.py, so the hot recursive
+calls never leave memory. New results are written in batches of `batch_size` and when the process exits. The database
+is in WAL mode, so parallel workers can read and write it at the same time.
+
+Entries are namespaced by the function's name and the source hash of its module (see dependencies.source_hash), so
+editing the solution invalidates them. Older versions stay, since another checkout sharing the database may still
+use them, until prune() drops the ones no process has opened in a while (`python -m aoc prune-memo`).
+
+Both the arguments and the values are pickled (with a fixed protocol, so that equal arguments make equal keys), which
+works for plain data: numbers, strings, and tuples of them.
+
+Looking up a subproblem on disk costs more than recomputing most of them, so only results that took at least
+`min_seconds` are stored. Each miss in memory is looked up on its own, by primary key, so a process only ever holds the
+entries it asked for, and none at all when the function's version had nothing stored as the process started (the
+first run after every edit). On a second run with the same input, the top-level calls are all answered from disk.
+
+Set AOC_DISK_CACHE=0, or call disable(), to memoize in memory only. The benchmarks do, since they are after the cost
+of computing the answers, not of reading them back."""
+import atexit
+import functools
+import inspect
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, TypeVar
+
+from caches import memoize
+from dependencies import source_hash
+
+T = TypeVar('T')
+
+ENABLED = os.environ.get("AOC_DISK_CACHE", "1") not in ["", "0"]
+
+DEFAULT_FRONT_BYTES = 256 * 2 ** 20
+
+PICKLE_PROTOCOL = 4
+
+_MISSING = object()
+
+_STORES: List['DiskStore'] = []
+
+
+def disable():
+    """
+    Turns the disk off: functions decorated from now on memoize in memory only, and those decorated before stop
+    reading and writing their stores."""
+    global ENABLED
+    ENABLED = False
+
+
+def flush_all():
+    """
+    Writes out every store's pending results. Worker processes have to call this, since they exit without running
+    the atexit handlers."""
+    for store in _STORES:
+        store.flush()
+
+
+atexit.register(flush_all)
+
+
+def default_filename() -> str:
+    return os.path.join(os.environ.get("AOC_CACHE_ROOT", "."), "memo-cache.sqlite3")
+
+
+def prune(max_age_days: float = 30, filename: Optional[str] = None) -> int:
+    """
+    Deletes the entries of every function version that no process has opened in the last `max_age_days`, and returns
+    how many were deleted."""
+    filename = filename or default_filename()
+    if not os.path.exists(filename):
+        return 0
+
+    cutoff = time.time() - max_age_days * 24 * 60 * 60
+    connection = _connect(filename)
+    try:
+        with connection:
+            deleted = connection.execute(
+                "DELETE FROM memo WHERE namespace NOT IN (SELECT namespace FROM versions WHERE last_used >= ?)",
+                (cutoff,)).rowcount
+            connection.execute("DELETE FROM versions WHERE last_used < ?", (cutoff,))
+    finally:
+        connection.close()
+
+    return deleted
+
+
+class DiskStore:
+    """
+    One function's entries in the memo database. They are read one key at a time, and new ones are written in
+    batches."""
+
+    def __init__(self, filename: str, namespace: str, batch_size: int = 1000):
+        self.filename = filename
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        # pickled key -> pickled value, of what was stored but not written yet
+        self._pending: Dict[bytes, bytes] = {}
+        self._pending_pid = os.getpid()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # whether the namespace had any entries on disk when this process connected. It's not looked up otherwise:
+        # what this process stores since is in memory
+        self._any_stored = False
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Returns the stored value, or _MISSING."""
+        data = None
+        if self._has_stored():
+            key_data = pickle.dumps(key, PICKLE_PROTOCOL)
+            self._own_pending()
+            data = self._pending.get(key_data)
+            if data is None:
+                row = self._connect().execute(
+                    "SELECT value FROM memo WHERE namespace = ? AND key = ?", (self.namespace, key_data)).fetchone()
+                data = row[0] if row is not None else None
+        if data is None:
+            self.misses += 1
+            return _MISSING
+
+        self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key: Hashable, value: Any):
+        self._own_pending()
+        self._pending[pickle.dumps(key, PICKLE_PROTOCOL)] = pickle.dumps(value, PICKLE_PROTOCOL)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self._own_pending()
+        if not self._pending:
+            return
+
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO memo (namespace, key, value) VALUES (?, ?, ?)",
+                [(self.namespace, key_data, data) for key_data, data in self._pending.items()])
+        self.writes += len(self._pending)
+        self._pending.clear()
+
+    def _has_stored(self) -> bool:
+        self._connect()
+        return self._any_stored
+
+    def _own_pending(self):
+        # a forked worker starts out with its parent's pending writes, which are the parent's to flush
+        if self._pending_pid != os.getpid():
+            self._pending = {}
+            self._pending_pid = os.getpid()
+
+    def _connect(self) -> sqlite3.Connection:
+        # a connection can't cross a fork, so a worker opens its own
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = _connect(self.filename)
+            self._pid = os.getpid()
+            with self._connection:
+                # what prune() goes by
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO versions (namespace, last_used) VALUES (?, ?)",
+                    (self.namespace, time.time()))
+            # a new version, the first run after every edit, has nothing to look up
+            self._any_stored = self._connection.execute(
+                "SELECT EXISTS (SELECT 1 FROM memo WHERE namespace = ?)", (self.namespace,)).fetchone()[0] == 1
+
+        return self._connection
+
+
+def _connect(filename: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(filename, timeout=60)
+    with connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS memo "
+            "(namespace TEXT, key BLOB, value BLOB, PRIMARY KEY (namespace, key)) WITHOUT ROWID")
+        connection.execute("CREATE TABLE IF NOT EXISTS versions (namespace TEXT PRIMARY KEY, last_used REAL)")
+
+    return connection
+
+
+def disk_memoize(function: Optional[Callable[..., T]] = None, *, name: Optional[str] = None,
+                 filename: Optional[str] = None, min_seconds: float = 0.001, batch_size: int = 1000,
+                 max_bytes: Optional[int] = DEFAULT_FRONT_BYTES) -> Callable[..., T]:
+    """
+    Memoizes a function in memory, capped at `max_bytes`, and on disk, the results that took at least `min_seconds`.
+    Usable with or without arguments. The wrapper has the in-memory cache's cache_info() and cache_clear(), and the
+    DiskStore as `store`."""
+    if function is None:
+        return functools.partial(
+            disk_memoize, name=name, filename=filename, min_seconds=min_seconds, batch_size=batch_size,
+            max_bytes=max_bytes)
+
+    # not __module__, which is __main__ for a solution run as a script
+    module = os.path.splitext(os.path.basename(inspect.getfile(function)))[0]
+    name = name or f"{module}.{function.__qualname__}"
+    if not ENABLED:
+        return memoize(function, name=name, max_bytes=max_bytes)
+
+    store = DiskStore(filename or default_filename(), f"{name}:{source_hash(module)}", batch_size)
+    _STORES.append(store)
+    perf_counter = time.perf_counter
+
+    # only reached on a miss in memory
+    @functools.wraps(function)
+    def load_or_compute(*args, **kwargs):
+        if not ENABLED:
+            return function(*args, **kwargs)
+
+        disk_key = args if not kwargs else (args, tuple(sorted(kwargs.items())))
+        value = store.get(disk_key)
+        if value is _MISSING:
+            start = perf_counter()
+            value = function(*args, **kwargs)
+            if perf_counter() - start >= min_seconds:
+                store.put(disk_key, value)
+        return value
+
+    wrapper = memoize(load_or_compute, name=name, max_bytes=max_bytes)
+    wrapper.store = store
+    return wrapper
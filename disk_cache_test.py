@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+import caches
+import disk_cache
+from disk_cache import DiskStore, disk_memoize
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "memo.sqlite3")
+        self.calls = []
+        # the benchmarks turn it off
+        self.was_enabled = disk_cache.ENABLED
+        disk_cache.ENABLED = True
+
+    def tearDown(self):
+        disk_cache.ENABLED = self.was_enabled
+        self.directory.cleanup()
+
+    def memoized_fibonacci(self):
+        # a new wrapper stands in for a new process: same name and code, empty memory
+        @disk_memoize(name="test.fibonacci", filename=self.filename, min_seconds=0, batch_size=4)
+        def fibonacci(n: int, offset: int = 0) -> int:
+            self.calls.append(n)
+            return n + offset if n < 2 else fibonacci(n - 1, offset) + fibonacci(n - 2, offset)
+
+        fibonacci.cache_clear()
+        return fibonacci
+
+    def test_persists_between_processes(self):
+        first = self.memoized_fibonacci()
+        self.assertEqual(first(20), 6765)
+        self.assertEqual(len(self.calls), 21)
+        first.store.flush()
+
+        self.calls.clear()
+        second = self.memoized_fibonacci()
+        self.assertEqual(second(20), 6765)
+        self.assertEqual(second(19, 0), 4181)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(second.store.hits, 2)
+
+        # keyword arguments make their own keys
+        self.assertEqual(second(5, offset=1), 13)
+        self.assertEqual(self.calls, [5, 4, 3, 2, 1, 0])
+        second.store.flush()
+
+    def test_bounded_in_memory(self):
+        fibonacci = self.memoized_fibonacci()
+        fibonacci(20)
+
+        front = caches.registry()["test.fibonacci"]
+        self.assertIsInstance(front, caches.Cache)
+        self.assertEqual(front.max_bytes, disk_cache.DEFAULT_FRONT_BYTES)
+        self.assertEqual(len(front), 21)
+
+    def test_looked_up_by_key(self):
+        store = DiskStore(self.filename, "test.g:1")
+        store.put((1, "a"), [1])
+        self.assertIs(DiskStore(self.filename, "test.g:1").get((1, "a")), disk_cache._MISSING)
+
+        store.flush()
+        other = DiskStore(self.filename, "test.g:1")
+        self.assertEqual(other.get((1, "a")), [1])
+        self.assertIs(other.get((2, "a")), disk_cache._MISSING)
+        self.assertEqual((other.hits, other.misses), (1, 1))
+
+        # pending writes are seen by their own store
+        other.put((2, "a"), [2])
+        self.assertEqual(other.get((2, "a")), [2])
+
+    def test_versions_are_kept_until_pruned(self):
+        # two checkouts sharing the database, with different versions of the same function
+        old, new = DiskStore(self.filename, "test.f:old"), DiskStore(self.filename, "test.f:new")
+        old.put(1, "old")
+        old.flush()
+        new.put(1, "new")
+        new.flush()
+
+        self.assertEqual(DiskStore(self.filename, "test.f:old").get(1), "old")
+        self.assertEqual(disk_cache.prune(30, self.filename), 0)
+
+        connection = sqlite3.connect(self.filename)
+        with connection:
+            connection.execute(
+                "UPDATE versions SET last_used = ? WHERE namespace = ?", (time.time() - 31 * 24 * 60 * 60, "test.f:old"))
+        connection.close()
+        self.assertEqual(disk_cache.prune(30, self.filename), 1)
+        self.assertIs(DiskStore(self.filename, "test.f:old").get(1), disk_cache._MISSING)
+        self.assertEqual(DiskStore(self.filename, "test.f:new").get(1), "new")
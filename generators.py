@@ -0,0 +1,630 @@
+"""
+Synthetic puzzle inputs for scaling experiments.
+
+Every generator takes a seeded random.Random and a size, and returns the input text in the same format as the real
+puzzle input. The inputs are structurally faithful (valid loops for day 10 and 18, a three-edge cut for day 25, a
+hailstone trajectory that a single rock can hit for day 24, ...), so the solvers run on them unchanged.
+
+    python generators.py 17 --size 500 --seed 1 > cache-2023-17.txt"""
+import argparse
+import random
+import string
+from typing import Callable, Dict, List, Set, Tuple
+
+from vectors import Vec2, minus3, plus3, times3
+
+
+def generate(day: int, size: int, seed: int = 0, **options: int) -> str:
+    """
+    Returns a synthetic input for the given day. What size means depends on the day: lines for line-based inputs,
+    the side length for grids, the number of chunks for chunked inputs. Some days take extra options, e.g. the number
+    of unknowns per row for day 12."""
+    if day not in GENERATORS:
+        raise ValueError(f"No generator for day {day}")
+
+    return GENERATORS[day](random.Random(seed), size, **options)
+
+
+def generate_day1(rng: random.Random, size: int) -> str:
+    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+    lines = []
+    for _ in range(size):
+        tokens = [rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 20))]
+        tokens += [rng.choice(words) for _ in range(rng.randint(0, 3))]
+        # part 1 needs at least one digit on every line
+        tokens += [str(rng.randint(1, 9)) for _ in range(rng.randint(1, 3))]
+        rng.shuffle(tokens)
+        lines.append("".join(tokens))
+
+    return _join(lines)
+
+
+def generate_day2(rng: random.Random, size: int) -> str:
+    lines = []
+    for game_id in range(1, size + 1):
+        games = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            games.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game_id}: {'; '.join(games)}")
+
+    return _join(lines)
+
+
+def generate_day3(rng: random.Random, size: int) -> str:
+    grid = [["."] * size for _ in range(size)]
+
+    for y in range(size):
+        x = rng.randint(0, 3)
+        while x < size:
+            if rng.random() < 0.5:
+                number = str(rng.randint(1, 999))
+                for offset, digit in enumerate(number[:size - x]):
+                    grid[y][x + offset] = digit
+                x += len(number)
+            elif rng.random() < 0.3:
+                grid[y][x] = rng.choice("*#+$/@%=&-")
+                x += 1
+            # always leave a gap so numbers don't run into each other
+            x += rng.randint(1, 4)
+
+    return _join("".join(row) for row in grid)
+
+
+def generate_day4(rng: random.Random, size: int) -> str:
+    lines = []
+    for card_id in range(1, size + 1):
+        winning = rng.sample(range(1, 100), 10)
+
+        # a card can't win copies of cards past the end of the table
+        matches = min(rng.randint(0, 10), size - card_id)
+        have = rng.sample(winning, matches)
+        have += rng.sample([n for n in range(1, 100) if n not in winning], 25 - matches)
+        rng.shuffle(have)
+
+        lines.append(f"Card {card_id:>3}: {_numbers(winning)} | {_numbers(have)}")
+
+    return _join(lines)
+
+
+def generate_day5(rng: random.Random, size: int) -> str:
+    space = 1 << 32
+    seeds = []
+    for _ in range(10):
+        start = rng.randrange(space // 2)
+        seeds += [start, rng.randint(1, space // 16)]
+
+    chunks = [[f"seeds: {_numbers(seeds)}"]]
+    types = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    for source_type, destination_type in zip(types, types[1:]):
+        # non-overlapping source ranges, sent to random destinations
+        boundaries = sorted(rng.sample(range(space), 2 * size))
+        lines = [f"{source_type}-to-{destination_type} map:"]
+        for left, right in zip(boundaries[::2], boundaries[1::2]):
+            lines.append(f"{rng.randrange(space - (right - left))} {left} {right - left}")
+        chunks.append(lines)
+
+    return _join_chunks(chunks)
+
+
+def generate_day6(rng: random.Random, size: int) -> str:
+    """
+    Part 2 joins the races into one, and the solver walks down from its time to the longest winning hold one step at a
+    time: about joined distance / joined time steps. So only the first record can be longer than its time, the others
+    have as many digits as theirs, and the walk stays short whatever the number of races."""
+    times = [rng.randint(10, 99) for _ in range(size)]
+    distances = [rng.randint(time, time * time // 4 - 1) for time in times[:1]]
+    distances += [rng.randint(10, min(99, time * time // 4 - 1)) for time in times[1:]]
+    return _join([f"Time:      {_numbers(times)}", f"Distance:  {_numbers(distances)}"])
+
+
+def generate_day7(rng: random.Random, size: int) -> str:
+    return _join(
+        f"{''.join(rng.choice('AKQJT98765432') for _ in range(5))} {rng.randint(1, 1000)}" for _ in range(size))
+
+
+def generate_day8(rng: random.Random, size: int) -> str:
+    """
+    Builds one cycle per ghost, each going from a node ending in A to a node ending in Z and back. The first ghost is
+    AAA -> ZZZ, for part 1."""
+    instructions = "".join(rng.choice("LR") for _ in range(rng.randint(50, 300)))
+    ghosts = 6
+    names = _unique_names(rng, ghosts * (max(size // ghosts, 3)), 3, string.ascii_uppercase, forbidden_last="AZ")
+
+    lines = []
+    per_ghost = len(names) // ghosts
+    for ghost in range(ghosts):
+        cycle = names[ghost * per_ghost:(ghost + 1) * per_ghost]
+        # the other names never end in A or Z, so these can't collide with them
+        prefix = string.ascii_uppercase[ghost] * 2
+        cycle[0], cycle[-1] = prefix + "A", "ZZZ" if ghost == 0 else prefix + "Z"
+
+        for idx, name in enumerate(cycle):
+            # the start node is only ever entered through the first instruction
+            next_name = cycle[idx + 1] if idx + 1 < len(cycle) else cycle[1]
+            lines.append(f"{name} = ({next_name}, {next_name})")
+
+    rng.shuffle(lines)
+    return _join([instructions, ""] + lines)
+
+
+def generate_day9(rng: random.Random, size: int) -> str:
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 6))]
+        values = [sum(c * x ** power for power, c in enumerate(coefficients)) for x in range(21)]
+        lines.append(_numbers(values))
+
+    return _join(lines)
+
+
+def generate_day10(rng: random.Random, size: int) -> str:
+    """
+    A single pipe loop (the boundary of a random vertically convex shape) surrounded by junk pipes."""
+    corners = _monotone_polygon(rng, max((size - 1) // 2, 2), max((size - 1) // 2, 2), scale=2)
+    loop = _trace(corners)
+
+    grid = [[rng.choice("|-LJ7F...") for _ in range(size)] for _ in range(size)]
+    for idx, (x, y) in enumerate(loop):
+        grid[y][x] = _pipe(loop[idx - 1], (x, y), loop[(idx + 1) % len(loop)])
+
+    start = loop[rng.randrange(len(loop))]
+    grid[start[1]][start[0]] = "S"
+
+    # junk next to S must not look connected to it, or the start pipe becomes ambiguous
+    loop_neighbors = {loop[(loop.index(start) + offset) % len(loop)] for offset in [-1, 1]}
+    for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+        neighbor = (start[0] + dx, start[1] + dy)
+        if neighbor not in loop_neighbors and 0 <= neighbor[0] < size and 0 <= neighbor[1] < size:
+            grid[neighbor[1]][neighbor[0]] = "."
+
+    return _join("".join(row) for row in grid)
+
+
+def generate_day11(rng: random.Random, size: int) -> str:
+    empty_rows = set(rng.sample(range(size), size // 10))
+    empty_columns = set(rng.sample(range(size), size // 10))
+
+    return _join(
+        "".join(
+            "#" if y not in empty_rows and x not in empty_columns and rng.random() < 0.05 else "."
+            for x in range(size))
+        for y in range(size))
+
+
+def generate_day12(rng: random.Random, size: int, unknowns: int = 8) -> str:
+    """
+    Rows of springs with a known valid arrangement, with some positions (up to `unknowns`) replaced by '?'."""
+    lines = []
+    for _ in range(size):
+        springs = [rng.choice("#.") for _ in range(rng.randint(unknowns, unknowns + 12))]
+        groups = [len(run) for run in "".join(springs).split(".") if run != ""]
+        if not groups:
+            springs[0] = "#"
+            groups = [1]
+
+        for idx in rng.sample(range(len(springs)), min(unknowns, len(springs))):
+            springs[idx] = "?"
+
+        lines.append(f"{''.join(springs)} {','.join(str(g) for g in groups)}")
+
+    return _join(lines)
+
+
+def generate_day13(rng: random.Random, size: int) -> str:
+    """
+    Patterns with exactly one perfect mirror, which is vertical (part 1), and exactly one mirror that's off by a single
+    smudge, which is horizontal (part 2)."""
+    chunks = []
+    while len(chunks) < size:
+        width = rng.choice(range(7, 17, 2))
+        height = rng.choice(range(7, 17, 2))
+
+        # vertical mirror after column `mirror`, leaving some free columns on the right
+        mirror = rng.randint(0, width // 2 - 2)
+        span = mirror + 1
+
+        # horizontal mirror after row `row_mirror`, the top rows are reflected onto the rows below
+        row_mirror = rng.randint(0, height // 2 - 1)
+        row_span = row_mirror + 1
+
+        rows = []
+        for _ in range(height):
+            left = [rng.choice("#.") for _ in range(span)]
+            free = [rng.choice("#.") for _ in range(width - 2 * span)]
+            rows.append(left + left[::-1] + free)
+
+        for offset in range(row_span):
+            rows[row_mirror + 1 + offset] = list(rows[row_mirror - offset])
+
+        # the smudge goes in a free column, so the vertical mirror stays perfect
+        smudge_row = row_mirror + 1 + rng.randrange(row_span)
+        smudge_column = rng.randrange(2 * span, width)
+        rows[smudge_row][smudge_column] = "#" if rows[smudge_row][smudge_column] == "." else "."
+
+        # random data can line up into extra (smudged) mirrors, which the solver rejects
+        columns = [list(column) for column in zip(*rows)]
+        if _mirror_differences(columns) != {mirror: 0} or _mirror_differences(rows) != {row_mirror: 1}:
+            continue
+
+        chunks.append(["".join(row) for row in rows])
+
+    return _join_chunks(chunks)
+
+
+def generate_day14(rng: random.Random, size: int) -> str:
+    return _join("".join(rng.choice("OO#......") for _ in range(size)) for _ in range(size))
+
+
+def generate_day15(rng: random.Random, size: int) -> str:
+    labels = _unique_names(rng, max(size // 4, 1), 4, string.ascii_lowercase)
+
+    steps = []
+    for _ in range(size):
+        label = rng.choice(labels)
+        steps.append(f"{label}-" if rng.random() < 0.3 else f"{label}={rng.randint(1, 9)}")
+
+    return ",".join(steps) + "\n"
+
+
+def generate_day16(rng: random.Random, size: int) -> str:
+    return _join("".join(rng.choice("|-/\\" + "." * 20) for _ in range(size)) for _ in range(size))
+
+
+def generate_day17(rng: random.Random, size: int) -> str:
+    return _join("".join(str(rng.randint(1, 9)) for _ in range(size)) for _ in range(size))
+
+
+def generate_day18(rng: random.Random, size: int) -> str:
+    """
+    A dig plan tracing a simple rectilinear loop. The hex colors encode the same loop scaled up, so part 2 traces a
+    valid (much larger) loop too."""
+    corners = _monotone_polygon(rng, max(size // 2, 2), max(size // 4, 2), scale=3)
+
+    # part 2 distances have to fit in the five hex digits of the color
+    longest = max(abs(x1 - x0) + abs(y1 - y0) for (x0, y0), (x1, y1) in zip(corners, corners[1:] + corners[:1]))
+    scale = rng.randint(1, max(0xfffff // longest, 1))
+
+    lines = []
+    for (x0, y0), (x1, y1) in zip(corners, corners[1:] + corners[:1]):
+        if x1 > x0:
+            direction, steps = "R", x1 - x0
+        elif x1 < x0:
+            direction, steps = "L", x0 - x1
+        elif y1 > y0:
+            direction, steps = "D", y1 - y0
+        else:
+            direction, steps = "U", y0 - y1
+
+        lines.append(f"{direction} {steps} (#{steps * scale:05x}{'RDLU'.index(direction)})")
+
+    return _join(lines)
+
+
+def generate_day19(rng: random.Random, size: int) -> str:
+    """
+    A tree of `size` workflows rooted at 'in', followed by `size` parts. Every rule splits the ratings that can still
+    reach it into two non-empty ranges, as in the real inputs."""
+    names = ["in"] + _unique_names(rng, size - 1, 3, string.ascii_lowercase)
+    targets = names[1:]
+
+    workflows = []
+    # inclusive rating bounds of the parts that reach each pending workflow
+    pending = [("in", {rating: (1, 4000) for rating in "xmas"})]
+    while pending:
+        name, bounds = pending.pop(0)
+        rules = []
+        for _ in range(rng.randint(1, 3)):
+            splittable = [rating for rating in "xmas" if bounds[rating][0] < bounds[rating][1]]
+            if not splittable:
+                break
+            rating = rng.choice(splittable)
+            low, high = bounds[rating]
+            if_bounds, else_bounds = dict(bounds), dict(bounds)
+            if rng.random() < 0.5:
+                amount = rng.randint(low, high - 1)
+                condition = ">"
+                if_bounds[rating], else_bounds[rating] = (amount + 1, high), (low, amount)
+            else:
+                amount = rng.randint(low + 1, high)
+                condition = "<"
+                if_bounds[rating], else_bounds[rating] = (low, amount - 1), (amount, high)
+
+            target = targets.pop(0) if targets and rng.random() < 0.7 else rng.choice("AR")
+            if target not in "AR":
+                pending.append((target, if_bounds))
+            rules.append(f"{rating}{condition}{amount}:{target}")
+            bounds = else_bounds
+
+        default = targets.pop(0) if targets else rng.choice("AR")
+        if default not in "AR":
+            pending.append((default, bounds))
+        workflows.append(f"{name}{{{','.join(rules + [default])}}}")
+
+    parts = [
+        "{" + ",".join(f"{rating}={rng.randint(1, 4000)}" for rating in "xmas") + "}" for _ in range(size)]
+
+    return _join_chunks([workflows, parts])
+
+
+def generate_day20(rng: random.Random, size: int) -> str:
+    """
+    The usual counter structure: the broadcaster feeds four chains of flip-flops (`size` in total), each counting up to
+    a random period. Every chain reports into a conjunction that resets it, and those feed through inverters into the
+    conjunction in front of rx."""
+    chains = 4
+    bits = max(size // chains, 2)
+    name_count = chains * (bits + 2) + 1
+    names = _unique_names(rng, name_count, 2 if name_count < 300 else 3, string.ascii_lowercase)
+
+    lines = []
+    heads = []
+    inverters = []
+    final = names.pop()
+    for _ in range(chains):
+        flip_flops = [names.pop() for _ in range(bits)]
+        counter, inverter = names.pop(), names.pop()
+        heads.append(flip_flops[0])
+        inverters.append(inverter)
+
+        # highest bit always set so the period really needs all the bits
+        period = rng.randrange(1 << (bits - 1), 1 << bits) | 1
+        counter_inputs = [ff for bit, ff in enumerate(flip_flops) if period & (1 << bit)]
+
+        for bit, ff in enumerate(flip_flops):
+            destinations = [flip_flops[bit + 1]] if bit + 1 < bits else []
+            if ff in counter_inputs:
+                destinations.append(counter)
+            lines.append(f"%{ff} -> {', '.join(destinations)}")
+
+        resets = [ff for ff in flip_flops if ff not in counter_inputs] + [flip_flops[0]]
+        lines.append(f"&{counter} -> {', '.join(resets + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+
+    lines.append(f"&{final} -> rx")
+    lines.append(f"broadcaster -> {', '.join(heads)}")
+
+    rng.shuffle(lines)
+    return _join(lines)
+
+
+def generate_day21(rng: random.Random, size: int) -> str:
+    """
+    A square garden with S in the middle, and the border and middle row/column clear of rocks. The side is 131 or 393,
+    the only sizes for which part 2's step count lands on the edge of a garden (see day21.count_from_stencil)."""
+    if size not in (131, 393):
+        raise ValueError(f"Day 21 gardens are 131 or 393 wide, not {size}")
+
+    middle = size // 2
+
+    rows = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            if x == middle and y == middle:
+                row.append("S")
+            elif x in (0, middle, size - 1) or y in (0, middle, size - 1):
+                row.append(".")
+            else:
+                row.append("#" if rng.random() < 0.1 else ".")
+        rows.append("".join(row))
+
+    return _join(rows)
+
+
+def generate_day22(rng: random.Random, size: int) -> str:
+    lines = []
+    for _ in range(size):
+        x, y, z = rng.randint(0, 9), rng.randint(0, 9), rng.randint(1, size)
+        length = rng.randint(0, 4)
+        axis = rng.randrange(3)
+        end = [x, y, z]
+        end[axis] += length
+        end[0], end[1] = min(end[0], 9), min(end[1], 9)
+        lines.append(f"{x},{y},{z}~{end[0]},{end[1]},{end[2]}")
+
+    return _join(lines)
+
+
+def generate_day24(rng: random.Random, size: int) -> str:
+    """
+    Hailstones that a single thrown rock hits, each at a distinct time. The rock starts in the middle of part 1's test
+    area and the hits are close to it, so most paths cross inside the area."""
+    rock_position = tuple(rng.randint(250_000_000_000_000, 350_000_000_000_000) for _ in range(3))
+    rock_velocity = tuple(rng.randint(-300, 300) for _ in range(3))
+
+    lines = []
+    for time in rng.sample(range(1, 100_000_000_000), size):
+        velocity = tuple(rng.randint(-300, 300) for _ in range(3))
+        # rock_position + time * rock_velocity == position + time * velocity
+        position = plus3(rock_position, times3(minus3(rock_velocity, velocity), time))
+        lines.append(f"{', '.join(str(p) for p in position)} @ {', '.join(str(v) for v in velocity)}")
+
+    return _join(lines)
+
+
+def generate_day25(rng: random.Random, size: int) -> str:
+    """
+    Two densely connected halves of `size` components, joined by exactly three wires."""
+    names = _unique_names(rng, max(size, 8), 3, string.ascii_lowercase)
+    halves = [names[:len(names) // 2], names[len(names) // 2:]]
+
+    edges: Set[Tuple[str, str]] = set()
+    for half in halves:
+        for idx, name in enumerate(half[1:], start=1):
+            # a random tree keeps the half connected, extra edges make a three-edge cut impossible inside it
+            edges.add(tuple(sorted((name, half[rng.randrange(idx)]))))
+        for _ in range(len(half) * 3):
+            left, right = rng.sample(half, 2)
+            edges.add(tuple(sorted((left, right))))
+
+    for left, right in zip(rng.sample(halves[0], 3), rng.sample(halves[1], 3)):
+        edges.add((left, right))
+
+    connections: Dict[str, List[str]] = {}
+    for left, right in edges:
+        connections.setdefault(left, []).append(right)
+
+    return _join(f"{src}: {' '.join(dsts)}" for src, dsts in connections.items())
+
+
+GENERATORS: Dict[int, Callable[[random.Random, int], str]] = {
+    1: generate_day1,
+    2: generate_day2,
+    3: generate_day3,
+    4: generate_day4,
+    5: generate_day5,
+    6: generate_day6,
+    7: generate_day7,
+    8: generate_day8,
+    9: generate_day9,
+    10: generate_day10,
+    11: generate_day11,
+    12: generate_day12,
+    13: generate_day13,
+    14: generate_day14,
+    15: generate_day15,
+    16: generate_day16,
+    17: generate_day17,
+    18: generate_day18,
+    19: generate_day19,
+    20: generate_day20,
+    21: generate_day21,
+    22: generate_day22,
+    24: generate_day24,
+    25: generate_day25,
+}
+
+
+def _monotone_polygon(rng: random.Random, columns: int, height: int, scale: int) -> List[Vec2]:
+    """
+    Returns the corners, in clockwise order, of a random vertically convex polyomino whose consecutive columns always
+    overlap. Its boundary is a simple loop, and after scaling by at least 2 no two parts of it touch."""
+    intervals = []
+    top, bottom = height // 3, 2 * height // 3
+    for _ in range(columns):
+        next_top = rng.randint(0, bottom)
+        next_bottom = rng.randint(max(next_top, top), height - 1)
+        top, bottom = next_top, next_bottom
+        intervals.append((top, bottom))
+
+    corners: List[Vec2] = []
+    # top edge, left to right
+    for x, (top, _) in enumerate(intervals):
+        corners += [(x, top), (x + 1, top)]
+    # bottom edge, right to left
+    for x, (_, bottom) in reversed(list(enumerate(intervals))):
+        corners += [(x + 1, bottom + 1), (x, bottom + 1)]
+
+    # drop repeated and collinear corners
+    result: List[Vec2] = []
+    for corner in corners:
+        if result and result[-1] == corner:
+            continue
+        result.append(corner)
+    if result[0] == result[-1]:
+        result.pop()
+
+    simplified = []
+    for idx, corner in enumerate(result):
+        before, after = result[idx - 1], result[(idx + 1) % len(result)]
+        if (before[0] == corner[0] == after[0]) or (before[1] == corner[1] == after[1]):
+            continue
+        simplified.append(corner)
+
+    return [(x * scale, y * scale) for x, y in simplified]
+
+
+def _trace(corners: List[Vec2]) -> List[Vec2]:
+    """
+    Returns every grid cell on the closed rectilinear path through the given corners, in order."""
+    result = []
+    for (x0, y0), (x1, y1) in zip(corners, corners[1:] + corners[:1]):
+        dx = (x1 > x0) - (x1 < x0)
+        dy = (y1 > y0) - (y1 < y0)
+        x, y = x0, y0
+        while (x, y) != (x1, y1):
+            result.append((x, y))
+            x, y = x + dx, y + dy
+
+    return result
+
+
+def _pipe(before: Vec2, cell: Vec2, after: Vec2) -> str:
+    """
+    Returns the pipe at `cell` that connects its two neighbors on the loop."""
+    sides = set()
+    for neighbor in [before, after]:
+        offset = (neighbor[0] - cell[0], neighbor[1] - cell[1])
+        sides.add({(1, 0): "right", (-1, 0): "left", (0, 1): "down", (0, -1): "up"}[offset])
+
+    return {
+        frozenset(["left", "right"]): "-",
+        frozenset(["up", "down"]): "|",
+        frozenset(["right", "down"]): "F",
+        frozenset(["right", "up"]): "L",
+        frozenset(["left", "up"]): "J",
+        frozenset(["left", "down"]): "7",
+    }[frozenset(sides)]
+
+
+def _mirror_differences(rows: List[List[str]]) -> Dict[int, int]:
+    """
+    Returns, for every horizontal mirror line with at most one mismatching cell, the number of mismatches. Line i sits
+    between rows i and i + 1."""
+    result = {}
+    for line in range(len(rows) - 1):
+        differences = 0
+        for offset in range(min(line + 1, len(rows) - line - 1)):
+            top, bottom = rows[line - offset], rows[line + 1 + offset]
+            differences += sum(1 for a, b in zip(top, bottom) if a != b)
+
+        if differences <= 1:
+            result[line] = differences
+
+    return result
+
+
+def _unique_names(
+        rng: random.Random,
+        count: int,
+        length: int,
+        alphabet: str,
+        forbidden_last: str = "") -> List[str]:
+    if count > (len(alphabet) ** (length - 1)) * (len(alphabet) - len(forbidden_last)) // 2:
+        raise ValueError(f"Can't pick {count} names of length {length}")
+
+    names: Set[str] = set()
+    while len(names) < count:
+        name = "".join(rng.choice(alphabet) for _ in range(length))
+        if name[-1] not in forbidden_last and name not in ["in", "rx"]:
+            names.add(name)
+
+    result = sorted(names)
+    rng.shuffle(result)
+    return result
+
+
+def _numbers(values: List[int]) -> str:
+    return " ".join(str(v) for v in values)
+
+
+def _join(lines) -> str:
+    return "\n".join(lines) + "\n"
+
+
+def _join_chunks(chunks: List[List[str]]) -> str:
+    return "\n\n".join("\n".join(chunk) for chunk in chunks) + "\n"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("day", type=int)
+    parser.add_argument("--size", type=int, default=100, help="what it means depends on the day; 131 or 393 for day 21")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--option", action="append", default=[], help="extra generator option, as name=value")
+    args = parser.parse_args()
+
+    options = {name: int(value) for name, value in (option.split("=") for option in args.option)}
+    print(generate(args.day, args.size, args.seed, **options), end="")
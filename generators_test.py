@@ -0,0 +1,51 @@
+import importlib
+import unittest
+from collections.abc import Iterator
+
+import caches
+import disk_cache
+from generators import GENERATORS, generate
+
+
+def _size(day: int) -> int:
+    return 131 if day == 21 else 20
+
+
+class TestGenerators(unittest.TestCase):
+    def test_deterministic_for_a_seed(self):
+        for day in GENERATORS:
+            with self.subTest(day=day):
+                self.assertEqual(generate(day, _size(day), seed=1), generate(day, _size(day), seed=1))
+                self.assertNotEqual(generate(day, _size(day), seed=1), generate(day, _size(day), seed=2))
+
+    def test_parses(self):
+        for day in GENERATORS:
+            with self.subTest(day=day):
+                parsed = importlib.import_module(f"day{day}").parse(generate(day, _size(day), seed=1))
+                if isinstance(parsed, Iterator):
+                    parsed = list(parsed)
+                self.assertTrue(parsed)
+
+    def test_solves(self):
+        # answers of random inputs aren't worth keeping
+        was_enabled, disk_cache.ENABLED = disk_cache.ENABLED, False
+        self.addCleanup(setattr, disk_cache, "ENABLED", was_enabled)
+
+        for day in GENERATORS:
+            module = importlib.import_module(f"day{day}")
+            input = generate(day, _size(day), seed=1)
+            for part in [1, 2]:
+                if not hasattr(module, f"part{part}"):
+                    continue
+                # as the runner does, so that the memos of one day don't outlive it
+                with self.subTest(day=day, part=part), caches.scope():
+                    self.assertIsNotNone(module.solve(part, input))
+
+    def test_day21_sizes(self):
+        self.assertEqual(len(generate(21, 393).splitlines()), 393)
+        with self.assertRaises(ValueError):
+            generate(21, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 from dataclasses import dataclass
-from typing import Dict, Set, Tuple, List
+from typing import Callable, Dict, Set, Tuple, List, Optional
 import heapq
 
+import instrumentation
+from instrumentation import instrumented
+
+INSTRUMENTED = instrumentation.ENABLED
+
 
 @dataclass(frozen=True)
 class Edge:
@@ -12,22 +17,127 @@ class Edge:
 Graph = Dict[str, Set[Edge]]
 
 
+class LazyGraph(dict):
+    """
+    A Graph whose edges are computed the first time they're asked for, so that a search that stops early never builds
+    the nodes it didn't reach."""
+
+    def __init__(self, neighbors: Callable[[str], Set[Edge]]):
+        super().__init__()
+        self.neighbors = neighbors
+
+    def get(self, node: str, default: Optional[Set[Edge]] = None) -> Set[Edge]:
+        edges = dict.get(self, node)
+        if edges is None:
+            edges = self[node] = self.neighbors(node)
+        return edges
+
+
+@dataclass
+class ShortestPaths:
+    """
+    The cost of the cheapest path from the starting point to every reachable node (every settled one, for a_star), and
+    the node before each on that path. Paths are only built when asked for."""
+    starting_point: str
+    costs: Dict[str, int]
+    parents: Dict[str, str]
+    # the goal a_star stopped at
+    goal: Optional[str] = None
+
+    def path(self, node: str) -> List[str]:
+        """
+        Returns the nodes after the starting point up to and including the given one, like dijkstra's paths."""
+        path = []
+        while node != self.starting_point:
+            path.append(node)
+            node = self.parents[node]
+        path.reverse()
+        return path
+
+
+@instrumented
 def dijkstra(starting_point: str, graph: Graph) -> Dict[str, Tuple[int, List[str]]]:
-    result = {}
+    # not through dijkstra_paths, which would count the call a second time
+    parents: Dict[str, str] = {}
+    paths = ShortestPaths(starting_point, _search(starting_point, graph, parents), parents)
+    return {node: (cost, paths.path(node)) for node, cost in paths.costs.items()}
+
+
+@instrumented
+def dijkstra_paths(starting_point: str, graph: Graph) -> ShortestPaths:
+    parents: Dict[str, str] = {}
+    costs = _search(starting_point, graph, parents)
+    return ShortestPaths(starting_point, costs, parents)
+
+
+@instrumented
+def dijkstra_costs(starting_point: str, graph: Graph) -> Dict[str, int]:
+    return _search(starting_point, graph, None)
+
+
+def _search(starting_point: str, graph: Graph, parents: Optional[Dict[str, str]]) -> Dict[str, int]:
+    costs = {}
+
+    # the starting point is its own parent, which ends the walk back in ShortestPaths.path
+    heap = [(0, starting_point, starting_point)]
+    while len(heap) != 0:
+        best_cost, node, parent = heapq.heappop(heap)
+
+        if node in costs:
+            # already processed
+            continue
+
+        costs[node] = best_cost
+        if parents is not None:
+            parents[node] = parent
+
+        for neighbor in graph.get(node, set()):
+            next_node = neighbor.next_node_id
+            if next_node in costs:
+                continue
+            heapq.heappush(heap, (best_cost + neighbor.cost, next_node, node))
+            if INSTRUMENTED:
+                instrumentation.count("graphs.dijkstra.heap_push")
+
+    return costs
+
+
+@instrumented
+def a_star(starting_point: str, graph: Graph, is_goal: Callable[[str], bool],
+           heuristic: Optional[Callable[[str], int]] = None) -> Optional[ShortestPaths]:
+    """
+    Searches for the cheapest path to a node for which is_goal is true, stopping as soon as one is settled. Returns
+    the paths found so far, with that node as their goal, or None if no goal is reachable.
+
+    The heuristic estimates the cost from a node to the nearest goal. It has to be consistent (never more than the
+    cost of an edge plus its own estimate at the other end, and 0 at the goals), e.g. the Manhattan distance times the
+    cheapest step on a grid; otherwise the answer may not be the cheapest. Without one, this is Dijkstra with early
+    termination."""
+    costs: Dict[str, int] = {}
+    parents: Dict[str, str] = {}
 
-    heap = [(0, starting_point, [])]
+    # estimated total cost first, then the cost so far
+    heap = [(heuristic(starting_point) if heuristic else 0, 0, starting_point, starting_point)]
     while len(heap) != 0:
-        best_cost, node, path = heapq.heappop(heap)
+        _, best_cost, node, parent = heapq.heappop(heap)
 
-        if node in result:
+        if node in costs:
             # already processed
             continue
 
-        result[node] = (best_cost, path)
+        costs[node] = best_cost
+        parents[node] = parent
+        if is_goal(node):
+            return ShortestPaths(starting_point, costs, parents, goal=node)
 
         for neighbor in graph.get(node, set()):
             next_node = neighbor.next_node_id
+            if next_node in costs:
+                continue
             next_cost = best_cost + neighbor.cost
-            heapq.heappush(heap, (next_cost, next_node, path + [next_node]))
+            estimate = next_cost + heuristic(next_node) if heuristic else next_cost
+            heapq.heappush(heap, (estimate, next_cost, next_node, node))
+            if INSTRUMENTED:
+                instrumentation.count("graphs.a_star.heap_push")
 
-    return result
+    return None
@@ -0,0 +1,114 @@
+import importlib
+import unittest
+
+import graphs
+import instrumentation
+from graphs import Edge, LazyGraph, a_star, dijkstra, dijkstra_costs, dijkstra_paths
+
+GRAPH = {
+    "a": {Edge("b", 1), Edge("c", 4)},
+    "b": {Edge("c", 2), Edge("d", 6)},
+    "c": {Edge("d", 3), Edge("a", 1)},
+    "d": set(),
+    "e": {Edge("a", 1)},
+}
+
+
+class TestDijkstra(unittest.TestCase):
+    def test_dijkstra(self):
+        self.assertEqual(dijkstra("a", GRAPH), {
+            "a": (0, []),
+            "b": (1, ["b"]),
+            "c": (3, ["b", "c"]),
+            "d": (6, ["b", "c", "d"]),
+        })
+
+    def test_counted_once(self):
+        was_enabled = instrumentation.ENABLED
+        instrumentation.enable()
+        try:
+            # decorated again, now that instrumentation is on
+            instrumented_graphs = importlib.reload(graphs)
+            instrumentation.reset()
+            instrumented_graphs.dijkstra("a", GRAPH)
+            self.assertEqual(
+                {name: timer["calls"] for name, timer in instrumentation.metrics()["timers"].items()},
+                {"graphs.dijkstra": 1})
+        finally:
+            instrumentation.ENABLED = was_enabled
+            importlib.reload(graphs)
+            instrumentation.reset()
+
+    def test_paths_are_built_on_demand(self):
+        paths = dijkstra_paths("a", GRAPH)
+
+        self.assertEqual(paths.costs, {"a": 0, "b": 1, "c": 3, "d": 6})
+        self.assertEqual(paths.parents, {"a": "a", "b": "a", "c": "b", "d": "c"})
+        self.assertEqual(paths.path("d"), ["b", "c", "d"])
+        self.assertEqual(paths.path("a"), [])
+
+    def test_costs_only(self):
+        self.assertEqual(dijkstra_costs("a", GRAPH), {"a": 0, "b": 1, "c": 3, "d": 6})
+        self.assertEqual(dijkstra_costs("d", GRAPH), {"d": 0})
+
+    def test_matches_a_grid_search(self):
+        # a long path, where copying it on every push used to be quadratic
+        size = 200
+        graph = {
+            f"{x},{y}": {Edge(f"{x + dx},{y + dy}", (x * 7 + y * 13) % 9 + 1)
+                         for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)]
+                         if 0 <= x + dx < size and 0 <= y + dy < size}
+            for x in range(size) for y in range(size)}
+
+        paths = dijkstra_paths("0,0", graph)
+        end = f"{size - 1},{size - 1}"
+        path = paths.path(end)
+        self.assertEqual(path[-1], end)
+        self.assertEqual(dijkstra_costs("0,0", graph), paths.costs)
+
+        # the path's edges add up to its cost
+        cost, node = 0, "0,0"
+        for next_node in path:
+            cost += next(edge.cost for edge in graph[node] if edge.next_node_id == next_node)
+            node = next_node
+        self.assertEqual(cost, paths.costs[end])
+
+
+class TestAStar(unittest.TestCase):
+    def test_stops_at_the_first_goal(self):
+        paths = a_star("a", GRAPH, is_goal=lambda node: node == "c")
+
+        self.assertEqual(paths.goal, "c")
+        self.assertEqual(paths.costs["c"], 3)
+        self.assertEqual(paths.path("c"), ["b", "c"])
+        self.assertNotIn("d", paths.costs)
+
+    def test_unreachable_goal(self):
+        self.assertIsNone(a_star("a", GRAPH, is_goal=lambda node: node == "e"))
+
+    def test_heuristic_explores_less(self):
+        size = 50
+        goal = f"{size - 1},{size - 1}"
+
+        def neighbors(node):
+            x, y = map(int, node.split(","))
+            return {Edge(f"{x + dx},{y + dy}", (x * 7 + y * 13) % 9 + 1)
+                    for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)]
+                    if 0 <= x + dx < size and 0 <= y + dy < size}
+
+        def manhattan(node):
+            x, y = map(int, node.split(","))
+            return 2 * size - 2 - x - y
+
+        searched = LazyGraph(neighbors)
+        guided = LazyGraph(neighbors)
+        plain = a_star("0,0", searched, is_goal=lambda node: node == goal)
+        directed = a_star("0,0", guided, is_goal=lambda node: node == goal, heuristic=manhattan)
+
+        self.assertEqual(directed.costs[goal], dijkstra_costs("0,0", LazyGraph(neighbors))[goal])
+        self.assertEqual(plain.costs[goal], directed.costs[goal])
+        self.assertLess(len(guided), len(searched))
+
+
+if __name__ == '__main__':
+    unittest.main()
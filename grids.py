@@ -0,0 +1,64 @@
+import functools
+from typing import Callable, Iterable, Optional, TypeVar
+
+from caches import memoize
+
+T = TypeVar('T')
+
+
+class Grid(tuple):
+    """
+    The rows of a grid, as a tuple of strings that hashes its content only once.
+
+    Memoizing on a plain tuple of rows hashes the whole grid on every call just to build the key. A Grid remembers its
+    hash, and comparing it to itself is a pointer check, so looking up a memo entry of the same grid costs the same
+    however big it is. Slicing gives back plain tuples."""
+
+    def __new__(cls, rows: Iterable[str]) -> 'Grid':
+        grid = super().__new__(cls, rows)
+        grid._hash = tuple.__hash__(grid)
+        return grid
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        return self is other or tuple.__eq__(self, other)
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    def __reduce__(self):
+        # string hashes differ between processes, so the hash is computed again rather than unpickled
+        return Grid, (tuple(self),)
+
+    @property
+    def width(self) -> int:
+        return len(self[0]) if self else 0
+
+    @property
+    def height(self) -> int:
+        return len(self)
+
+
+def grid_memoize(function: Optional[Callable[..., T]] = None, *, name: Optional[str] = None,
+                 max_bytes: Optional[int] = None) -> Callable[..., T]:
+    """
+    caches.memoize for functions whose first argument is a Grid. Raises TypeError for a plain tuple of rows, which
+    would still work but hash the whole grid on every call."""
+    if function is None:
+        return functools.partial(grid_memoize, name=name, max_bytes=max_bytes)
+
+    memoized = memoize(function, name=name or f"{function.__module__}.{function.__qualname__}", max_bytes=max_bytes)
+
+    @functools.wraps(function)
+    def wrapper(grid: Grid, *args, **kwargs):
+        if type(grid) is not Grid:
+            raise TypeError(f"{function.__qualname__} takes a Grid, got {type(grid).__name__}")
+
+        return memoized(grid, *args, **kwargs)
+
+    wrapper.cache = memoized.cache
+    wrapper.cache_info = memoized.cache_info
+    wrapper.cache_clear = memoized.cache_clear
+    return wrapper
@@ -0,0 +1,30 @@
+import pickle
+import unittest
+
+from grids import Grid, grid_memoize
+
+
+class TestGrids(unittest.TestCase):
+    def test_grid_is_its_rows(self):
+        grid = Grid(["ab", "cd", "ef"])
+
+        self.assertEqual(grid, ("ab", "cd", "ef"))
+        self.assertEqual(hash(grid), hash(("ab", "cd", "ef")))
+        self.assertEqual((grid.width, grid.height), (2, 3))
+        self.assertEqual(pickle.loads(pickle.dumps(grid)), grid)
+
+    def test_grid_memoize(self):
+        calls = []
+
+        @grid_memoize(name="test.count")
+        def count(grid: Grid, char: str) -> int:
+            calls.append(char)
+            return sum(row.count(char) for row in grid)
+
+        grid = Grid(["#.#", "..#"])
+        self.assertEqual([count(grid, "#"), count(grid, "#"), count(Grid(grid), "#"), count(grid, ".")], [3, 3, 3, 3])
+        self.assertEqual(calls, ["#", "."])
+
+        with self.assertRaises(TypeError):
+            count(("#.#", "..#"), "#")
+        count.cache_clear()
@@ -0,0 +1,211 @@
+import fcntl
+import hashlib
+import json
+import os
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+
+# Target uncompressed size of a block. Blocks always hold whole lines, and a new block is started at every chunk.
+BLOCK_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class Block:
+    compressed_offset: int
+    compressed_size: int
+    first_line: int
+    line_count: int
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """
+    Where an input lives in the cache: the digest of its contents (which names the object file), its compressed
+    blocks, and for every chunk the (first block, first line, line count) triple."""
+    digest: str
+    line_count: int
+    blocks: List[Block]
+    chunks: List[Tuple[int, int, int]]
+
+    @staticmethod
+    def from_json(value: Dict) -> 'IndexEntry':
+        return IndexEntry(
+            digest=value["digest"],
+            line_count=value["line_count"],
+            blocks=[Block(*block) for block in value["blocks"]],
+            chunks=[tuple(chunk) for chunk in value["chunks"]])
+
+    def to_json(self) -> Dict:
+        return {
+            "digest": self.digest,
+            "line_count": self.line_count,
+            "blocks": [[b.compressed_offset, b.compressed_size, b.first_line, b.line_count] for b in self.blocks],
+            "chunks": [list(chunk) for chunk in self.chunks],
+        }
+
+
+class InputCache:
+    """
+    Content-addressed, compressed store for puzzle inputs, meant to be shared between checkouts and workers.
+
+    Layout under the root directory:
+        objects/<digest>.z  the input, as a sequence of independently zlib-compressed blocks
+        index.json          (year, day) -> IndexEntry
+
+    Since every block is compressed on its own, a reader can seek straight to the blocks of one chunk without
+    decompressing anything before it. Objects are named by content so concurrent writers can't clash, and the index is
+    updated under a file lock."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+
+    def has(self, year: int, day: int) -> bool:
+        return _key(year, day) in self._load_index()
+
+    def entry(self, year: int, day: int) -> IndexEntry:
+        return IndexEntry.from_json(self._load_index()[_key(year, day)])
+
+    def put(self, year: int, day: int, text: str) -> IndexEntry:
+        """
+        Stores the input for the given day, returning its index entry."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        blocks: List[Block] = []
+        chunks: List[Tuple[int, int, int]] = []
+        compressed: List[bytes] = []
+        offset = 0
+
+        lines = data.split(b"\n")
+        if lines[-1] == b"":
+            lines = lines[:-1]
+        # so that the object holds exactly the input, and its digest
+        final_newline = data.endswith(b"\n")
+
+        def flush(first_line: int, block_lines: List[bytes]):
+            nonlocal offset
+            block_data = b"".join(line + b"\n" for line in block_lines)
+            if not final_newline and first_line + len(block_lines) == len(lines):
+                block_data = block_data[:-1]
+            block_data = zlib.compress(block_data)
+            blocks.append(Block(offset, len(block_data), first_line, len(block_lines)))
+            compressed.append(block_data)
+            offset += len(block_data)
+
+        chunk_start = 0
+        block_start = 0
+        block_lines: List[bytes] = []
+        block_size = 0
+        chunks.append((0, 0, 0))
+        for idx, line in enumerate(lines):
+            block_lines.append(line)
+            block_size += len(line) + 1
+
+            if line == b"":
+                # chunk boundary, the next chunk starts in a fresh block
+                flush(block_start, block_lines)
+                chunks[-1] = (chunks[-1][0], chunk_start, idx - chunk_start)
+                chunk_start = idx + 1
+                block_start, block_lines, block_size = idx + 1, [], 0
+                chunks.append((len(blocks), chunk_start, 0))
+            elif block_size >= BLOCK_SIZE:
+                flush(block_start, block_lines)
+                block_start, block_lines, block_size = idx + 1, [], 0
+
+        if block_lines:
+            flush(block_start, block_lines)
+
+        if chunk_start != len(lines):
+            chunks[-1] = (chunks[-1][0], chunk_start, len(lines) - chunk_start)
+        else:
+            chunks.pop()
+
+        object_filename = self._object_filename(digest)
+        if not os.path.exists(object_filename):
+            temp_filename = f"{object_filename}.{os.getpid()}.tmp"
+            with open(temp_filename, "wb") as f:
+                for block_data in compressed:
+                    f.write(block_data)
+            os.replace(temp_filename, object_filename)
+
+        entry = IndexEntry(digest=digest, line_count=len(lines), blocks=blocks, chunks=chunks)
+        with self._locked_index() as index:
+            index[_key(year, day)] = entry.to_json()
+
+        return entry
+
+    def read(self, year: int, day: int) -> bytes:
+        """
+        Returns the whole decompressed input."""
+        return b"".join(self._iter_blocks(self.entry(year, day), 0))
+
+    def iter_lines(self, year: int, day: int) -> Iterator[str]:
+        """
+        Yields the input's lines, decompressing one block at a time."""
+        for block_data in self._iter_blocks(self.entry(year, day), 0):
+            for line in _split_lines(block_data):
+                yield line
+
+    def chunk_count(self, year: int, day: int) -> int:
+        return len(self.entry(year, day).chunks)
+
+    def read_chunk(self, year: int, day: int, idx: int) -> List[str]:
+        """
+        Returns the lines of a single chunk, only decompressing the blocks that hold it."""
+        entry = self.entry(year, day)
+        first_block, first_line, line_count = entry.chunks[idx]
+
+        result: List[str] = []
+        for block_data in self._iter_blocks(entry, first_block):
+            result += _split_lines(block_data)
+            if len(result) >= line_count:
+                break
+
+        return result[:line_count]
+
+    def _iter_blocks(self, entry: IndexEntry, first_block: int) -> Iterator[bytes]:
+        with open(self._object_filename(entry.digest), "rb") as f:
+            for block in entry.blocks[first_block:]:
+                f.seek(block.compressed_offset)
+                yield zlib.decompress(f.read(block.compressed_size))
+
+    def _object_filename(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", f"{digest}.z")
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.root, "index.json"), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @contextmanager
+    def _locked_index(self):
+        """
+        Yields the index for modification while holding an exclusive lock, then writes it back."""
+        with open(os.path.join(self.root, "index.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            index = self._load_index()
+            yield index
+
+            index_filename = os.path.join(self.root, "index.json")
+            temp_filename = f"{index_filename}.{os.getpid()}.tmp"
+            with open(temp_filename, "w") as f:
+                json.dump(index, f, sort_keys=True)
+            os.replace(temp_filename, index_filename)
+
+
+def _key(year: int, day: int) -> str:
+    return f"{year}-{day}"
+
+
+def _split_lines(block_data: bytes) -> List[str]:
+    # every line ends in a newline, but the input's last one may not
+    lines = block_data.decode("utf-8").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+
+    return lines
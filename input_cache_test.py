@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+
+import input_cache
+from input_cache import InputCache
+from input_store import InputStore
+
+
+class TestInputCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = InputCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        self.assertFalse(self.cache.has(2023, 1))
+        self.cache.put(2023, 1, "ab\ncd\n")
+        self.assertTrue(self.cache.has(2023, 1))
+        self.assertEqual(self.cache.read(2023, 1), b"ab\ncd\n")
+        self.assertEqual(list(self.cache.iter_lines(2023, 1)), ["ab", "cd"])
+
+    def test_roundtrip_without_final_newline(self):
+        entry = self.cache.put(2023, 1, "ab\n\ncd")
+        self.assertEqual(self.cache.read(2023, 1), b"ab\n\ncd")
+        self.assertEqual(entry.digest, InputStore.from_bytes(b"ab\n\ncd").digest())
+        self.assertEqual(list(self.cache.iter_lines(2023, 1)), ["ab", "", "cd"])
+        self.assertEqual(self.cache.read_chunk(2023, 1, 1), ["cd"])
+
+    def test_chunks(self):
+        self.cache.put(2023, 5, "a\nb\n\nc\n\n\nd\n")
+        self.assertEqual(self.cache.chunk_count(2023, 5), 4)
+        self.assertEqual(self.cache.read_chunk(2023, 5, 0), ["a", "b"])
+        self.assertEqual(self.cache.read_chunk(2023, 5, 1), ["c"])
+        self.assertEqual(self.cache.read_chunk(2023, 5, 2), [])
+        self.assertEqual(self.cache.read_chunk(2023, 5, 3), ["d"])
+
+    def test_chunks_spanning_blocks(self):
+        old_block_size = input_cache.BLOCK_SIZE
+        input_cache.BLOCK_SIZE = 4
+        try:
+            entry = self.cache.put(2023, 13, "aaa\nbbb\nccc\n\nddd\neee\n")
+        finally:
+            input_cache.BLOCK_SIZE = old_block_size
+
+        self.assertGreater(len(entry.blocks), 2)
+        self.assertEqual(self.cache.read_chunk(2023, 13, 0), ["aaa", "bbb", "ccc"])
+        self.assertEqual(self.cache.read_chunk(2023, 13, 1), ["ddd", "eee"])
+
+    def test_content_addressed(self):
+        first = self.cache.put(2023, 1, "same\n")
+        second = self.cache.put(2022, 1, "same\n")
+        self.assertEqual(first.digest, second.digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
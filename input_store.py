@@ -0,0 +1,168 @@
+import hashlib
+import mmap
+import os
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple, Union
+
+NEWLINE = ord("\n")
+
+
+class InputStore:
+    """
+    Read-only, zero-copy view over a cached puzzle input file.
+
+    The file is memory-mapped once, and a line-offset index is computed up front. Lines and chunks are handed out as
+    slices of the mapping, so every consumer of the same input shares a single copy of the data."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap refuses to map empty files
+                self._set_buffer(b"")
+            else:
+                self._set_buffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'InputStore':
+        """
+        Returns a store over an in-memory buffer, for inputs that don't live in a plain file (e.g. compressed ones)."""
+        store = cls.__new__(cls)
+        store.filename = None
+        store._set_buffer(data)
+        return store
+
+    def _set_buffer(self, buffer: Union[mmap.mmap, bytes]):
+        self._buffer = buffer
+        self._view = memoryview(self._buffer)
+        self._line_starts = _index_lines(self._buffer)
+        self._digest: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._line_starts) - 1
+
+    def line_bytes(self, idx: int) -> memoryview:
+        """
+        Returns the raw bytes of the given line (without the trailing newline) as a view into the mapping."""
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+
+        return self._view[self._line_starts[idx]:self._line_starts[idx + 1] - 1]
+
+    def line(self, idx: int) -> str:
+        """
+        Returns the given line, decoded."""
+        return str(self.line_bytes(idx), "utf-8")
+
+    def iter_lines(self, start: int = 0, end: int = -1) -> Iterator[str]:
+        """
+        Yields decoded lines in [start, end), one at a time. end defaults to the last line."""
+        if end == -1:
+            end = len(self)
+
+        starts = self._line_starts
+        view = self._view
+        for idx in range(start, end):
+            yield str(view[starts[idx]:starts[idx + 1] - 1], "utf-8")
+
+    def lines(self) -> List[str]:
+        return list(self.iter_lines())
+
+    def chunks(self, lazy: bool = False) -> Union[List[List[str]], List['Chunk']]:
+        """
+        Returns the chunks of the input, where chunks are separated by empty lines.
+
+        Chunk boundaries are found in a single pass over the raw buffer, looking for blank lines directly rather than
+        splitting everything into lines first. Each chunk is only split into lines when it's consumed; with lazy set,
+        the Chunk objects (which only hold byte offsets) are returned as is."""
+        result = [Chunk(self._view, start, end) for start, end in self._chunk_spans()]
+        if lazy:
+            return result
+
+        return [chunk.lines() for chunk in result]
+
+    def _chunk_spans(self) -> List[Tuple[int, int]]:
+        """
+        Returns the [start, end) byte span of every chunk, excluding the newline that ends its last line."""
+        buffer = self._buffer
+        end = len(buffer)
+        content_end = end - 1 if end > 0 and buffer[end - 1] == NEWLINE else end
+
+        result = []
+        position = 0
+        while position < end:
+            if buffer[position] == NEWLINE:
+                # an empty line right where a chunk should start, so this chunk is empty
+                result.append((position, position))
+                position += 1
+                continue
+
+            separator = buffer.find(b"\n\n", position)
+            if separator == -1 or separator >= content_end:
+                result.append((position, content_end))
+                break
+
+            result.append((position, separator))
+            position = separator + 2
+
+        return result
+
+    def digest(self) -> str:
+        """
+        Returns the sha256 hex digest of the whole input."""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._view).hexdigest()
+
+        return self._digest
+
+    def text(self) -> str:
+        """
+        Returns the whole input, decoded. This makes a full copy, so prefer the line/chunk accessors."""
+        return str(self._view, "utf-8")
+
+    def close(self):
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """
+    A chunk of an InputStore, held as byte offsets into the store's buffer. Only decoded when asked for its lines."""
+    view: memoryview
+    start: int
+    end: int
+
+    def lines(self) -> List[str]:
+        if self.start == self.end:
+            return []
+
+        return str(self.view[self.start:self.end], "utf-8").split("\n")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.lines())
+
+
+def _index_lines(buffer: Union[mmap.mmap, bytes]) -> array:
+    """
+    Returns the start offset of every line in the buffer, plus a sentinel one past the end of the last line (so line
+    i always spans starts[i] to starts[i + 1] - 1)."""
+    starts = array("q", [0])
+    if len(buffer) == 0:
+        return starts
+
+    position = buffer.find(b"\n")
+    while position != -1:
+        starts.append(position + 1)
+        position = buffer.find(b"\n", position + 1)
+
+    if starts[-1] != len(buffer):
+        # no trailing newline, pretend there was one
+        starts.append(len(buffer) + 1)
+
+    return starts
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from input_store import InputStore
+
+
+class TestInputStore(unittest.TestCase):
+    def store_for(self, text: str) -> InputStore:
+        handle, filename = tempfile.mkstemp()
+        self.addCleanup(os.unlink, filename)
+        with os.fdopen(handle, "w") as f:
+            f.write(text)
+
+        store = InputStore(filename)
+        # cleanups run last first: unmapped, then removed
+        self.addCleanup(store.close)
+        return store
+
+    def test_lines(self):
+        self.assertEqual(self.store_for("ab\ncd\n").lines(), ["ab", "cd"])
+        self.assertEqual(self.store_for("ab\ncd").lines(), ["ab", "cd"])
+        self.assertEqual(self.store_for("ab\n\n").lines(), ["ab", ""])
+        self.assertEqual(self.store_for("").lines(), [])
+
+    def test_line(self):
+        store = self.store_for("ab\ncd\nef\n")
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.line(1), "cd")
+        self.assertEqual(store.line(-1), "ef")
+        self.assertEqual(bytes(store.line_bytes(0)), b"ab")
+        self.assertRaises(IndexError, lambda: store.line(3))
+
+    def test_chunks(self):
+        self.assertEqual(self.store_for("a\nb\n\nc\n").chunks(), [["a", "b"], ["c"]])
+        self.assertEqual(self.store_for("a\n\n\nc").chunks(), [["a"], [], ["c"]])
+        self.assertEqual(self.store_for("a\n\n").chunks(), [["a"]])
+        self.assertEqual(self.store_for("a\n\n\n").chunks(), [["a"], []])
+        self.assertEqual(self.store_for("\n\na").chunks(), [[], [], ["a"]])
+        self.assertEqual(self.store_for("\n").chunks(), [[]])
+        self.assertEqual(self.store_for("").chunks(), [])
+
+    def test_chunks_match_line_splitting(self):
+        for text in ["a\nb\n\nc\n", "a\n\n\n\nb", "\n\n", "ab\n\ncd\nef\n\n\n", "x"]:
+            lines = text.split("\n")
+            if lines[-1] == "":
+                lines = lines[:-1]
+            expected, chunk = [], []
+            for line in lines:
+                if line == "":
+                    expected.append(chunk)
+                    chunk = []
+                else:
+                    chunk.append(line)
+            if chunk:
+                expected.append(chunk)
+
+            self.assertEqual(self.store_for(text).chunks(), expected, text)
+
+    def test_lazy_chunks(self):
+        chunks = self.store_for("a\nb\n\nc\n").chunks(lazy=True)
+        self.assertEqual([(chunk.start, chunk.end) for chunk in chunks], [(0, 3), (5, 6)])
+        self.assertEqual(list(chunks[0]), ["a", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Opt-in call counters, timers and cache statistics for the hot utility functions.
+
+Instrumentation is decided when the instrumented modules are imported: set AOC_INSTRUMENT=1 in the environment, or
+call enable() before importing them (the runner's --metrics flag does the latter in each worker). When it's off,
+`instrumented` hands back what it decorates untouched, and the counters in hot loops sit behind a module-level
+`if INSTRUMENTED:`, so a normal run pays nothing.
+
+    @instrumented
+    @memoize
+    def flood_fill(...): ...
+
+times and counts every call of flood_fill, and since the decorated function has a cache_info(), also reports its
+cache hits and misses. The named caches of caches.py are reported too, decorated or not."""
+import functools
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import caches
+
+T = TypeVar('T')
+
+ENABLED = os.environ.get("AOC_INSTRUMENT", "") not in ["", "0"]
+
+
+@dataclass
+class Timer:
+    calls: int = 0
+    # inclusive of nested and recursive calls, like cProfile's cumulative time
+    total_ns: int = 0
+
+
+_TIMERS: Dict[str, Timer] = {}
+_COUNTERS: Dict[str, int] = {}
+_CACHES: Dict[str, Callable] = {}
+# cache_info() counts since the cache was created, so reset() remembers where it left them
+_CACHE_BASELINES: Dict[str, Tuple[int, int]] = {}
+
+
+def enable():
+    """
+    Turns instrumentation on for modules imported from now on."""
+    global ENABLED
+    ENABLED = True
+
+
+def instrumented(target: Optional[T] = None, *, name: Optional[str] = None) -> T:
+    """
+    Counts and times calls of a function, or constructions of a class. Usable with or without a name:
+    @instrumented or @instrumented(name="...")."""
+    if target is None:
+        return functools.partial(instrumented, name=name)
+
+    if not ENABLED:
+        return target
+
+    name = name or f"{target.__module__}.{target.__qualname__}"
+    timer = _TIMERS.setdefault(name, Timer())
+
+    if isinstance(target, type):
+        target.__init__ = _timed(target.__init__, timer)
+        return target
+
+    if hasattr(target, "cache_info"):
+        _CACHES[name] = target
+
+    wrapper = _timed(target, timer)
+    if hasattr(target, "cache_clear"):
+        wrapper.cache_info = target.cache_info
+        wrapper.cache_clear = target.cache_clear
+    return wrapper
+
+
+def count(name: str, n: int = 1):
+    """
+    Adds n to a named counter. Call sites in hot loops should check INSTRUMENTED first."""
+    _COUNTERS[name] = _COUNTERS.get(name, 0) + n
+
+
+def reset():
+    for timer in _TIMERS.values():
+        timer.calls, timer.total_ns = 0, 0
+    _COUNTERS.clear()
+    for name, cached in _all_caches().items():
+        info = cached.cache_info()
+        _CACHE_BASELINES[name] = (info.hits, info.misses)
+
+
+def metrics() -> Dict[str, Any]:
+    """
+    Returns everything measured since the last reset(), as JSON-ready dicts."""
+    cache_metrics = {}
+    for name, cached in _all_caches().items():
+        info = cached.cache_info()
+        base_hits, base_misses = _CACHE_BASELINES.get(name, (0, 0))
+        hits, misses = info.hits - base_hits, info.misses - base_misses
+        cache_metrics[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses > 0 else None,
+            "size": info.currsize,
+        }
+
+    return {
+        "timers": {
+            name: {"calls": timer.calls, "seconds": timer.total_ns / 1e9}
+            for name, timer in _TIMERS.items() if timer.calls > 0},
+        "counters": dict(_COUNTERS),
+        "caches": {name: cache for name, cache in cache_metrics.items() if cache["hits"] + cache["misses"] > 0},
+    }
+
+
+def write_metrics(filename: str, runs: Dict[str, Any]):
+    temp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_filename, "w") as f:
+        json.dump(runs, f, indent=2, sort_keys=True)
+    os.replace(temp_filename, filename)
+
+
+def format_metrics(metrics: Dict[str, Any]) -> str:
+    lines = []
+    for name, timer in sorted(metrics["timers"].items(), key=lambda item: item[1]["seconds"], reverse=True):
+        lines.append(f"  {timer['calls']:>12} calls  {timer['seconds']:10.3f}s  {name}")
+    for name, value in sorted(metrics["counters"].items()):
+        lines.append(f"  {value:>12}        {'':>11}  {name}")
+    for name, cache in sorted(metrics["caches"].items()):
+        lines.append(
+            f"  {cache['hits']:>12} hits   {cache['hit_ratio']:10.1%}   {name} cache ({cache['misses']} misses)")
+
+    return "\n".join(lines)
+
+
+def _all_caches() -> Dict[str, Any]:
+    # a memoized function that is also instrumented goes by the same name in both
+    return {**caches.registry(), **_CACHES}
+
+
+def _timed(function: Callable, timer: Timer) -> Callable:
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        timer.calls += 1
+        start = perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timer.total_ns += perf_counter_ns() - start
+
+    return wrapper
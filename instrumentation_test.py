@@ -0,0 +1,54 @@
+import unittest
+from functools import lru_cache
+
+import instrumentation
+from instrumentation import instrumented
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.was_enabled = instrumentation.ENABLED
+
+    def tearDown(self):
+        instrumentation.ENABLED = self.was_enabled
+        instrumentation.reset()
+
+    def test_disabled_is_free(self):
+        instrumentation.ENABLED = False
+
+        def square(x: int) -> int:
+            return x * x
+
+        self.assertIs(instrumented(square), square)
+        self.assertIs(instrumented(name="square")(square), square)
+
+    def test_counts_calls_and_cache_hits(self):
+        instrumentation.enable()
+
+        @instrumented(name="test.square")
+        @lru_cache(maxsize=None)
+        def square(x: int) -> int:
+            return x * x
+
+        @instrumented
+        class Point:
+            def __init__(self, x: int):
+                self.x = x
+
+        instrumentation.reset()
+        for x in [1, 2, 1, 1]:
+            square(x)
+        Point(1)
+        instrumentation.count("test.counter", 3)
+
+        metrics = instrumentation.metrics()
+        self.assertEqual(metrics["timers"]["test.square"]["calls"], 4)
+        self.assertEqual(metrics["timers"][f"{__name__}.{Point.__qualname__}"]["calls"], 1)
+        self.assertEqual(metrics["counters"], {"test.counter": 3})
+        self.assertEqual(metrics["caches"]["test.square"]["hits"], 2)
+        self.assertEqual(metrics["caches"]["test.square"]["hit_ratio"], 0.5)
+
+        # cache statistics start over at every reset
+        instrumentation.reset()
+        square(1)
+        self.assertEqual(instrumentation.metrics()["caches"]["test.square"]["hits"], 1)
@@ -1,7 +1,10 @@
 from dataclasses import dataclass
 from typing import List, Union, Tuple
 
+from instrumentation import instrumented
 
+
+@instrumented
 @dataclass(frozen=True)
 class Interval:
     left: int
@@ -1,8 +1,10 @@
 from typing import Optional, List, Tuple
 
+from instrumentation import instrumented
 from intervals import Interval
 
 
+@instrumented
 def eight_kernel(
     x: int,
     y: int,
@@ -31,6 +33,7 @@ def eight_kernel(
     return list(result)
 
 
+@instrumented
 def nine_kernel(
     x: int,
     y: int,
@@ -51,6 +54,7 @@ def nine_kernel(
     return list(result)
 
 
+@instrumented
 def four_kernel(
     x: int,
     y: int,
@@ -75,6 +79,7 @@ def four_kernel(
     return list(result)
 
 
+@instrumented
 def five_kernel(
     x: int,
     y: int,
@@ -0,0 +1,148 @@
+import fnmatch
+import os
+import re
+import resource
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?$", re.IGNORECASE)
+SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+# allocations made by the measuring itself
+TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    location: str
+    size_bytes: int
+    count: int
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """
+    Memory traced during one solve: the peak, and the biggest allocation sites, both at (around) that peak and still
+    alive once the solve returned."""
+    peak_traced_bytes: int
+    at_peak: List[AllocationSite]
+    retained: List[AllocationSite]
+
+
+def measure(
+        function: Callable[..., Any],
+        *args: Any,
+        top: int = 10,
+        interval: float = 0.05) -> Tuple[Any, MemoryReport]:
+    """
+    Calls the function under tracemalloc and returns its result along with a MemoryReport.
+
+    Allocations are attributed by diffing snapshots against one taken just before the call. Most of a solve's memory
+    is gone by the time it returns, so besides the snapshot after the call a watcher thread snapshots whenever the
+    traced memory grew by a quarter since the last one, and the last of those stands in for the peak.
+
+    tracemalloc's own bookkeeping takes about as much memory as what it traces, so the process' RSS is inflated while
+    this runs. Measure peak_rss_bytes() in a separate, untraced run."""
+    # filtering compiles the filename patterns on first use, which would otherwise show up as allocations of the solve
+    for trace_filter in TRACE_FILTERS:
+        fnmatch.fnmatch("", trace_filter.filename_pattern)
+
+    tracemalloc.start()
+    before = _snapshot()
+
+    peak_snapshot: Optional[tracemalloc.Snapshot] = None
+    done = threading.Event()
+
+    def watch():
+        nonlocal peak_snapshot
+        last_size = tracemalloc.get_traced_memory()[0]
+        while not done.wait(interval):
+            size = tracemalloc.get_traced_memory()[0]
+            if size > last_size * 1.25:
+                peak_snapshot, last_size = _snapshot(), size
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        result = function(*args)
+    finally:
+        done.set()
+        watcher.join()
+
+    after = _snapshot()
+    _, peak_traced_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    report = MemoryReport(
+        peak_traced_bytes=peak_traced_bytes,
+        at_peak=_top_sites(peak_snapshot or after, before, top),
+        retained=_top_sites(after, before, top))
+    return result, report
+
+
+def peak_rss_bytes() -> int:
+    """
+    Returns the peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def parse_size(value: str) -> int:
+    """
+    Parses a byte count like "512M", "1.5G" or "2048"."""
+    match = SIZE_PATTERN.match(value.strip())
+    if match is None:
+        raise ValueError(f"Invalid size {value}")
+
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size_bytes: int) -> str:
+    for unit in ["B", "K", "M", "G"]:
+        if abs(size_bytes) < 1024 or unit == "G":
+            return f"{size_bytes:.0f}{unit}" if unit == "B" else f"{size_bytes:.1f}{unit}"
+        size_bytes /= 1024
+
+
+def format_report(report: MemoryReport) -> str:
+    lines = [f"peak traced {format_size(report.peak_traced_bytes)}"]
+    for title, sites in [("at peak", report.at_peak), ("retained", report.retained)]:
+        if not sites:
+            continue
+        lines.append(f"  {title}:")
+        for site in sites:
+            lines.append(f"    {format_size(site.size_bytes):>8} in {site.count:>8} blocks  {site.location}")
+
+    return "\n".join(lines)
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+
+
+def _top_sites(snapshot: tracemalloc.Snapshot, before: tracemalloc.Snapshot, top: int) -> List[AllocationSite]:
+    grown = [diff for diff in snapshot.compare_to(before, "lineno") if diff.size_diff > 0]
+    grown.sort(key=lambda diff: diff.size_diff, reverse=True)
+
+    return [
+        AllocationSite(_location(diff.traceback[0]), diff.size_diff, diff.count_diff)
+        for diff in grown[:top]]
+
+
+def _location(frame: tracemalloc.Frame) -> str:
+    filename = frame.filename
+    if os.path.dirname(os.path.abspath(filename)) == os.path.dirname(os.path.abspath(__file__)):
+        # our own modules, the directory is just noise
+        filename = os.path.basename(filename)
+
+    return f"{filename}:{frame.lineno}"
@@ -0,0 +1,40 @@
+import unittest
+
+from memory_profiling import format_size, measure, parse_size
+
+RETAINED = []
+
+
+def allocate(retain: bool) -> int:
+    data = [bytearray(1000) for _ in range(1000)]
+    if retain:
+        RETAINED.append(data)
+
+    return len(data)
+
+
+class TestMemoryProfiling(unittest.TestCase):
+    def tearDown(self):
+        RETAINED.clear()
+
+    def test_measure(self):
+        result, report = measure(allocate, False)
+
+        self.assertEqual(result, 1000)
+        self.assertGreater(report.peak_traced_bytes, 1_000_000)
+        # nothing but interpreter odds and ends
+        self.assertLess(sum(site.size_bytes for site in report.retained), 10_000)
+
+    def test_measure_retained(self):
+        _, report = measure(allocate, True)
+
+        self.assertTrue(report.retained[0].location.startswith("memory_profiling_test.py:"))
+        self.assertGreater(report.retained[0].size_bytes, 1_000_000)
+
+    def test_sizes(self):
+        self.assertEqual(parse_size("512M"), 512 << 20)
+        self.assertEqual(parse_size("1.5G"), 3 << 29)
+        self.assertEqual(parse_size("2048"), 2048)
+        self.assertEqual(format_size(3 << 29), "1.5G")
+        with self.assertRaises(ValueError):
+            parse_size("lots")
@@ -0,0 +1,127 @@
+import cProfile
+import importlib
+import os
+import pstats
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from aoc_api import PuzzleInput
+from runner import Job
+
+# (filename, line number, function name), as used by pstats
+Function = Tuple[str, int, str]
+
+
+@dataclass(frozen=True)
+class FunctionStats:
+    name: str
+    calls: int
+    total_seconds: float
+    cumulative_seconds: float
+
+
+def profile_solve(job: Job, input: PuzzleInput) -> Tuple[object, pstats.Stats]:
+    """
+    Runs a day/part's solve under cProfile, returning the answer and the collected stats."""
+    module = importlib.import_module(f"day{job.day}")
+
+    profiler = cProfile.Profile()
+    answer = profiler.runcall(module.solve, job.part, input)
+
+    return answer, pstats.Stats(profiler)
+
+
+def top_functions(stats: pstats.Stats, n: int = 20) -> List[FunctionStats]:
+    """
+    Returns the n functions with the most cumulative time."""
+    result = [
+        FunctionStats(function_name(function), calls, total_seconds, cumulative_seconds)
+        for function, (_, calls, total_seconds, cumulative_seconds, _) in stats.stats.items()]
+
+    return sorted(result, key=lambda f: f.cumulative_seconds, reverse=True)[:n]
+
+
+def format_top_functions(functions: List[FunctionStats]) -> str:
+    rows = [("cumulative", "own", "calls", "function")]
+    for f in functions:
+        rows.append((f"{f.cumulative_seconds:.3f}s", f"{f.total_seconds:.3f}s", str(f.calls), f.name))
+
+    widths = [max(len(row[column]) for row in rows) for column in range(3)]
+    return "\n".join(
+        "  ".join([cell.rjust(width) for cell, width in zip(row, widths)] + [row[3]]) for row in rows)
+
+
+def collapsed_stacks(stats: pstats.Stats, min_fraction: float = 1e-5) -> Dict[str, float]:
+    """
+    Converts the stats to collapsed stacks ("outer;inner;innermost" -> seconds spent in innermost), the input format of
+    flamegraph.pl and speedscope.
+
+    cProfile only records caller -> callee edges, not whole stacks, so the stacks are rebuilt by walking down from the
+    functions nobody called and splitting each function's time between its callers in proportion to the time each of
+    them spent in it. That's exact unless a function's cost depends on who calls it.
+
+    A dense call graph has exponentially many paths through it, so calls that took less than `min_fraction` of the
+    profiled time aren't followed: their time is counted as their caller's own, and every stack still adds up."""
+    callees: Dict[Function, Dict[Function, float]] = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, caller_cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = caller_cumulative
+
+    roots = [function for function, (_, _, _, _, callers) in stats.stats.items() if not callers]
+    min_seconds = min_fraction * sum(stats.stats[function][3] for function in roots)
+    result: Dict[str, float] = {}
+
+    def walk(function: Function, seconds: float, path: List[Function]):
+        _, _, total_seconds, cumulative_seconds, _ = stats.stats[function]
+        if cumulative_seconds <= 0:
+            return
+
+        path = path + [function]
+        own_seconds = seconds * min(total_seconds / cumulative_seconds, 1.0)
+        for callee, callee_seconds in callees.get(function, {}).items():
+            # recursion is folded into the outermost call
+            if callee in path:
+                continue
+
+            share = seconds * callee_seconds / cumulative_seconds
+            if share < min_seconds:
+                own_seconds += share
+            else:
+                walk(callee, share, path)
+
+        key = ";".join(function_name(f) for f in path)
+        result[key] = result.get(key, 0.0) + own_seconds
+
+    for function in roots:
+        walk(function, stats.stats[function][3], [])
+
+    return result
+
+
+def write_profile(stats: pstats.Stats, prefix: str) -> List[str]:
+    """
+    Writes the raw stats (for snakeviz, pstats, ...) and the collapsed stacks (for flamegraph.pl, speedscope, ...)
+    next to each other, returning the filenames."""
+    stats_filename = f"{prefix}.prof"
+    stats.dump_stats(stats_filename)
+
+    collapsed_filename = f"{prefix}.collapsed"
+    temp_filename = f"{collapsed_filename}.{os.getpid()}.tmp"
+    with open(temp_filename, "w") as f:
+        for stack, seconds in sorted(collapsed_stacks(stats).items()):
+            # flamegraph.pl wants integer sample counts, use microseconds
+            microseconds = round(seconds * 1_000_000)
+            if microseconds > 0:
+                f.write(f"{stack} {microseconds}\n")
+    os.replace(temp_filename, collapsed_filename)
+
+    return [stats_filename, collapsed_filename]
+
+
+def function_name(function: Function) -> str:
+    filename, line, name = function
+    if filename == "~":
+        # builtins, which already look like <built-in method builtins.len>
+        return name
+
+    return f"{os.path.splitext(os.path.basename(filename))[0]}.{name}:{line}"
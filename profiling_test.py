@@ -0,0 +1,49 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+from generators import generate
+from profiling import collapsed_stacks, profile_solve, top_functions, write_profile
+from runner import Job
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.answer, self.stats = profile_solve(Job(13, 2), generate(13, 20, seed=1))
+
+    def test_top_functions(self):
+        names = [f.name for f in top_functions(self.stats, 5)]
+        self.assertTrue(names[0].startswith("day13.solve:"))
+        self.assertTrue(any(name.startswith("day13.part2:") for name in names))
+
+    def test_collapsed_stacks_add_up(self):
+        stacks = collapsed_stacks(self.stats)
+        solve = next(f for f in top_functions(self.stats, 1))
+
+        self.assertAlmostEqual(
+            sum(seconds for stack, seconds in stacks.items() if stack.startswith("day13.solve:")),
+            solve.cumulative_seconds,
+            places=6)
+        self.assertTrue(all(";" not in stack or stack.startswith("day13.solve:") for stack in stacks))
+
+    def test_collapsed_stacks_of_a_dense_call_graph(self):
+        # f0 calls every other function, and every function calls all the ones after it: 2 ** 28 paths to f29
+        functions = [("dense.py", idx, f"f{idx}") for idx in range(30)]
+        cumulative = [0.0] * len(functions)
+        for idx in reversed(range(len(functions))):
+            cumulative[idx] = 1.0 + sum(cumulative[callee] / callee for callee in range(idx + 1, len(functions)))
+
+        stats = pstats.Stats()
+        for idx, function in enumerate(functions):
+            callers = {caller: (1, 1, 1.0 / idx, cumulative[idx] / idx) for caller in functions[:idx]}
+            stats.stats[function] = (max(idx, 1), max(idx, 1), 1.0, cumulative[idx], callers)
+
+        stacks = collapsed_stacks(stats)
+        self.assertAlmostEqual(sum(stacks.values()), cumulative[0], places=6)
+        self.assertLess(len(stacks), 100_000)
+
+    def test_write_profile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = write_profile(self.stats, os.path.join(directory, "profile"))
+            self.assertTrue(all(os.path.exists(filename) for filename in filenames))
@@ -0,0 +1,123 @@
+"""
+Progress and throughput meters for long loops.
+
+    with Meter("button presses") as meter:
+        while ...:
+            meter.update()
+
+    for line in track(lines, "lines"):
+        ...
+
+Meters print a line to stderr every few seconds: the count, the rate, and the ETA when the total is known (or just the
+elapsed time when it isn't). update() is cheap enough for the hottest loop: it only reads the clock every `stride`
+items, and the stride adapts so that happens a handful of times per report.
+
+Output is on when stderr is a terminal, and can be forced either way with AOC_PROGRESS=1/0. The runner labels each
+worker's meters with its day and part, so interleaved lines from parallel jobs can be told apart."""
+import math
+import os
+import sys
+import time
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+# checks of the clock per report interval that the stride aims for
+CHECKS_PER_INTERVAL = 8
+
+_label: Optional[str] = None
+
+
+def set_label(label: Optional[str]):
+    """
+    Sets the prefix of every report from this process, e.g. "day 20 part 2"."""
+    global _label
+    _label = label
+
+
+def is_enabled() -> bool:
+    setting = os.environ.get("AOC_PROGRESS")
+    if setting is not None:
+        return setting not in ["", "0"]
+
+    return sys.stderr.isatty()
+
+
+class Meter:
+    def __init__(self, name: str, total: Optional[int] = None, interval: float = 2.0):
+        self.name = name
+        self.total = total
+        self.interval = interval
+        self.count = 0
+
+        self._enabled = is_enabled()
+        self._start = time.monotonic()
+        self._last_check = self._start
+        self._next_report = self._start + interval
+        self._reported = False
+        self._stride = 1
+        self._next_check = 1 if self._enabled else math.inf
+
+    def update(self, n: int = 1):
+        self.count += n
+        if self.count >= self._next_check:
+            self._check()
+
+    def close(self):
+        """
+        Prints a summary, if the loop ran long enough to report at all."""
+        if self._reported:
+            elapsed = time.monotonic() - self._start
+            self._print(f"{self.count:,} in {elapsed:.1f}s ({self.count / elapsed:,.0f}/s)")
+        self._next_check = math.inf
+
+    def __enter__(self) -> 'Meter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _check(self):
+        now = time.monotonic()
+        since_check = now - self._last_check
+        if since_check < self.interval / CHECKS_PER_INTERVAL / 2:
+            self._stride *= 2
+        elif since_check > self.interval / CHECKS_PER_INTERVAL * 2 and self._stride > 1:
+            self._stride //= 2
+        self._last_check = now
+        self._next_check = self.count + self._stride
+
+        if now >= self._next_report:
+            self._report(now)
+            self._next_report = now + self.interval
+
+    def _report(self, now: float):
+        elapsed = now - self._start
+        rate = self.count / elapsed
+        message = f"{self.count:,}"
+        if self.total:
+            message += f"/{self.total:,} ({self.count / self.total:.0%})"
+        message += f", {rate:,.0f}/s"
+        if self.total and rate > 0:
+            message += f", ETA {(self.total - self.count) / rate:.0f}s"
+        else:
+            message += f", {elapsed:.0f}s elapsed"
+
+        self._print(message)
+        self._reported = True
+
+    def _print(self, message: str):
+        prefix = f"[{_label}] " if _label else ""
+        print(f"{prefix}{self.name}: {message}", file=sys.stderr, flush=True)
+
+
+def track(items: Iterable[T], name: str, total: Optional[int] = None, interval: float = 2.0) -> Iterator[T]:
+    """
+    Yields the items, reporting progress through a Meter. The total defaults to len(items) when there is one."""
+    if total is None and hasattr(items, "__len__"):
+        total = len(items)
+
+    with Meter(name, total, interval) as meter:
+        for item in items:
+            yield item
+            meter.update()
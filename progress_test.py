@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import time
+import unittest
+from unittest import mock
+
+import progress
+from progress import Meter, track
+
+
+class TestProgress(unittest.TestCase):
+    def run_meter(self, enabled: str, total=None) -> str:
+        stderr = io.StringIO()
+        with mock.patch.dict(os.environ, {"AOC_PROGRESS": enabled}), contextlib.redirect_stderr(stderr):
+            with Meter("items", total=total, interval=0.05) as meter:
+                end = time.monotonic() + 0.3
+                while time.monotonic() < end:
+                    meter.update()
+
+        return stderr.getvalue()
+
+    def test_heartbeat(self):
+        progress.set_label("day 1 part 2")
+        try:
+            lines = self.run_meter("1").splitlines()
+        finally:
+            progress.set_label(None)
+
+        self.assertGreaterEqual(len(lines), 3)
+        self.assertTrue(all(line.startswith("[day 1 part 2] items: ") for line in lines))
+        self.assertIn("elapsed", lines[0])
+        self.assertIn(" in ", lines[-1])
+
+    def test_eta(self):
+        lines = self.run_meter("1", total=10 ** 12).splitlines()
+        self.assertIn("ETA", lines[0])
+
+    def test_disabled(self):
+        self.assertEqual(self.run_meter("0"), "")
+
+    def test_track(self):
+        with mock.patch.dict(os.environ, {"AOC_PROGRESS": "0"}):
+            self.assertEqual(list(track(range(5), "numbers")), [0, 1, 2, 3, 4])
@@ -0,0 +1,55 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    """
+    The answer of one day and part, with what it was computed from and how long that took."""
+    input_digest: str
+    code_hash: str
+    answer: Any
+    wall_seconds: float
+    cpu_seconds: float
+
+
+class ResultCache:
+    """
+    Answers of past runs, persisted as JSON, so a run can skip the jobs whose input and code didn't change.
+
+    Each day and part keeps only its latest result, which is valid as long as both the sha256 of its input and the
+    source hash of its module and the local modules it imports (see dependencies.source_hash) are the same."""
+
+    def __init__(self, filename: str = "./result-cache.json"):
+        self.filename = filename
+        self._results: Dict[str, CachedResult] = {}
+
+        try:
+            with open(filename, "r") as f:
+                self._results = {key: CachedResult(**value) for key, value in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+
+    def get(self, year: int, day: int, part: int, input_digest: str, code_hash: str) -> Optional[CachedResult]:
+        """
+        Returns the cached result, or None if there is none or it was computed from another input or code."""
+        result = self._results.get(_key(year, day, part))
+        if result is None or result.input_digest != input_digest or result.code_hash != code_hash:
+            return None
+
+        return result
+
+    def put(self, year: int, day: int, part: int, result: CachedResult):
+        self._results[_key(year, day, part)] = result
+
+    def save(self):
+        temp_filename = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temp_filename, "w") as f:
+            json.dump({key: asdict(value) for key, value in self._results.items()}, f, indent=2, sort_keys=True)
+        os.replace(temp_filename, self.filename)
+
+
+def _key(year: int, day: int, part: int) -> str:
+    return f"{year}-{day}-{part}"
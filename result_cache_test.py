@@ -0,0 +1,30 @@
+import os
+import tempfile
+import unittest
+
+from result_cache import CachedResult, ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "result-cache.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        cache = ResultCache(self.filename)
+        cache.put(2023, 1, 2, CachedResult("input", "code", 12345678901234567890, 1.5, 1.25))
+        cache.save()
+
+        cache = ResultCache(self.filename)
+        self.assertEqual(cache.get(2023, 1, 2, "input", "code").answer, 12345678901234567890)
+        self.assertIsNone(cache.get(2023, 1, 1, "input", "code"))
+
+    def test_invalidated_by_input_or_code(self):
+        cache = ResultCache(self.filename)
+        cache.put(2023, 1, 2, CachedResult("input", "code", 42, 1.5, 1.25))
+
+        self.assertIsNone(cache.get(2023, 1, 2, "other input", "code"))
+        self.assertIsNone(cache.get(2023, 1, 2, "input", "other code"))
@@ -0,0 +1,307 @@
+import importlib
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import time
+import traceback
+from dataclasses import dataclass, replace
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import caches
+import disk_cache
+import instrumentation
+import progress
+from aoc_api import get_raw_input, input_digest, prefetch
+from dependencies import source_hash
+from memory_profiling import MemoryReport, format_size, measure, peak_rss_bytes
+from result_cache import CachedResult, ResultCache
+
+DAYS = range(1, 26)
+PARTS = (1, 2)
+
+
+@dataclass(frozen=True)
+class Job:
+    day: int
+    part: int
+
+
+@dataclass(frozen=True)
+class JobResult:
+    job: Job
+    answer: Any = None
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+
+    # set instead of the answer when the job didn't finish, or alongside it when it went over the memory budget
+    error: Optional[str] = None
+
+    # only measured in memory mode
+    memory: Optional[MemoryReport] = None
+
+    # only collected with metrics on, see instrumentation.metrics()
+    metrics: Optional[Dict[str, Any]] = None
+
+    # answered from the result cache, with the timings of the run that computed it
+    cached: bool = False
+
+
+class RuntimeHistory:
+    """
+    Last observed wall time of every job, persisted as JSON, so the runner can start the slowest jobs first."""
+
+    def __init__(self, filename: str = "./runtime-history.json"):
+        self.filename = filename
+        self._seconds: Dict[str, float] = {}
+
+        try:
+            with open(filename, "r") as f:
+                self._seconds = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    def get(self, year: int, job: Job) -> Optional[float]:
+        return self._seconds.get(_key(year, job))
+
+    def record(self, year: int, results: Iterable[JobResult]):
+        for result in results:
+            self._seconds[_key(year, result.job)] = result.wall_seconds
+
+        temp_filename = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temp_filename, "w") as f:
+            json.dump(self._seconds, f, indent=2, sort_keys=True)
+        os.replace(temp_filename, self.filename)
+
+
+def available_jobs(days: Iterable[int] = DAYS, parts: Iterable[int] = PARTS) -> List[Job]:
+    """
+    Returns a job for every requested day that has a module. Parts that were never written are kept, they just report
+    an error."""
+    return [
+        Job(day, part)
+        for day in days if importlib.util.find_spec(f"day{day}") is not None
+        for part in parts]
+
+
+def schedule(jobs: Iterable[Job], history: RuntimeHistory, year: int = 2023) -> List[Job]:
+    """
+    Orders the jobs longest first by their last known runtime. Jobs that never ran go first, since they might be slow."""
+    def estimate(job: Job) -> float:
+        seconds = history.get(year, job)
+        return math.inf if seconds is None else seconds
+
+    return sorted(jobs, key=estimate, reverse=True)
+
+
+def run_jobs(
+        jobs: Iterable[Job],
+        workers: int = os.cpu_count() or 1,
+        timeout: Optional[float] = None,
+        year: int = 2023,
+        history: Optional[RuntimeHistory] = None,
+        memory: bool = False,
+        memory_budget: Optional[int] = None,
+        top: int = 10,
+        metrics: bool = False,
+        cache: Optional[ResultCache] = None) -> List[JobResult]:
+    """
+    Runs every job in its own process, at most `workers` at a time, in the order given by schedule(). Jobs running for
+    longer than `timeout` seconds are killed and reported as timed out. Returns the results in the order of the jobs.
+
+    Jobs whose peak RSS exceeds `memory_budget` bytes get an error. In memory mode every solve runs under tracemalloc
+    (see memory_profiling.measure), which slows it down and inflates its RSS, so those runtimes aren't recorded in the
+    history and the budget is checked against the traced peak instead.
+
+    With metrics on, each worker enables instrumentation before importing its day, and returns the counters, timers
+    and cache statistics of its solve.
+
+    With a result cache, jobs whose input and code are unchanged since their last successful run are answered from it
+    without starting a process, and the answers of the others are added to it. Memory and metrics mode always solve.
+
+    Inputs are downloaded up front, so the workers only ever read them from the cache."""
+    if workers < 1:
+        raise ValueError(f"Need at least one worker, not {workers}")
+
+    jobs = list(jobs)
+    history = history or RuntimeHistory()
+    try:
+        prefetch(sorted({job.day for job in jobs}), year)
+    except Exception:
+        # the jobs whose input couldn't be downloaded report it themselves
+        pass
+
+    results: Dict[Job, JobResult] = {}
+    # input digest and code hash of every job that may be cached, taken before anything runs
+    cache_keys: Dict[Job, Tuple[str, str]] = {}
+    if cache is not None and not memory and not metrics:
+        cache_keys = _cache_keys(jobs, year)
+        for job, (digest, code_hash) in cache_keys.items():
+            hit = cache.get(year, job.day, job.part, digest, code_hash)
+            if hit is not None:
+                results[job] = JobResult(
+                    job, hit.answer, wall_seconds=hit.wall_seconds, cpu_seconds=hit.cpu_seconds, cached=True)
+
+    pending = schedule([job for job in jobs if job not in results], history, year)
+    running: Dict[Connection, Tuple[Job, multiprocessing.Process, float]] = {}
+
+    while pending or running:
+        while pending and len(running) < workers:
+            job = pending.pop(0)
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_run_job, args=(job, year, sender, memory, top, metrics), daemon=True)
+            process.start()
+            sender.close()
+            running[receiver] = (job, process, time.monotonic())
+
+        wait_seconds = None
+        if timeout is not None:
+            next_deadline = min(started for _, _, started in running.values()) + timeout
+            wait_seconds = max(next_deadline - time.monotonic(), 0)
+
+        for receiver in wait(list(running), timeout=wait_seconds):
+            job, process, _ = running.pop(receiver)
+            try:
+                results[job] = receiver.recv()
+            except EOFError:
+                # the process died without sending anything
+                process.join()
+                results[job] = JobResult(job, error=f"crashed with exit code {process.exitcode}")
+            receiver.close()
+            process.join()
+
+        now = time.monotonic()
+        for receiver, (job, process, started) in list(running.items()):
+            if timeout is not None and now - started >= timeout:
+                process.kill()
+                process.join()
+                receiver.close()
+                del running[receiver]
+                # recorded at the timeout, which still puts it at the front of the next run
+                results[job] = JobResult(job, wall_seconds=now - started, error="timed out")
+
+    if memory_budget is not None:
+        for job, result in results.items():
+            if result.error is not None:
+                continue
+            peak = result.peak_rss_bytes if result.memory is None else result.memory.peak_traced_bytes
+            if peak > memory_budget:
+                results[job] = replace(
+                    result, error=f"over memory budget ({format_size(peak)} > {format_size(memory_budget)})")
+
+    if not memory and not metrics:
+        history.record(
+            year,
+            [result for result in results.values() if result.error in [None, "timed out"] and not result.cached])
+
+    if cache_keys:
+        for job, result in results.items():
+            if job in cache_keys and result.error is None and not result.cached:
+                digest, code_hash = cache_keys[job]
+                cache.put(year, job.day, job.part, CachedResult(
+                    digest, code_hash, result.answer, result.wall_seconds, result.cpu_seconds))
+        cache.save()
+
+    return [results[job] for job in jobs]
+
+
+def _cache_keys(jobs: List[Job], year: int) -> Dict[Job, Tuple[str, str]]:
+    keys = {}
+    code_hashes: Dict[int, str] = {}
+    for job in jobs:
+        try:
+            if job.day not in code_hashes:
+                code_hashes[job.day] = source_hash(f"day{job.day}")
+            keys[job] = (input_digest(job.day, year), code_hashes[job.day])
+        except Exception:
+            # no input to hash, the job reports that itself when it runs
+            continue
+
+    return keys
+
+
+def _run_job(job: Job, year: int, sender: Connection, memory: bool, top: int, metrics: bool):
+    try:
+        result = _solve(job, year, memory, top, metrics)
+    except Exception as e:
+        result = JobResult(job, error=traceback.format_exception_only(e)[-1].strip())
+
+    sender.send(result)
+    sender.close()
+
+
+def _solve(job: Job, year: int, memory: bool, top: int, metrics: bool) -> JobResult:
+    if metrics:
+        instrumentation.enable()
+    progress.set_label(f"day {job.day} part {job.part}")
+    module = importlib.import_module(f"day{job.day}")
+    if not hasattr(module, f"part{job.part}"):
+        return JobResult(job, error=f"no part {job.part}")
+    input = get_raw_input(job.day, year)
+
+    report = None
+    instrumentation.reset()
+    with caches.scope():
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if memory:
+            answer, report = measure(module.solve, job.part, input, top=top)
+        else:
+            answer = module.solve(job.part, input)
+        wall_seconds, cpu_seconds = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        # before the caches are cleared, which would report them empty
+        job_metrics = instrumentation.metrics() if metrics else None
+    disk_cache.flush_all()
+
+    return JobResult(
+        job,
+        answer,
+        wall_seconds,
+        cpu_seconds,
+        peak_rss_bytes(),
+        memory=report,
+        metrics=job_metrics)
+
+
+def format_results(results: List[JobResult]) -> str:
+    """
+    Formats the results as a table of answers, wall/CPU times and peak memory, with the totals at the bottom. Cached
+    answers are marked, and show the timings of the run that computed them."""
+    memory = any(result.memory is not None for result in results)
+
+    rows = [("day", "part", "answer", "wall", "cpu", "peak rss") + (("peak traced",) if memory else ())]
+    for result in results:
+        answer = str(result.answer) if result.error is None else result.error
+        if result.cached:
+            answer += " (cached)"
+        row = (
+            str(result.job.day),
+            str(result.job.part),
+            answer,
+            f"{result.wall_seconds:.3f}s",
+            f"{result.cpu_seconds:.3f}s",
+            format_size(result.peak_rss_bytes) if result.peak_rss_bytes else "")
+        if memory:
+            row += (format_size(result.memory.peak_traced_bytes) if result.memory is not None else "",)
+        rows.append(row)
+
+    rows.append((
+        "total",
+        "",
+        "",
+        f"{sum(r.wall_seconds for r in results):.3f}s",
+        f"{sum(r.cpu_seconds for r in results):.3f}s",
+        "") + (("",) if memory else ()))
+
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) if column == 2 else cell.rjust(width)
+                  for column, (cell, width) in enumerate(zip(row, widths))).rstrip()
+        for row in rows)
+
+
+def _key(year: int, job: Job) -> str:
+    return f"{year}-{job.day}-{job.part}"
@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+import day1
+from aoc import parse_numbers
+from generators import generate
+from result_cache import ResultCache
+from runner import Job, JobResult, RuntimeHistory, run_jobs, schedule
+
+
+class TestRunner(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+        self.inputs = {day: generate(day, 131 if day == 21 else 20, seed=1) for day in [1, 21]}
+        for day, text in self.inputs.items():
+            with open(f"cache-2023-{day}.txt", "w") as f:
+                f.write(text)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        self.directory.cleanup()
+
+    def test_run_jobs(self):
+        jobs = [Job(1, 1), Job(1, 2), Job(1, 3)]
+        results = run_jobs(jobs, workers=2)
+
+        self.assertEqual([result.job for result in results], jobs)
+        self.assertEqual(results[0].answer, day1.solve(1, self.inputs[1]))
+        self.assertEqual(results[1].answer, day1.solve(2, self.inputs[1]))
+        self.assertEqual(results[2].error, "no part 3")
+
+    def test_needs_a_worker(self):
+        with self.assertRaises(ValueError):
+            run_jobs([Job(1, 1)], workers=0)
+
+    def test_key_errors_of_a_solver_are_reported(self):
+        def part1(input):
+            return {}[1]
+
+        # forked workers import it from sys.modules
+        module = types.ModuleType("day99")
+        module.part1 = part1
+        module.solve = lambda part, input: {1: part1}[part](input)
+        sys.modules["day99"] = module
+        self.addCleanup(sys.modules.pop, "day99")
+        with open("cache-2023-99.txt", "w") as f:
+            f.write("input\n")
+
+        results = run_jobs([Job(99, 1), Job(99, 2)], workers=1)
+        self.assertEqual(results[0].error, "KeyError: 1")
+        self.assertEqual(results[1].error, "no part 2")
+
+    def test_result_cache(self):
+        cache = ResultCache()
+        first = run_jobs([Job(1, 1)], cache=cache)
+        second = run_jobs([Job(1, 1)], cache=ResultCache())
+
+        self.assertFalse(first[0].cached)
+        self.assertTrue(second[0].cached)
+        self.assertEqual(second[0].answer, first[0].answer)
+        self.assertEqual(second[0].wall_seconds, first[0].wall_seconds)
+
+        # a different input is solved again
+        with open("cache-2023-1.txt", "w") as f:
+            f.write(generate(1, 20, seed=2))
+        self.assertFalse(run_jobs([Job(1, 1)], cache=ResultCache())[0].cached)
+
+    def test_timeout(self):
+        results = run_jobs([Job(21, 2), Job(1, 1)], workers=2, timeout=0.5)
+
+        self.assertEqual(results[0].error, "timed out")
+        self.assertIsNotNone(results[1].answer)
+
+    def test_schedule_longest_first(self):
+        history = RuntimeHistory()
+        history.record(2023, [JobResult(Job(1, 1), wall_seconds=5.0), JobResult(Job(1, 2), wall_seconds=0.1)])
+
+        self.assertEqual(schedule([Job(1, 2), Job(1, 1), Job(2, 1)], history), [Job(2, 1), Job(1, 1), Job(1, 2)])
+
+    def test_parse_numbers(self):
+        self.assertEqual(parse_numbers("1-3,7,9-10"), [1, 2, 3, 7, 9, 10])
@@ -0,0 +1,123 @@
+"""
+Statistical profiler for solves that run too long for cProfile.
+
+A CPU-time interval timer interrupts the process every `interval` seconds, and the signal handler records the
+interrupted stack. Recording a stack is a walk up the frames plus one dict update, so at the default 5ms interval the
+overhead stays well under 5%. The report has the same collapsed-stack format and function names as profiling.py's.
+
+Attach it to any run with
+
+    profiler = SamplingProfiler().attach()
+
+after which `kill -USR1 <pid>` writes an intermediate report, and the final one is written on exit. Only the main
+thread is sampled, since that's where Python runs signal handlers."""
+import atexit
+import os
+import signal
+import sys
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple
+
+from profiling import function_name
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, prefix: str = "sample-profile", top: int = 25):
+        self.interval = interval
+        self.prefix = prefix
+        self.top = top
+        self.samples: Counter[Tuple[CodeType, ...]] = Counter()
+        self._running = False
+
+    def start(self) -> 'SamplingProfiler':
+        signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self._running = True
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        self._running = False
+
+    def attach(self, dump_signal: int = signal.SIGUSR1) -> 'SamplingProfiler':
+        """
+        Starts sampling, dumps a report whenever the process receives dump_signal, and stops and dumps a final report
+        on exit."""
+        signal.signal(dump_signal, lambda signum, frame: self.dump())
+        atexit.register(self._finish)
+        return self.start()
+
+    def __enter__(self) -> 'SamplingProfiler':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _sample(self, signum: int, frame: Optional[FrameType]):
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+
+        self.samples[tuple(reversed(stack))] += 1
+
+    def _finish(self):
+        self.stop()
+        self.dump()
+
+    def collapsed_stacks(self) -> Dict[str, int]:
+        """
+        Returns the samples as collapsed stacks ("outer;inner;innermost" -> sample count)."""
+        result: Dict[str, int] = {}
+        for stack, count in list(self.samples.items()):
+            key = ";".join(_name(code) for code in stack)
+            result[key] = result.get(key, 0) + count
+
+        return result
+
+    def top_functions(self, n: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """
+        Returns (function, own samples, total samples) for the n functions that were running in the most samples."""
+        own: Counter[CodeType] = Counter()
+        total: Counter[CodeType] = Counter()
+        for stack, count in list(self.samples.items()):
+            own[stack[-1]] += count
+            # a recursive function still only counts once per sample
+            for code in set(stack):
+                total[code] += count
+
+        hottest = sorted(total, key=lambda code: (own[code], total[code]), reverse=True)[:n or self.top]
+        return [(_name(code), own[code], total[code]) for code in hottest]
+
+    def format_report(self) -> str:
+        sample_count = sum(self.samples.values())
+        lines = [f"{sample_count} samples every {self.interval * 1000:g}ms of CPU time"]
+        lines.append(f"{'total':>7}  {'own':>7}  function")
+        for name, own, total in self.top_functions():
+            lines.append(f"{total / sample_count:7.1%}  {own / sample_count:7.1%}  {name}")
+
+        return "\n".join(lines)
+
+    def dump(self) -> str:
+        """
+        Writes the collapsed stacks to <prefix>.collapsed and prints the top functions to stderr."""
+        filename = f"{self.prefix}.collapsed"
+        temp_filename = f"{filename}.{os.getpid()}.tmp"
+        with open(temp_filename, "w") as f:
+            for stack, count in sorted(self.collapsed_stacks().items()):
+                f.write(f"{stack} {count}\n")
+        os.replace(temp_filename, filename)
+
+        if self.samples:
+            print(self.format_report(), file=sys.stderr)
+        print(f"Wrote {filename}", file=sys.stderr)
+        return filename
+
+
+def _name(code: CodeType) -> str:
+    return function_name((code.co_filename, code.co_firstlineno, code.co_name))
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import time
+import unittest
+
+from sampling_profiler import SamplingProfiler
+
+
+def spin(seconds: float) -> int:
+    result = 0
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        result += 1
+
+    return result
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_samples_hot_function(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            spin(0.2)
+
+        name, own, total = profiler.top_functions(1)[0]
+        self.assertTrue(name.startswith("sampling_profiler_test.spin:"))
+        self.assertGreater(own, 0)
+
+        stacks = profiler.collapsed_stacks()
+        self.assertEqual(sum(stacks.values()), sum(profiler.samples.values()))
+        self.assertTrue(any(stack.endswith(name) for stack in stacks))
+
+    def test_dump(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with SamplingProfiler(interval=0.001, prefix=os.path.join(directory, "profile")) as profiler:
+                spin(0.05)
+
+            filename = profiler.dump()
+            with open(filename) as f:
+                self.assertTrue(all(line.rsplit(" ", 1)[1].strip().isdigit() for line in f))
@@ -0,0 +1,108 @@
+"""
+Re-solving whatever a source change affects, while the solutions are edited.
+
+    python -m aoc watch --days 1-25
+
+Solves the jobs, then polls the day modules and every local module they import (intervals, graphs, kernels, ...) for
+changes. When one changes, only the jobs of the days importing it, directly or not, are solved again; the other
+answers are served from the result cache, so editing day17.py doesn't recompute day 5.
+
+The workers are forked, so the utilities this process has imported itself (caches, disk_cache, ...) are reloaded here
+when they change; the day modules are only ever imported by the workers."""
+import dataclasses
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from dependencies import ROOT, dependency_graph, dependents, file_hash, reload_modules
+from result_cache import ResultCache
+from runner import Job, JobResult, format_results, run_jobs
+
+
+class ModuleWatcher:
+    """
+    Polls the given modules, and the local modules they import, for changes to their source."""
+
+    def __init__(self, names: Iterable[str], root: str = ROOT):
+        self.names = sorted(names)
+        self.root = root
+        self.graph: Dict[str, Set[str]] = {}
+        self._hashes: Dict[str, Optional[str]] = {}
+        self._refresh()
+
+    def poll(self) -> Set[str]:
+        """
+        Returns the modules that changed since the last poll, and every watched module that imports them."""
+        changed = [name for name, digest in self._hashes.items() if file_hash(name, self.root) != digest]
+        if not changed:
+            return set()
+
+        # an edit may add or drop imports, either graph has the importers of what changed
+        old_graph = self.graph
+        self._refresh()
+        graph = {
+            name: old_graph.get(name, set()) | self.graph.get(name, set()) for name in old_graph.keys() | self.graph}
+        return dependents(graph, changed)
+
+    def _refresh(self):
+        self.graph = dependency_graph(self.names, self.root, previous=self.graph)
+        self._hashes = {name: file_hash(name, self.root) for name in self.graph}
+
+
+class Watch:
+    """
+    Keeps the latest result of every job, solving again the ones a change affects."""
+
+    def __init__(self, jobs: Iterable[Job], cache: ResultCache, year: int = 2023, **run_options):
+        self.jobs = list(jobs)
+        self.cache = cache
+        self.year = year
+        self.run_options = run_options
+        self.watcher = ModuleWatcher({f"day{job.day}" for job in self.jobs})
+        self.results: Dict[Job, JobResult] = {}
+
+    def start(self) -> List[JobResult]:
+        """
+        Solves every job, or takes it from the cache."""
+        self._run(self.jobs)
+        return [self.results[job] for job in self.jobs]
+
+    def step(self) -> Optional[Set[str]]:
+        """
+        Solves the jobs affected by the changes since the last step. Returns the changed and affected modules, or None
+        if nothing changed."""
+        affected = self.watcher.poll()
+        if not affected:
+            return None
+
+        # a module that fails to reload stays as it was; the workers importing it report the error
+        reload_modules(self.watcher.graph, affected, self.watcher.root)
+
+        rerun = [job for job in self.jobs if f"day{job.day}" in affected]
+        for job in self.jobs:
+            if job not in rerun:
+                self.results[job] = dataclasses.replace(self.results[job], cached=True)
+        self._run(rerun)
+        return affected
+
+    def _run(self, jobs: List[Job]):
+        for result in run_jobs(jobs, year=self.year, cache=self.cache, **self.run_options):
+            self.results[result.job] = result
+
+
+def watch(jobs: Iterable[Job], cache: ResultCache, year: int = 2023, interval: float = 0.5,
+          output: Callable[[str], None] = print, **run_options):
+    """
+    Prints the results of the jobs, and again after every change, until interrupted. Other keyword arguments go to
+    run_jobs."""
+    session = Watch(jobs, cache, year, **run_options)
+    output(format_results(session.start()))
+    while True:
+        time.sleep(interval)
+        affected = session.step()
+        if affected is None:
+            continue
+
+        days = sorted({job.day for job in session.jobs if f"day{job.day}" in affected})
+        output(f"\nChanged or importing a change: {', '.join(sorted(affected))}")
+        output(f"Solved day {', '.join(map(str, days))} again, the others are cached")
+        output(format_results([session.results[job] for job in session.jobs]))
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from watch import ModuleWatcher
+
+
+class TestModuleWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.write("utils", "X = 1\n")
+        self.write("other", "Y = 1\n")
+        self.write("day1", "import utils\n")
+        self.write("day2", "from other import Y\n")
+        self.watcher = ModuleWatcher(["day1", "day2"], self.root)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, source: str):
+        filename = os.path.join(self.root, f"{name}.py")
+        with open(filename, "w") as f:
+            f.write(source)
+        # a different mtime even on coarse clocks, so the file gets hashed again
+        stat = os.stat(filename)
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_unchanged(self):
+        self.assertEqual(self.watcher.poll(), set())
+
+    def test_changed_utility_affects_its_importers(self):
+        self.write("utils", "X = 2\n")
+        self.assertEqual(self.watcher.poll(), {"utils", "day1"})
+        self.assertEqual(self.watcher.poll(), set())
+
+    def test_changed_day(self):
+        self.write("day2", "from other import Y\n\nZ = Y\n")
+        self.assertEqual(self.watcher.poll(), {"day2"})
+
+    def test_new_import_is_watched(self):
+        self.write("day1", "import utils\nimport other\n")
+        self.assertEqual(self.watcher.poll(), {"day1"})
+
+        self.write("other", "Y = 2\n")
+        self.assertEqual(self.watcher.poll(), {"other", "day1", "day2"})
+
+
+    def test_broken_save(self):
+        self.write("day1", "import utils\n\ndef f(:\n")
+        self.assertEqual(self.watcher.poll(), {"day1"})
+        self.assertEqual(self.watcher.graph["day1"], {"utils"})
+
+        # still watched through the imports it had before
+        self.write("utils", "X = 2\n")
+        self.assertEqual(self.watcher.poll(), {"utils", "day1"})
+
+        self.write("day1", "import other\n")
+        self.assertEqual(self.watcher.poll(), {"day1"})
+        self.assertEqual(self.watcher.graph["day1"], {"other"})
+
+
+if __name__ == '__main__':
+    unittest.main()